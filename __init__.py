@@ -4,6 +4,8 @@ Python footprint generator (IPC-7351) with a minimal GUI.
 This package is intended to be executed as a module:
   - GUI:    python -m python.gui
   - CLI:    python -m python.generate --kind soic --element element.json --out ./kicad/footprints
+  - Batch:  python -m python.generate --manifest library.json --jobs 8 --out ./kicad/footprints
+  - Bench:  python -m python.bench writer
 
 Folder structure mirrors `src/pattern/default` CoffeeScript modules so math and
 pad placement remain identical.
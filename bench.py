@@ -0,0 +1,193 @@
+"""Micro-benchmarks of the generator.
+
+  python -m package.bench [name ...] [--repeat N]
+
+Each benchmark prints its best time over ``--repeat`` runs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from . import kicad_writer
+from .kicad_writer import PadShape, write_kicad_mod
+from .pattern.common import calculator
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Shortest wall time of ``repeat`` calls of ``fn``, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _pads(count: int) -> List[PadShape]:
+    """``count`` pads on a grid, in the three or four sizes a real footprint has."""
+    sizes = [(0.3, 0.3), (0.3, 0.3), (0.3, 0.3), (0.25, 1.2), (0.6, 0.6)]
+    columns = int(count ** 0.5) + 1
+    pads = []
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        pads.append(PadShape(pad_name=str(i + 1), x=-10 + 0.5 * (i % columns), y=-10 + 0.5 * (i // columns),
+                             width=width, height=height, type='smd', shape='rect', mask=0.05,
+                             layer=['topCopper', 'topMask', 'topPaste']))
+    return pads
+
+
+@contextmanager
+def _uncached() -> Iterator[None]:
+    """Swap the writer's cached formatters for plain ones."""
+    def fmt(x, decimals):
+        return f"{x:.{decimals}f}"
+
+    def map_layers(layers):
+        return " ".join(dict(kicad_writer._LAYER_NAMES)[l] for l in layers)
+
+    def pad_size(width, height, decimals, fmt=fmt):
+        return f"{fmt(width, decimals)} {fmt(height, decimals)}"
+
+    def rratio(width, height):
+        return f"\n    (roundrect_rratio {fmt(min(0.25, 0.1 / min(width, height)), 10)})"
+
+    names = ['_fmt', '_map_layers', '_pad_size', '_rratio']
+    saved = [getattr(kicad_writer, name) for name in names]
+    for name, fn in zip(names, [fmt, map_layers, pad_size, rratio]):
+        setattr(kicad_writer, name, fn)
+    try:
+        yield
+    finally:
+        for name, fn in zip(names, saved):
+            setattr(kicad_writer, name, fn)
+
+
+def bench_writer(repeat: int, count: int = 2000) -> None:
+    """write_kicad_mod on a ``count``-pad footprint, with and without the text caches."""
+    pads = _pads(count)
+
+    def write():
+        write_kicad_mod('BENCH', pads, 'smd', 3)
+
+    def write_cold():
+        kicad_writer._formatted.clear()
+        kicad_writer._pad_sizes.clear()
+        kicad_writer._rratios.clear()
+        write()
+
+    with _uncached():
+        plain = best_of(write, repeat)
+    cold = best_of(write_cold, repeat)
+    warm = best_of(write, repeat)
+    print(f"writer, {count} pads")
+    print(f"  uncached  {plain * 1000:8.2f} ms")
+    print(f"  cached    {cold * 1000:8.2f} ms  ({plain / cold:.2f}x, caches cleared per run)")
+    print(f"  warm      {warm * 1000:8.2f} ms  ({plain / warm:.2f}x)")
+
+
+def bench_ipc7351(repeat: int, count: int = 20000) -> None:
+    """ipc7351_batch on ``count`` chip parts against ``_ipc7351``/``_pad`` part by part."""
+    lengths = [0.4 + 6.0 * i / count for i in range(count)]
+    params = {'Lmin': lengths, 'Lmax': [l + 0.1 for l in lengths],
+              'Tmin': [0.1 + l / 8 for l in lengths], 'Tmax': [0.2 + l / 8 for l in lengths],
+              'Wmin': [l / 2 for l in lengths], 'Wmax': [0.1 + l / 2 for l in lengths],
+              'F': 0.1, 'P': 0.1, 'Jt': 0.3, 'Jh': 0.0, 'Js': 0.0, 'clearance': 0.2}
+    rows = [{name: value if isinstance(value, float) else value[i] for name, value in params.items()}
+            for i in range(count)]
+
+    def scalar():
+        for row in rows:
+            ipc = calculator._ipc7351(row)
+            ipc['clearance'] = row['clearance']
+            calculator._pad(ipc, {})
+
+    one = best_of(scalar, repeat)
+    batch = best_of(lambda: calculator.ipc7351_batch(params), repeat)
+    print(f"ipc7351, {count} parts ({'NumPy' if calculator.np is not None else 'no NumPy'})")
+    print(f"  per part  {one * 1000:8.2f} ms")
+    print(f"  batch     {batch * 1000:8.2f} ms  ({one / batch:.2f}x)")
+    if calculator.np is None:
+        print("  without NumPy the batch runs the same per-part solver over its columns;")
+        print("  it is only faster with NumPy installed")
+
+
+# a 0805 capacitor, for the single-part start-up run
+_CHIP = {
+    'name': 'BENCH',
+    'housing': {'polarized': False, 'componentType': 'CAPC',
+                'bodyLength': {'min': 1.9, 'nom': 2.0, 'max': 2.1}, 'bodyWidth': {'min': 1.15, 'nom': 1.25, 'max': 1.35},
+                'leadLength': {'min': 0.2, 'nom': 0.35, 'max': 0.5}, 'leadWidth': {'min': 1.15, 'max': 1.35},
+                'leadSpan': {'min': 1.9, 'nom': 2.0, 'max': 2.1}, 'height': {'max': 1.0}},
+    'pins': {'1': {}, '2': {}},
+}
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter from the directory holding the package."""
+    return subprocess.run([sys.executable, *args], cwd=Path(__file__).resolve().parent.parent,
+                          capture_output=True, check=True, text=True)
+
+
+def _import_times(stderr: str) -> List[Tuple[float, str]]:
+    """``(self ms, module)`` of the package's modules in ``-X importtime`` output, largest first."""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if self_us.strip().isdigit() and (name == __package__ or name.startswith(f'{__package__}.')):
+            times.append((int(self_us) / 1000, name))
+    return sorted(times, reverse=True)
+
+
+def bench_startup(repeat: int) -> None:
+    """Wall time of ``generate --help`` and of a one-part run, each in a fresh interpreter."""
+    generate = f'{__package__}.generate'
+    with tempfile.TemporaryDirectory() as tmp:
+        element = os.path.join(tmp, 'chip.json')
+        with open(element, 'w', encoding='utf-8') as f:
+            json.dump(_CHIP, f)
+        bare = best_of(lambda: _python('-c', 'pass'), repeat)
+        help_ = best_of(lambda: _python('-m', generate, '--help'), repeat)
+        one = best_of(lambda: _python('-m', generate, '--kind', 'chip', '--element', element,
+                                      '--out', tmp, '--force'), repeat)
+    imports = _import_times(_python('-X', 'importtime', '-m', generate, '--help').stderr)
+    print("startup")
+    print(f"  interpreter {bare * 1000:8.2f} ms")
+    print(f"  --help      {help_ * 1000:8.2f} ms")
+    print(f"  one part    {one * 1000:8.2f} ms")
+    print(f"  --help imports {len(imports)} package modules, {sum(t for t, _ in imports):.2f} ms:"
+          f" {', '.join(f'{name} {t:.2f}' for t, name in imports[:3])}")
+
+
+BENCHMARKS: Dict[str, Callable[[int], None]] = {
+    'ipc7351': bench_ipc7351,
+    'startup': bench_startup,
+    'writer': bench_writer,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run micro-benchmarks of the generator')
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help=f"benchmarks to run (default: all of {', '.join(sorted(BENCHMARKS))})")
+    parser.add_argument('--repeat', type=int, default=7, help='runs per measurement (default: 7)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    for name in args.names or sorted(BENCHMARKS):
+        BENCHMARKS[name](args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
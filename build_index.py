@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_ROOT = Path(__file__).resolve().parent
+# Sources every builder depends on, besides its own module
+_SHARED = [_ROOT / 'kicad_writer.py', _ROOT / 'pattern' / 'qeda_pattern.py']
+_LOCAL_IMPORT = re.compile(r'^from \.(\w+) import', re.M)
+
+_versions: Dict[str, str] = {}
+
+
+def _builder_sources(kind: str):
+    default = _ROOT / 'pattern' / 'default'
+    seen = []
+    todo = [kind.lower()]
+    while todo:
+        name = todo.pop()
+        path = default / f'{name}.py'
+        if path in seen or not path.is_file():
+            continue
+        seen.append(path)
+        todo.extend(_LOCAL_IMPORT.findall(path.read_text(encoding='utf-8')))
+    return seen
+
+
+def builder_version(kind: str) -> str:
+    """Hash of the source of the builder for ``kind`` and everything it uses.
+
+    Covers the ``pattern/default`` module of the kind and the sibling modules
+    it imports, all of ``pattern/common``, the pattern class and the writer.
+    Returns an empty string for an unknown kind.
+    """
+    kind = kind.lower()
+    if kind not in _versions:
+        own = _builder_sources(kind)
+        if not own:
+            return ''
+        common = sorted((_ROOT / 'pattern' / 'common').glob('*.py'))
+        h = hashlib.sha256()
+        for path in sorted(own) + common + _SHARED:
+            h.update(str(path.relative_to(_ROOT)).encode())
+            h.update(path.read_bytes())
+        _versions[kind] = h.hexdigest()
+    return _versions[kind]
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode()
+
+
+def element_digest(kind: str, element: Dict[str, Any], settings: Dict[str, Any]) -> Optional[str]:
+    """Content hash of one footprint: kind, element, resolved settings, builder."""
+    version = builder_version(kind)
+    if not version:
+        return None
+    h = hashlib.sha256()
+    h.update(kind.lower().encode())
+    h.update(_canonical(element))
+    h.update(_canonical(settings))
+    h.update(version.encode())
+    return h.hexdigest()
+
+
+class BuildIndex:
+    """Persistent map of footprint name to the digest it was last built from.
+
+    Stored as ``<out_dir>.build-index.json`` next to the ``.pretty`` directory.
+    """
+
+    def __init__(self, out_dir: str) -> None:
+        out = Path(out_dir)
+        self.out_dir = out
+        self.path = out.parent / f'{out.name}.build-index.json'
+        self.entries: Dict[str, str] = {}
+        if self.path.is_file():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        self._by_digest = {digest: name for name, digest in self.entries.items()}
+
+    def lookup(self, digest: Optional[str]) -> Optional[str]:
+        """Path of an up-to-date footprint built from ``digest``, if any."""
+        name = self._by_digest.get(digest) if digest else None
+        if name is None:
+            return None
+        path = os.path.join(self.out_dir, f'{name}.kicad_mod')
+        return path if os.path.isfile(path) else None
+
+    def record(self, name: str, digest: Optional[str]) -> None:
+        if not digest:
+            return
+        old = self.entries.get(name)
+        if old is not None and self._by_digest.get(old) == name:
+            del self._by_digest[old]
+        self.entries[name] = digest
+        self._by_digest[digest] = name
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
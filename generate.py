@@ -1,16 +1,36 @@
+from __future__ import annotations
+
+import copy
+import io
 import json
 import os
+import sys
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from time import perf_counter
 from pathlib import Path
-from typing import Any, Dict
+from threading import Lock
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .build_index import BuildIndex, element_digest
+from .pattern.common import trace
+from .pattern.common.profile import format_table, merge as merge_stages, profiling, record as record_stage
+from .pattern.common.settings import Settings
+from .pattern.default import builder
 
-from .pattern.qeda_pattern import QedaPattern
-from .kicad_writer import write_kicad_mod
+if TYPE_CHECKING:
+    # imported where a footprint is built or written, so that --help and
+    # plans do not load the writer
+    from .pattern.qeda_pattern import QedaPattern
 
 
-DEFAULT_SETTINGS = {
+DEFAULT_SETTINGS = Settings({
     'style': 'default',
     'densityLevel': 'N',
     'decimals': 3,
+    # store coordinates as integer nanometres (see QedaPattern.nm)
+    'nanometres': False,
     'polarityMark': 'dot',
     'preferManufacturer': True,
     'smoothPadCorners': False,
@@ -53,49 +73,407 @@ DEFAULT_SETTINGS = {
     'ball': {
         'collapsible': True,
     },
-}
+})
 
 
-def build_pattern(kind: str, element: Dict[str, Any]) -> QedaPattern:
-    settings = element.get('library', {}).get('pattern', DEFAULT_SETTINGS)
-    decimals = settings.get('decimals', 3)
-    pattern = QedaPattern(settings=settings, decimals=decimals, name=element['name'])
-    # route to builder dynamically (import relative to this package)
-    from importlib import import_module
-    mod_name = f"{__package__}.pattern.default.{kind.lower()}"
+def resolve_settings(element: Dict[str, Any]) -> Settings:
+    """``DEFAULT_SETTINGS`` with the element's library settings layered on top."""
+    overrides = element.get('library', {}).get('pattern')
+    if not overrides:
+        return DEFAULT_SETTINGS
+    if isinstance(overrides, Settings):
+        return _library_settings(overrides)
+    # every element of a manifest carries its own copy of the library dict;
+    # its JSON text is a cheaper key than freezing it into Settings each time
     try:
-        mod = import_module(mod_name)
-        build = getattr(mod, 'build')
-    except Exception as e:
-        raise ValueError(f'Unsupported kind: {kind} ({e})')
-    build(pattern, element)
+        key = json.dumps(overrides, sort_keys=True)
+    except TypeError:
+        return _library_settings(Settings(overrides))
+    found = _RESOLVED.get(key)
+    if found is None:
+        if len(_RESOLVED) >= _RESOLVED_SIZE:
+            _RESOLVED.clear()
+        found = _RESOLVED[key] = _library_settings(Settings(overrides))
+    return found
+
+
+_RESOLVED: Dict[str, Settings] = {}
+_RESOLVED_SIZE = 64
+
+
+@lru_cache(maxsize=64)
+def _library_settings(overrides: Settings) -> Settings:
+    # one resolved object per distinct library, shared by all its elements
+    return DEFAULT_SETTINGS.override(overrides)
+
+
+def _new_pattern(element: Dict[str, Any]) -> QedaPattern:
+    from .pattern.qeda_pattern import QedaPattern
+    settings = resolve_settings(element)
+    decimals = settings.get('decimals', 3)
+    return QedaPattern(settings=settings, decimals=decimals, name=element['name'],
+                       nm=bool(settings.get('nanometres', False)))
+
+
+def _working_copy(element: Dict[str, Any]) -> Dict[str, Any]:
+    """``element`` with a housing of its own for the builder to write to.
+
+    Builders record flags and derived dimensions in the housing; the rest of
+    the element is only read, so it is shared.
+    """
+    return dict(element, housing=copy.deepcopy(element['housing']))
+
+
+def build_pattern(kind: str, element: Dict[str, Any], profile: bool = False) -> QedaPattern:
+    """Build the footprint of ``element`` with the builder for ``kind``.
+
+    ``element`` is left as it was: the builder works on a copy of the housing.
+    With ``profile`` the returned pattern carries ``profile``, the per-stage
+    timings of the build (see ``pattern.common.profile``); ``write_footprint``
+    adds the writer stage to it.
+    """
+    pattern = _new_pattern(element)
+    build = builder(kind).build
+    element = _working_copy(element)
+    if profile:
+        with profiling(pattern) as stats:
+            build(pattern, element)
+        pattern.profile = stats
+    else:
+        build(pattern, element)
     return pattern
 
 
-def generate_footprint(kind: str, element: Dict[str, Any], out_dir: str) -> str:
-    pattern = build_pattern(kind, element)
-    description = getattr(pattern, 'description', None)
-    tags = getattr(pattern, 'tags', None)
-    content = write_kicad_mod(pattern.name, pattern.shapes, pattern.type, pattern.decimals, 
-                             descr=description, tags=tags)
+_DESCRIPTIONS: 'OrderedDict[tuple, Tuple[str, Optional[str], Optional[str]]]' = OrderedDict()
+_DESCRIPTIONS_SIZE = 256
+_descriptions_lock = Lock()
+
+
+def describe_footprint(kind: str, element: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+    """``(name, description, tags)`` that ``build_pattern`` gives ``element``.
+
+    Runs only the ``describe`` step of the builder, on a copy of the housing,
+    so no pads or graphics are made; a builder without one is run in full.
+    Results are cached on the kind, the element and its settings.
+    """
+    # the settings object hashes cheaply, so only the rest of the element is serialised
+    rest = {k: v for k, v in element.items() if k != 'library'}
+    key = (kind.lower(), json.dumps(rest, sort_keys=True, default=str), resolve_settings(element))
+    with _descriptions_lock:
+        found = _DESCRIPTIONS.get(key)
+        if found is not None:
+            _DESCRIPTIONS.move_to_end(key)
+            return found
+    describe = getattr(builder(kind), 'describe', None)
+    if describe is None:
+        pattern = build_pattern(kind, element)
+    else:
+        pattern = _new_pattern(element)
+        describe(pattern, _working_copy(element))
+    found = (pattern.name, getattr(pattern, 'description', None), getattr(pattern, 'tags', None))
+    with _descriptions_lock:
+        _DESCRIPTIONS[key] = found
+        if len(_DESCRIPTIONS) > _DESCRIPTIONS_SIZE:
+            _DESCRIPTIONS.popitem(last=False)
+    return found
+
+
+# flags of a new temporary file; O_EXCL never opens someone else's
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
+def _create_temp(path: str) -> Tuple[int, str]:
+    """Open a new hidden file next to ``path``; returns its descriptor and path.
+
+    Unlike ``tempfile.mkstemp``, which creates the file private, it is created
+    with mode 0o666 and the kernel applies the umask, as ``open()`` would.
+    """
+    directory, name = os.path.split(path)
+    while True:
+        tmp = os.path.join(directory, f'.{name}.{os.urandom(4).hex()}.tmp')
+        try:
+            return os.open(tmp, _TEMP_FLAGS, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def stream_if_changed(path: str, fill: Callable[[BinaryIO], Any]) -> bool:
+    """Write what ``fill`` streams to ``path`` unless the file already holds those bytes.
+
+    The content is collected in memory and compared with ``path`` first, so an
+    unchanged file is left alone and nothing is created in its directory.
+    Otherwise it is written next to the target and renamed over it, so readers
+    never see a partial file. Returns whether the file was written.
+    """
+    buffer = io.BytesIO()
+    fill(buffer)
+    data = buffer.getvalue()
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == len(data) and f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def _stream_footprint(pattern: QedaPattern, sink: BinaryIO) -> int:
+    from .kicad_writer import stream_kicad_mod
+    return stream_kicad_mod(sink, pattern.name, pattern.shapes, pattern.type, pattern.decimals,
+                            descr=getattr(pattern, 'description', None), tags=getattr(pattern, 'tags', None),
+                            nm=pattern.nm)
+
+
+def footprint_bytes(pattern: QedaPattern) -> bytes:
+    """The ``.kicad_mod`` file of ``pattern``, as ``write_footprint`` would write it."""
+    sink = io.BytesIO()
+    _stream_footprint(pattern, sink)
+    return sink.getvalue()
+
+
+def write_footprint(pattern: QedaPattern, out_dir: str) -> Tuple[str, bool]:
+    """Write ``pattern`` to ``<out_dir>/<name>.kicad_mod``; returns path and whether it changed."""
+    start = perf_counter()
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     out_path = os.path.join(out_dir, f"{pattern.name}.kicad_mod")
-    with open(out_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    return out_path
+    written = stream_if_changed(out_path, lambda sink: _stream_footprint(pattern, sink))
+    stats = getattr(pattern, 'profile', None)
+    if stats is not None:
+        record_stage(stats, 'writer', perf_counter() - start)
+    return out_path, written
+
+
+def generate_footprint(kind: str, element: Dict[str, Any], out_dir: str) -> str:
+    return write_footprint(build_pattern(kind, element), out_dir)[0]
+
+
+def _generate_entry(job: Tuple[str, Dict[str, Any], str, str, bool, bool]) -> Dict[str, Any]:
+    source, element, kind, out_dir, tracing, profile = job
+    result = {'source': source, 'kind': kind, 'name': element.get('name'), 'path': None, 'error': None, 'skipped': False, 'written': False}
+    with (trace.collect() if tracing else nullcontext()) as records:
+        try:
+            pattern = build_pattern(kind, element, profile=profile)
+            result['path'], result['written'] = write_footprint(pattern, out_dir)
+            result['name'] = Path(result['path']).stem
+            if profile:
+                result['profile'] = pattern.profile
+                result['memory'] = pattern.memory()
+                result['courtyard_segments'] = pattern.courtyard_segments
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+    if tracing:
+        result['trace'] = records
+    return result
+
+
+def load_manifest(path: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Read a manifest: a JSON list of ``{"kind": ..., "element": ...}`` entries.
+
+    ``element`` is either the element object itself or a path to an element
+    JSON file, relative to the manifest. Returns ``(source, kind, element)``.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = []
+    for i, item in enumerate(manifest):
+        element = item['element']
+        source = f'{path}[{i}]'
+        if isinstance(element, str):
+            source = os.path.join(base, element)
+            with open(source, 'r', encoding='utf-8') as f:
+                element = json.load(f)
+        entries.append((source, item['kind'], element))
+    return entries
+
+
+def load_directory(path: str, kind: Optional[str] = None) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Read every ``*.json`` element file of a directory, sorted by file name.
+
+    The kind is taken from a top-level ``"kind"`` key of each file, falling
+    back to ``kind``. Returns ``(source, kind, element)``.
+    """
+    entries = []
+    for name in sorted(os.listdir(path)):
+        if not name.endswith('.json'):
+            continue
+        source = os.path.join(path, name)
+        with open(source, 'r', encoding='utf-8') as f:
+            element = json.load(f)
+        entries.append((source, element.pop('kind', kind), element))
+    return entries
+
+
+def plan_batch(entries: Iterable[Tuple[str, str, Dict[str, Any]]], out_dir: str, index: Optional[BuildIndex] = None) -> List[Tuple[Tuple[str, str, Dict[str, Any]], Optional[str], Optional[str]]]:
+    """Pair every entry with its content digest and up-to-date output, if any.
+
+    Returns ``(entry, digest, path)`` where ``path`` is the existing footprint
+    built from the same digest, or None when the entry has to be (re)built.
+    No geometry is built.
+    """
+    if index is None:
+        index = BuildIndex(out_dir)
+    plan = []
+    for entry in entries:
+        _, kind, element = entry
+        digest = element_digest(kind, element, resolve_settings(element)) if kind else None
+        plan.append((entry, digest, index.lookup(digest)))
+    return plan
+
+
+def generate_batch(entries: Iterable[Tuple[str, str, Dict[str, Any]]], out_dir: str, jobs: int = 1, incremental: bool = True, tracing: bool = False, profile: bool = False) -> List[Dict[str, Any]]:
+    """Generate footprints for ``(source, kind, element)`` entries.
+
+    With ``jobs > 1`` the entries are spread over a process pool. Results come
+    back in input order, one dict per entry with ``path`` set on success and
+    ``error`` set on failure; a failing element does not stop the batch.
+
+    When ``incremental`` is set, entries whose digest matches the build index
+    next to ``out_dir`` are reported as ``skipped`` without being built, and
+    the index is updated with everything built successfully.
+
+    With ``tracing`` each built result carries the ``trace`` records emitted
+    while building it, and with ``profile`` its per-stage ``profile`` and the
+    ``courtyard_segments`` of a traced courtyard.
+    """
+    index = BuildIndex(out_dir)
+    plan = plan_batch(entries, out_dir, index)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(plan)
+    work = []
+    for pos, ((source, kind, element), digest, path) in enumerate(plan):
+        if incremental and path:
+            results[pos] = {'source': source, 'kind': kind, 'name': Path(path).stem, 'path': path, 'error': None, 'skipped': True, 'written': False}
+        else:
+            work.append((pos, (source, element, kind, out_dir, tracing, profile)))
+
+    jobs_in = [job for _, job in work]
+    if jobs <= 1 or len(jobs_in) <= 1:
+        done = [_generate_entry(job) for job in jobs_in]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            done = list(pool.map(_generate_entry, jobs_in, chunksize=max(1, len(jobs_in) // (jobs * 4))))
+    for (pos, _), result in zip(work, done):
+        results[pos] = result
+        if result['error'] is None:
+            index.record(result['name'], plan[pos][1])
+    if done:
+        index.save()
+    return results
+
+
+def write_trace(results: List[Dict[str, Any]], path: str) -> None:
+    """Write the trace records of ``results`` as JSON lines, tagged with their footprint."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for r in results:
+            for record in r.get('trace', ()):
+                f.write(json.dumps({'source': r['source'], 'name': r['name'], **record}, default=str) + '\n')
+
+
+def print_profile(results: List[Dict[str, Any]], file=None) -> None:
+    """Print per-stage and per-kind build time and shape memory aggregated over ``results``."""
+    file = file or sys.stderr
+    stages: Dict[str, Dict[str, float]] = {}
+    kinds: Dict[str, Dict[str, float]] = {}
+    memory: Dict[str, List[int]] = {}
+    segments: Dict[str, List[int]] = {}
+    for r in results:
+        stats = r.get('profile')
+        if not stats:
+            continue
+        merge_stages(stages, stats)
+        record_stage(kinds, r['kind'], sum(e['time'] for e in stats.values()),
+                     sum(e['shapes'] for e in stats.values()), sum(e['pads'] for e in stats.values()))
+        memory.setdefault(r['kind'], []).append(r['memory'])
+        if r.get('courtyard_segments') is not None:
+            segments.setdefault(r['kind'], []).append(r['courtyard_segments'])
+    if not stages:
+        return
+    print(format_table(stages), file=file)
+    print(format_table(kinds, 'kind'), file=file)
+    print(f"{'kind':<16} {'footprints':>10} {'KiB avg':>9} {'KiB max':>9}", file=file)
+    for kind in sorted(memory):
+        sizes = memory[kind]
+        print(f"{kind:<16} {len(sizes):>10} {sum(sizes) / len(sizes) / 1024:>9.1f} {max(sizes) / 1024:>9.1f}", file=file)
+    if segments:
+        print(f"{'courtyard':<16} {'footprints':>10} {'segs avg':>9} {'segs max':>9}", file=file)
+        for kind in sorted(segments):
+            counts = segments[kind]
+            print(f"{kind:<16} {len(counts):>10} {sum(counts) / len(counts):>9.1f} {max(counts):>9}", file=file)
+
+
+def print_summary(results: List[Dict[str, Any]], file=None) -> None:
+    file = file or sys.stderr
+    failed = [r for r in results if r['error'] is not None]
+    for r in failed:
+        print(f"FAILED {r['source']} ({r['kind']}): {r['error']}", file=file)
+    skipped = sum(1 for r in results if r.get('skipped'))
+    built = len(results) - len(failed) - skipped
+    written = sum(1 for r in results if r.get('written'))
+    print(f'{built} generated ({written} written, {built - written} unchanged), {skipped} up to date, '
+          f'{len(failed)} failed, {len(results)} total', file=file)
 
 
 if __name__ == '__main__':
     import argparse
 
     parser = argparse.ArgumentParser(description='Generate KiCad .kicad_mod footprint (IPC-7351)')
-    parser.add_argument('--kind', required=True, help='Footprint kind, e.g., soic, sot23, bga')
-    parser.add_argument('--element', required=True, help='JSON file describing element and housing')
+    parser.add_argument('--kind', help='Footprint kind, e.g., soic, sot23, bga')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--element', help='JSON file describing element and housing')
+    source.add_argument('--manifest', help='JSON list of {"kind", "element"} entries to generate in one run')
+    source.add_argument('--dir', help='Directory of element JSON files to generate in one run')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for --manifest/--dir')
     parser.add_argument('--out', default='./kicad/footprints', help='Output directory (.pretty) or path')
+    parser.add_argument('--force', action='store_true', help='Rebuild everything in --manifest/--dir, ignoring the build index')
+    parser.add_argument('--plan', action='store_true', help='Only list the footprints that would be rebuilt')
+    parser.add_argument('--trace', metavar='FILE', help='Write calculator/builder trace records as JSON lines')
+    parser.add_argument('--profile', action='store_true', help='Print per-stage build timings')
     args = parser.parse_args()
 
-    with open(args.element, 'r', encoding='utf-8') as f:
-        element = json.load(f)
-    path = generate_footprint(args.kind, element, args.out)
-    print(path)
+    if args.element:
+        if not args.kind:
+            parser.error('--kind is required with --element')
+        with open(args.element, 'r', encoding='utf-8') as f:
+            entries = [(args.element, args.kind, json.load(f))]
+    else:
+        entries = load_manifest(args.manifest) if args.manifest else load_directory(args.dir, args.kind)
+    missing = [src for src, kind, _ in entries if not kind]
+    if missing:
+        parser.error(f'no kind for {missing[0]}; add a "kind" key or pass --kind')
+
+    if args.plan:
+        plan = plan_batch(entries, args.out)
+        stale = [entry for entry, _, path in plan if args.force or not path]
+        for source, kind, _ in stale:
+            print(f'{kind} {source}')
+        print(f'{len(stale)} to rebuild, {len(plan) - len(stale)} up to date', file=sys.stderr)
+        sys.exit(0)
 
+    if args.element:
+        # a single part is a straight build-and-write; the build index is for batches
+        source, kind, element = entries[0]
+        results = [_generate_entry((source, element, kind, args.out, bool(args.trace), args.profile))]
+    else:
+        results = generate_batch(entries, args.out, args.jobs, incremental=not args.force, tracing=bool(args.trace), profile=args.profile)
+    if args.trace:
+        write_trace(results, args.trace)
+    for r in results:
+        if r['path']:
+            print(r['path'])
+    if args.profile:
+        print_profile(results)
+    if args.element:
+        if results[0]['error']:
+            sys.exit(f"{args.element}: {results[0]['error']}")
+    else:
+        print_summary(results)
+        sys.exit(1 if any(r['error'] for r in results) else 0)
@@ -1,9 +1,80 @@
 import json
+import queue
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk, filedialog, messagebox
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .generate import generate_footprint, DEFAULT_SETTINGS, build_pattern
+from .generate import generate_footprint, DEFAULT_SETTINGS, describe_footprint
+
+KINDS = [
+    'soic','sop','sopfl','sotfl','soj','sol','son','sot23','sot223','sot143','sot89_5',
+    'dip','pak',
+    'qfp','qfn','pqfn','cqfp',
+    'bga','lga','cga',
+    'chip','chip_array','oscillator','crystal','cae','melf','molded','pson','dfn','radial','sod','sodfl',
+    'mounting_hole','bridge',
+]
+
+# idle time before a preview runs, and how often finished jobs are collected
+PREVIEW_DELAY_MS = 150
+POLL_MS = 50
+
+# called on the Tk thread with the job's result, or the exception it raised
+_Done = Callable[[Any, Optional[Exception]], None]
+
+
+class _Jobs:
+    """Runs jobs on one background thread, latest first.
+
+    A job submitted under a key that already has one waiting replaces it, so a
+    burst of edits costs one run. ``poll()`` hands finished jobs back to the
+    Tk thread as ``(done, result, error)``; the worker never touches widgets.
+    """
+
+    def __init__(self) -> None:
+        self._pending: 'OrderedDict[str, Tuple[Callable[[], Any], _Done]]' = OrderedDict()
+        self._running = 0
+        self._cond = threading.Condition()
+        self._finished: 'queue.SimpleQueue[Tuple[_Done, Any, Optional[Exception]]]' = queue.SimpleQueue()
+        threading.Thread(target=self._run, name='gui-jobs', daemon=True).start()
+
+    def submit(self, key: str, fn: Callable[[], Any], done: _Done) -> None:
+        with self._cond:
+            self._pending.pop(key, None)
+            self._pending[key] = (fn, done)
+            self._cond.notify()
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return bool(self._pending or self._running) or not self._finished.empty()
+
+    def poll(self) -> List[Tuple[_Done, Any, Optional[Exception]]]:
+        finished = []
+        while True:
+            try:
+                finished.append(self._finished.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                _, (fn, done) = self._pending.popitem(last=False)
+                self._running += 1
+            result = error = None
+            try:
+                result = fn()
+            except Exception as e:
+                error = e
+            # queued before the counter drops so ``busy`` never blinks off
+            self._finished.put((done, result, error))
+            with self._cond:
+                self._running -= 1
 
 
 class App(tk.Tk):
@@ -24,10 +95,21 @@ class App(tk.Tk):
 
         # Common vars
         self.name = tk.StringVar(value='')
+        # fields of the current kind; each kind's frame and vars are built on
+        # first use and kept, so switching kinds only swaps frames
         self._vars: Dict[str, tk.Variable] = {}
-        self._field_rows: List[Tuple[tk.Widget, tk.Widget]] = []
+        self._kind_frames: Dict[str, ttk.Frame] = {}
+        self._kind_vars: Dict[str, Dict[str, tk.Variable]] = {}
+        self._shown_kind = ''
+
+        # previews and generation run off the Tk thread
+        self._jobs = _Jobs()
+        self._preview_after = None
+        self._preview_seq = 0
+        self._busy_shown = False
 
         self._build_ui()
+        self.after(POLL_MS, self._poll_jobs)
 
     def _build_ui(self) -> None:
         frm = ttk.Frame(self)
@@ -35,15 +117,7 @@ class App(tk.Tk):
 
         row = 0
         ttk.Label(frm, text='Kind').grid(row=row, column=0, sticky='w')
-        kinds = [
-            'soic','sop','sopfl','sotfl','soj','sol','son','sot23','sot223','sot143','sot89_5',
-            'dip','pak',
-            'qfp','qfn','pqfn','cqfp',
-            'bga','lga','cga',
-            'chip','chip_array','oscillator','crystal','cae','melf','molded','pson','dfn','radial','sod','sodfl',
-            'mounting_hole','bridge',
-        ]
-        kind_cb = ttk.Combobox(frm, textvariable=self.kind, values=kinds, state='readonly')
+        kind_cb = ttk.Combobox(frm, textvariable=self.kind, values=KINDS, state='readonly')
         kind_cb.grid(row=row, column=1, sticky='ew')
         def _on_kind_change(_evt=None):
             self._render_fields()
@@ -77,13 +151,17 @@ class App(tk.Tk):
         # Ball collapsible toggle (for BGA/CGA) and options area
         self.opts_frame = ttk.Frame(frm)
         self.opts_frame.grid(row=row, column=0, columnspan=4, sticky='ew')
-        self.cb_collapsible = ttk.Checkbutton(self.opts_frame, text='Ball collapsible (BGA)', variable=self.collapsible)
+        bga_opts = ttk.Frame(self.opts_frame)
+        self.cb_collapsible = ttk.Checkbutton(bga_opts, text='Ball collapsible (BGA)', variable=self.collapsible)
         self.cb_collapsible.pack(side='left')
-        self.cb_concave = ttk.Checkbutton(self.opts_frame, text='Concave (Chip array)', variable=self.concave)
-        self.cb_convex_e = ttk.Checkbutton(self.opts_frame, text='Convex E (Chip array)', variable=self.convex_e)
-        self.cb_convex_s = ttk.Checkbutton(self.opts_frame, text='Convex S (Chip array)', variable=self.convex_s)
-        self.cb_flat = ttk.Checkbutton(self.opts_frame, text='Flat (Chip array)', variable=self.flat_ends)
-        ttk.Checkbutton(self.opts_frame, text='Concave (Chip array)', variable=getattr(self, 'concave', tk.BooleanVar(value=False))).pack(side='left')
+        chip_array_opts = ttk.Frame(self.opts_frame)
+        self.cb_concave = ttk.Checkbutton(chip_array_opts, text='Concave (Chip array)', variable=self.concave)
+        self.cb_convex_e = ttk.Checkbutton(chip_array_opts, text='Convex E (Chip array)', variable=self.convex_e)
+        self.cb_convex_s = ttk.Checkbutton(chip_array_opts, text='Convex S (Chip array)', variable=self.convex_s)
+        self.cb_flat = ttk.Checkbutton(chip_array_opts, text='Flat (Chip array)', variable=self.flat_ends)
+        for cb in (self.cb_concave, self.cb_convex_e, self.cb_convex_s, self.cb_flat):
+            cb.pack(side='left')
+        self._kind_opts = {'bga': bga_opts, 'chip_array': chip_array_opts}
         row += 1
 
         frm.columnconfigure(1, weight=1)
@@ -92,6 +170,7 @@ class App(tk.Tk):
         btns = ttk.Frame(frm)
         btns.grid(row=row, column=0, columnspan=4, sticky='e', pady=(10, 0))
         ttk.Button(btns, text='Generate', command=self._generate).pack(side='right')
+        self.busy = ttk.Progressbar(btns, mode='indeterminate', length=80)
 
         # initial render
         self._render_fields()
@@ -105,15 +184,9 @@ class App(tk.Tk):
         # Do not re-render fields; just refresh name preview
         self._update_name_preview()
 
-    def _clear_fields(self) -> None:
-        for lbl, ent in self._field_rows:
-            lbl.destroy()
-            ent.destroy()
-        self._field_rows.clear()
-        self._vars.clear()
-
-    def _schema_for_kind(self, kind: str) -> List[Tuple[str, str, Any]]:
-        # Returns list of (label, path, default)
+    @staticmethod
+    def _schema_for_kind(kind: str) -> List[Tuple[str, str, Any]]:
+        # Returns list of (label, path, default); read through SCHEMAS
         def rng(prefix, nom, mi, ma):
             return [
                 (f"{prefix} nom", f"{nom}", 0.0),
@@ -282,19 +355,6 @@ class App(tk.Tk):
             return base
         if kind in ('son','pson','dfn'):
             # SON: no lead span; body width/length need min/nom/max
-            # Determine current lead count (for DFN conditional fields)
-            current_leads = getattr(self, '_dfn_lead_count', 2)
-            # If the leadCount var exists (after first render), prefer its value
-            try:
-                if 'leadCount' in self._vars:
-                    val = self._vars['leadCount'].get()
-                    if str(val).isdigit():
-                        current_leads = int(val)
-                        # Update the instance variable to keep it in sync
-                        self._dfn_lead_count = current_leads
-            except Exception:
-                pass
-
             # Set SON-specific defaults
             if kind == 'son':
                 base = [
@@ -319,7 +379,7 @@ class App(tk.Tk):
                 if kind == 'dfn':
                     base.append(('Component type', 'componentType', 'capacitor'))
                 base += [
-                    ('Lead count', 'leadCount', current_leads or 2),
+                    ('Lead count', 'leadCount', 2),
                     # Always show Pitch (e); it will be ignored if unused
                     ('Pitch (e)', 'pitch', 0),
                     # Show Body length first (datasheet order), then Body width
@@ -576,14 +636,36 @@ class App(tk.Tk):
                 ('Pad height', 'padHeight', 1.0),
             ]
         # default to SOIC schema
-        return self._schema_for_kind('soic')
+        return App._schema_for_kind('soic')
 
     def _render_fields(self) -> None:
-        self._clear_fields()
+        kind = self.kind.get()
+        if kind != self._shown_kind:
+            if self._shown_kind:
+                self._kind_frames[self._shown_kind].pack_forget()
+            frame = self._kind_frames.get(kind) or self._build_fields(kind)
+            frame.pack(fill='x')
+            self._vars = self._kind_vars[kind]
+            self._shown_kind = kind
+        # Show only relevant option toggles
+        for opts_kind, opts in self._kind_opts.items():
+            if opts_kind == kind:
+                opts.pack(side='left')
+            else:
+                opts.pack_forget()
+        if kind in self._kind_opts:
+            self.opts_frame.grid()
+        else:
+            self.opts_frame.grid_remove()
+        # update name preview after rendering
+        self.after(10, self._update_name_preview)
+
+    def _build_fields(self, kind: str) -> ttk.Frame:
+        frame = ttk.Frame(self.fields_frame)
+        variables: Dict[str, tk.Variable] = {}
         row = 0
-        current_kind = self.kind.get()
-        for label, path, default in self._schema_for_kind(current_kind):
-            ttk.Label(self.fields_frame, text=label).grid(row=row, column=0, sticky='w')
+        for label, path, default in SCHEMAS.get(kind, SCHEMAS['soic']):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky='w')
             # choose var type by default value type
             if isinstance(default, int):
                 var = tk.IntVar(value=default)
@@ -592,57 +674,57 @@ class App(tk.Tk):
             else:
                 var = tk.StringVar(value=str(default))
             # Special control: DFN leadCount as dropdown 2/3/4
-            if current_kind == 'dfn' and path == 'leadCount':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=[2, 3, 4], state='readonly')
+            if kind == 'dfn' and path == 'leadCount':
+                ent = ttk.Combobox(frame, textvariable=var, values=[2, 3, 4], state='readonly')
                 try:
                     ent.set(self._dfn_lead_count)
                 except Exception:
                     pass
                 ent.bind('<<ComboboxSelected>>', lambda e, w=ent: self._on_dfn_leads_change(w))
-            elif current_kind == 'sotfl' and path == 'leadCount':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=[3, 5, 6], state='readonly')
+            elif kind == 'sotfl' and path == 'leadCount':
+                ent = ttk.Combobox(frame, textvariable=var, values=[3, 5, 6], state='readonly')
                 try:
                     ent.set(3)
                 except Exception:
                     pass
-            elif current_kind == 'oscillator' and path == 'variant':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['corner-concave', 'side-concave', 'side-flat'], state='readonly')
+            elif kind == 'oscillator' and path == 'variant':
+                ent = ttk.Combobox(frame, textvariable=var, values=['corner-concave', 'side-concave', 'side-flat'], state='readonly')
                 try:
                     ent.set('corner-concave')
                 except Exception:
                     pass
-            elif current_kind == 'sotfl' and path == 'componentType':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['ICSOFL', 'TRXSOFL'], state='readonly')
+            elif kind == 'sotfl' and path == 'componentType':
+                ent = ttk.Combobox(frame, textvariable=var, values=['ICSOFL', 'TRXSOFL'], state='readonly')
                 try:
                     ent.set('ICSOFL')
                 except Exception:
                     pass
-            elif current_kind == 'chip_array' and path == 'componentType':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['CAPCAV','INDCAV','RESCAV','INDCAF','RESCAF','CAPCAF'], state='readonly')
+            elif kind == 'chip_array' and path == 'componentType':
+                ent = ttk.Combobox(frame, textvariable=var, values=['CAPCAV','INDCAV','RESCAV','INDCAF','RESCAF','CAPCAF'], state='readonly')
                 try:
                     ent.set('CAPCAV')
                 except Exception:
                     pass
-            elif current_kind == 'chip' and path == 'componentType':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['CAPC','RESC','LEDC','DIOC','FUSC','BEADC','THRMC','VARC','INDC'], state='readonly')
+            elif kind == 'chip' and path == 'componentType':
+                ent = ttk.Combobox(frame, textvariable=var, values=['CAPC','RESC','LEDC','DIOC','FUSC','BEADC','THRMC','VARC','INDC'], state='readonly')
                 try:
                     ent.set('CAPC')
                 except Exception:
                     pass
-            elif current_kind == 'molded' and path == 'componentType':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['capacitor','capacitor_polarized','diode','diode_non_polarized','fuse','inductor','inductor_precision','led','resistor'], state='readonly')
+            elif kind == 'molded' and path == 'componentType':
+                ent = ttk.Combobox(frame, textvariable=var, values=['capacitor','capacitor_polarized','diode','diode_non_polarized','fuse','inductor','inductor_precision','led','resistor'], state='readonly')
                 try:
                     ent.set('capacitor')
                 except Exception:
                     pass
-            elif current_kind == 'dfn' and path == 'componentType':
-                ent = ttk.Combobox(self.fields_frame, textvariable=var, values=['capacitor','capacitor_polarized','crystal','diode','diode_non_polarized','fuse','inductor','led','resistor','transistor'], state='readonly')
+            elif kind == 'dfn' and path == 'componentType':
+                ent = ttk.Combobox(frame, textvariable=var, values=['capacitor','capacitor_polarized','crystal','diode','diode_non_polarized','fuse','inductor','led','resistor','transistor'], state='readonly')
                 try:
                     ent.set('capacitor')
                 except Exception:
                     pass
             else:
-                ent = ttk.Entry(self.fields_frame, textvariable=var)
+                ent = ttk.Entry(frame, textvariable=var)
             ent.grid(row=row, column=1, sticky='ew')
             # trigger live name preview when fields change
             try:
@@ -651,30 +733,12 @@ class App(tk.Tk):
                 ent.bind('<FocusOut>', lambda e: self._update_name_preview())
             except Exception:
                 pass
-            self._vars[path] = var
-            self._field_rows.append((self.fields_frame.grid_slaves(row=row, column=0)[0], ent))
+            variables[path] = var
             row += 1
-        self.fields_frame.columnconfigure(1, weight=1)
-        # Show only relevant option toggles
-        kind = self.kind.get()
-        if kind == 'bga':
-            self.opts_frame.grid()
-            # Show collapsible, hide chip-array toggles
-            for child in self.opts_frame.winfo_children():
-                child.pack_forget()
-            ttk.Checkbutton(self.opts_frame, text='Ball collapsible (BGA)', variable=self.collapsible).pack(side='left')
-        elif kind == 'chip_array':
-            self.opts_frame.grid()
-            for child in self.opts_frame.winfo_children():
-                child.pack_forget()
-            ttk.Checkbutton(self.opts_frame, text='Concave (Chip array)', variable=self.concave).pack(side='left')
-            ttk.Checkbutton(self.opts_frame, text='Convex E (Chip array)', variable=self.convex_e).pack(side='left')
-            ttk.Checkbutton(self.opts_frame, text='Convex S (Chip array)', variable=self.convex_s).pack(side='left')
-            ttk.Checkbutton(self.opts_frame, text='Flat (Chip array)', variable=self.flat_ends).pack(side='left')
-        else:
-            self.opts_frame.grid_remove()
-        # update name preview after rendering
-        self.after(10, self._update_name_preview)
+        frame.columnconfigure(1, weight=1)
+        self._kind_frames[kind] = frame
+        self._kind_vars[kind] = variables
+        return frame
 
     def _pick_out(self) -> None:
         d = filedialog.askdirectory()
@@ -692,9 +756,10 @@ class App(tk.Tk):
 
     def _element_dict(self) -> Dict[str, Any]:
         # Minimal element object compatible with our builder
-        settings = dict(DEFAULT_SETTINGS)
-        settings['densityLevel'] = self.density.get()
-        settings['ball']['collapsible'] = self.collapsible.get()
+        settings = DEFAULT_SETTINGS.override({
+            'densityLevel': self.density.get(),
+            'ball': {'collapsible': self.collapsible.get()},
+        })
         housing: Dict[str, Any] = {'polarized': True}
         # apply vars
         for path, var in self._vars.items():
@@ -776,123 +841,72 @@ class App(tk.Tk):
         }
         return element
 
-    def _update_dfn_conditional_fields(self, lead_count: int) -> None:
-        """Update DFN conditional fields based on lead count without full rebuild"""
-        # Get current kind to verify we're still in DFN mode
-        if self.kind.get() != 'dfn':
-            return
-            
-        # Fields that need to be conditionally shown/hidden
-        pitch_field = 'pitch'
-        large_pad_fields = [
-            'largePadWidth.nom', 'largePadWidth.min', 'largePadWidth.max',
-            'largePadLength.nom', 'largePadLength.min', 'largePadLength.max'
-        ]
-        
-        # Determine what should be visible
-        show_pitch = lead_count >= 3
-        show_large_pads = lead_count == 3
-        
-        # Find the current field rows to update
-        existing_pitch_row = None
-        existing_large_pad_rows = []
-        
-        for label_widget, entry_widget in self._field_rows:
-            label_text = label_widget.cget('text')
-            if 'Pitch (e)' in label_text:
-                existing_pitch_row = (label_widget, entry_widget)
-            elif any(field in label_text for field in ['Large pad width', 'Large pad length']):
-                existing_large_pad_rows.append((label_widget, entry_widget))
-        
-        # Handle Pitch (e) field
-        if show_pitch and not existing_pitch_row:
-            # Add Pitch (e) field
-            self._add_field_row('Pitch (e)', 'pitch', 0)
-        elif not show_pitch and existing_pitch_row:
-            # Remove Pitch (e) field
-            self._remove_field_row(existing_pitch_row)
-            
-        # Handle large pad fields
-        if show_large_pads and not existing_large_pad_rows:
-            # Add large pad fields
-            self._add_field_row('Large pad width nom', 'largePadWidth.nom', 1.2)
-            self._add_field_row('Large pad width min', 'largePadWidth.min', 1.0)
-            self._add_field_row('Large pad width max', 'largePadWidth.max', 1.4)
-            self._add_field_row('Large pad length nom', 'largePadLength.nom', 1.8)
-            self._add_field_row('Large pad length min', 'largePadLength.min', 1.6)
-            self._add_field_row('Large pad length max', 'largePadLength.max', 2.0)
-        elif not show_large_pads and existing_large_pad_rows:
-            # Remove large pad fields
-            for row in existing_large_pad_rows:
-                self._remove_field_row(row)
-
-    def _add_field_row(self, label_text: str, var_path: str, default_value) -> None:
-        """Add a single field row to the GUI"""
-        # Find the next available row
-        max_row = max([widget.grid_info()['row'] for widget in self.fields_frame.grid_slaves()], default=-1)
-        row = max_row + 1
-        
-        # Create label and entry
-        label = ttk.Label(self.fields_frame, text=label_text)
-        label.grid(row=row, column=0, sticky='w', padx=(0, 10))
-        
-        var = tk.StringVar(value=str(default_value))
-        entry = ttk.Entry(self.fields_frame, textvariable=var)
-        entry.grid(row=row, column=1, sticky='ew')
-        
-        # Add event bindings
+    def _update_name_preview(self) -> None:
+        # debounce: restart the wait on every edit
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(PREVIEW_DELAY_MS, self._submit_name_preview)
+
+    def _submit_name_preview(self) -> None:
+        self._preview_after = None
         try:
-            entry.bind('<<ComboboxSelected>>', lambda e: self._update_name_preview())
-            entry.bind('<KeyRelease>', lambda e: self._update_name_preview())
-            entry.bind('<FocusOut>', lambda e: self._update_name_preview())
+            element = self._element_dict()
         except Exception:
-            pass
-            
-        # Store the variable and row
-        self._vars[var_path] = var
-        self._field_rows.append((label, entry))
-
-    def _remove_field_row(self, field_row) -> None:
-        """Remove a single field row from the GUI"""
-        label_widget, entry_widget = field_row
-        
-        # Remove from grid
-        label_widget.grid_remove()
-        entry_widget.grid_remove()
-        
-        # Remove from tracking lists
-        if field_row in self._field_rows:
-            self._field_rows.remove(field_row)
-            
-        # Find and remove the variable
-        for var_path, var in list(self._vars.items()):
-            if var == entry_widget.cget('textvariable'):
-                del self._vars[var_path]
-                break
+            # ignore preview errors to keep UI responsive
+            return
+        current = self.name.get().strip()
+        if not current or current == self._auto_name:
+            # let the builder derive the name rather than echo the old one
+            element['name'] = ''
+        kind = self.kind.get()
+        self._preview_seq += 1
+        seq = self._preview_seq
 
-    def _update_name_preview(self) -> None:
-        try:
+        def done(found, error):
+            if error is not None or seq != self._preview_seq:
+                return
+            new_name = found[0]
             prev_auto = self._auto_name
-            element = self._element_dict()
-            # Avoid writing files; just build to derive name
-            pattern = build_pattern(self.kind.get(), element)
-            new_name = pattern.name
             current = self.name.get().strip()
             # If current is empty or matches the previous auto-generated name,
             # update to the newly computed name and track it.
             if (not current) or (prev_auto and current == prev_auto):
                 self.name.set(new_name)
                 self._auto_name = new_name
-        except Exception:
-            # ignore preview errors to keep UI responsive
-            pass
+
+        self._jobs.submit('preview', lambda: describe_footprint(kind, element), done)
 
     def _generate(self) -> None:
         try:
-            out = generate_footprint(self.kind.get(), self._element_dict(), self.out_dir.get())
-            messagebox.showinfo('Generated', out)
+            kind, element, out_dir = self.kind.get(), self._element_dict(), self.out_dir.get()
         except Exception as e:
             messagebox.showerror('Error', str(e))
+            return
+
+        def done(out, error):
+            if error is not None:
+                messagebox.showerror('Error', str(error))
+            else:
+                messagebox.showinfo('Generated', out)
+
+        self._jobs.submit('generate', lambda: generate_footprint(kind, element, out_dir), done)
+
+    def _poll_jobs(self) -> None:
+        for done, result, error in self._jobs.poll():
+            done(result, error)
+        busy = self._jobs.busy
+        if busy != self._busy_shown:
+            if busy:
+                self.busy.pack(side='right', padx=(0, 10))
+                self.busy.start(10)
+            else:
+                self.busy.stop()
+                self.busy.pack_forget()
+            self._busy_shown = busy
+        self.after(POLL_MS, self._poll_jobs)
+
+# (label, path, default) of the form fields of each kind
+SCHEMAS: Dict[str, List[Tuple[str, str, Any]]] = {kind: App._schema_for_kind(kind) for kind in KINDS}
 
 
 if __name__ == '__main__':
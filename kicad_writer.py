@@ -1,80 +1,563 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from copy import copy
+from itertools import compress, repeat
+from math import nan
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
-@dataclass
 class PatternShape:
-    kind: str
-    # Generic attributes used by writer, mirror of QedaPattern shapes
-    x: float = 0.0
-    y: float = 0.0
-    x1: float = 0.0
-    y1: float = 0.0
-    x2: float = 0.0
-    y2: float = 0.0
-    radius: float = 0.0
-    width: float = 0.0
-    height: float = 0.0
-    lineWidth: float = 0.0
-    fill: bool = False
-    layer: Optional[List[str]] = None
-    # text/attributes
-    name: Optional[str] = None
-    text: Optional[str] = None
-    fontSize: Optional[float] = None
-    angle: Optional[float] = None
-    visible: Optional[bool] = None
-    # pad
-    shape: Optional[str] = None
-    type: Optional[str] = None
-    hole: Optional[float] = None
-    slotWidth: Optional[float] = None
-    slotHeight: Optional[float] = None
-    mask: Optional[float] = None
-    paste: Optional[float] = None
-    clearance: Optional[float] = None
-    dieLength: Optional[float] = None
-    chamfer: Optional[List[str]] = None
-    property: Optional[str] = None
-    # pad identity
-    pad_name: Optional[str] = None
+    """Base of the shape records written to a footprint.
+
+    Every kind has its own slotted record that only stores the fields the
+    writer reads for it. ``PatternShape(kind=..., **fields)`` still works and
+    returns the record class registered for ``kind``.
+    """
+    __slots__ = ()
+    kind = ''
+
+    def __new__(cls, *args, **fields):
+        if cls is PatternShape:
+            cls = SHAPE_TYPES[fields.get('kind', args[0] if args else None)]
+        return object.__new__(cls)
+
+    def _fields(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={value!r}' for name, value in self._fields())
+        return f'{type(self).__name__}({fields})'
+
+
+class LineShape(PatternShape):
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'lineWidth', 'layer')
+    kind = 'line'
+
+    def __init__(self, kind='line', x1=0.0, y1=0.0, x2=0.0, y2=0.0, lineWidth=0.0, layer=None):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.lineWidth = lineWidth
+        self.layer = layer
+
+
+class RectangleShape(PatternShape):
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'lineWidth', 'layer', 'fill')
+    kind = 'rectangle'
+
+    def __init__(self, kind='rectangle', x1=0.0, y1=0.0, x2=0.0, y2=0.0, lineWidth=0.0, layer=None, fill=False):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.lineWidth = lineWidth
+        self.layer = layer
+        self.fill = fill
+
+
+class CircleShape(PatternShape):
+    __slots__ = ('x', 'y', 'radius', 'lineWidth', 'layer', 'fill')
+    kind = 'circle'
+
+    def __init__(self, kind='circle', x=0.0, y=0.0, radius=0.0, lineWidth=0.0, layer=None, fill=False):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.lineWidth = lineWidth
+        self.layer = layer
+        self.fill = fill
+
+
+class AttributeShape(PatternShape):
+    __slots__ = ('name', 'text', 'x', 'y', 'fontSize', 'angle', 'visible', 'lineWidth', 'layer')
+    kind = 'attribute'
+
+    def __init__(self, kind='attribute', name=None, text=None, x=0.0, y=0.0, fontSize=None, angle=None,
+                 visible=None, lineWidth=0.0, layer=None):
+        self.name = name
+        self.text = text
+        self.x = x
+        self.y = y
+        self.fontSize = fontSize
+        self.angle = angle
+        self.visible = visible
+        self.lineWidth = lineWidth
+        self.layer = layer
+
+
+class PadShape(PatternShape):
+    __slots__ = ('pad_name', 'x', 'y', 'width', 'height', 'type', 'shape', 'hole', 'slotWidth', 'slotHeight',
+                 'mask', 'paste', 'clearance', 'dieLength', 'chamfer', 'property', 'layer')
+    kind = 'pad'
+
+    def __init__(self, kind='pad', pad_name=None, x=0.0, y=0.0, width=0.0, height=0.0, type=None, shape=None,
+                 hole=None, slotWidth=None, slotHeight=None, mask=None, paste=None, clearance=None,
+                 dieLength=None, chamfer=None, property=None, layer=None):
+        self.pad_name = pad_name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.type = type
+        self.shape = shape
+        self.hole = hole
+        self.slotWidth = slotWidth
+        self.slotHeight = slotHeight
+        self.mask = mask
+        self.paste = paste
+        self.clearance = clearance
+        self.dieLength = dieLength
+        self.chamfer = chamfer
+        self.property = property
+        self.layer = layer
+
+
+class PadNames(ABC):
+    """Names of the populated pads of a PadArray.
+
+    Every pad has a slot, its position in the full array (row-major for a
+    grid), and the name is derived from the slot, so only the slots of a
+    depopulated array are stored. ``index(name)`` goes the other way.
+    A naming rule implements ``name`` and ``slot``.
+    """
+    __slots__ = ('slots',)
+
+    def __init__(self, slots) -> None:
+        self.slots = slots
+
+    @abstractmethod
+    def name(self, slot: int) -> str:
+        """Name of the pad at ``slot``."""
+
+    @abstractmethod
+    def slot(self, name: str) -> Optional[int]:
+        """Slot that ``name`` would have under this rule, or None."""
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __getitem__(self, i: int) -> str:
+        return self.name(self.slots[i])
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.name, self.slots)
+
+    def index(self, name: str) -> Optional[int]:
+        """Position of the pad called ``name``, or None."""
+        slot = self.slot(name)
+        if slot is None:
+            return None
+        slots = self.slots
+        i = bisect_left(slots, slot)
+        if i == len(slots) or slots[i] != slot or self.name(slot) != name:
+            return None
+        return i
+
+    def subset(self, keep: Iterable[bool]) -> 'PadNames':
+        """The same naming rule over the slots selected by ``keep``."""
+        names = copy(self)
+        names.slots = array('l', compress(self.slots, keep))
+        return names
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.slots)
+
+
+class SequenceNames(PadNames):
+    """``start``, ``start + step``, ... numbered pads along one side."""
+    __slots__ = ('start', 'step')
+
+    def __init__(self, start: int, step: int, count: int) -> None:
+        super().__init__(range(count))
+        self.start = start
+        self.step = step
+
+    def name(self, slot: int) -> str:
+        return str(self.start + self.step * slot)
+
+    def slot(self, name: str) -> Optional[int]:
+        try:
+            slot, rest = divmod(int(name) - self.start, self.step)
+        except ValueError:
+            return None
+        return slot if rest == 0 and slot >= 0 else None
+
+
+class GridNames(PadNames):
+    """Row letters followed by the 1-based column, as in ``A1``."""
+    __slots__ = ('letters', 'columns', 'rows')
+
+    def __init__(self, letters, rows: int, columns: int) -> None:
+        super().__init__(range(rows * columns))
+        self.letters = [letters[row] for row in range(1, rows + 1)]
+        self.columns = columns
+        self.rows = {text: row for row, text in enumerate(self.letters)}
+
+    def name(self, slot: int) -> str:
+        row, col = divmod(slot, self.columns)
+        return f"{self.letters[row]}{col + 1}"
+
+    def slot(self, name: str) -> Optional[int]:
+        digits = len(name)
+        while digits and name[digits - 1].isdigit():
+            digits -= 1
+        row = self.rows.get(name[:digits])
+        if row is None or digits == len(name):
+            return None
+        return row * self.columns + int(name[digits:]) - 1
+
+
+class PadArray(PatternShape):
+    """Pads sharing everything but their position, written out one by one.
+
+    ``template`` holds the common fields. Per pad only the centre, the height
+    when it varies, and the solder mask margin once copper.mask has set it are
+    kept in columns; the few fields changed on single pads after placement go
+    to ``changes``. ``revision`` counts geometry changes.
+    """
+    __slots__ = ('template', 'names', 'xs', 'ys', 'heights', 'masks', 'changes', 'revision')
+    kind = 'pad_array'
+    # a mutable container: compared and hashed by identity
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __init__(self, template: PadShape, names: PadNames, xs, ys, heights=None) -> None:
+        self.template = template
+        self.names = names
+        self.xs = array('d', xs)
+        self.ys = array('d', ys)
+        self.heights = None if heights is None else array('d', heights)
+        self.masks = None
+        self.changes: Optional[Dict[int, dict]] = None
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, i: int) -> 'ArrayPad':
+        if not -len(self.xs) <= i < len(self.xs):
+            raise IndexError(i)
+        return ArrayPad(self, i % len(self.xs))
+
+    def __iter__(self) -> Iterator['ArrayPad']:
+        return map(ArrayPad, repeat(self), range(len(self.xs)))
+
+    def index(self, name: str) -> Optional[int]:
+        return self.names.index(name)
+
+    def extent(self) -> Tuple[float, float, float, float]:
+        """Smallest ``(xmin, ymin, xmax, ymax)`` enclosing the pads."""
+        if self.changes or self.heights is not None:
+            pads = list(self)
+            return (min(p.x - p.width / 2 for p in pads), min(p.y - p.height / 2 for p in pads),
+                    max(p.x + p.width / 2 for p in pads), max(p.y + p.height / 2 for p in pads))
+        # rounding is monotonic, so the extreme centre gives the extreme edge
+        hw = self.template.width / 2
+        hh = self.template.height / 2
+        return min(self.xs) - hw, min(self.ys) - hh, max(self.xs) + hw, max(self.ys) + hh
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self) + sys.getsizeof(self.template) + sys.getsizeof(self.names)
+        for column in (self.xs, self.ys, self.heights, self.masks, self.changes):
+            if column is not None:
+                size += sys.getsizeof(column)
+        return size
+
+
+def _template_field(name: str) -> property:
+    def get(self):
+        changes = self.array.changes
+        if changes:
+            own = changes.get(self.index)
+            if own and name in own:
+                return own[name]
+        return getattr(self.array.template, name)
+
+    def set(self, value):
+        array_ = self.array
+        if array_.changes is None:
+            array_.changes = {}
+        array_.changes.setdefault(self.index, {})[name] = value
+        array_.revision += 1
+
+    return property(get, set)
+
+
+class ArrayPad:
+    """One pad of a PadArray, read and written like a PadShape."""
+    __slots__ = ('array', 'index')
+    kind = 'pad'
+
+    def __init__(self, array_: PadArray, index: int) -> None:
+        self.array = array_
+        self.index = index
+
+    @property
+    def pad_name(self) -> str:
+        return self.array.names[self.index]
+
+    @property
+    def x(self) -> float:
+        return self.array.xs[self.index]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.array.xs[self.index] = value
+        self.array.revision += 1
+
+    @property
+    def y(self) -> float:
+        return self.array.ys[self.index]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.array.ys[self.index] = value
+        self.array.revision += 1
+
+    @property
+    def height(self) -> float:
+        heights = self.array.heights
+        return self.array.template.height if heights is None else heights[self.index]
+
+    @height.setter
+    def height(self, value: float) -> None:
+        array_ = self.array
+        if array_.heights is None:
+            array_.heights = array('d', repeat(array_.template.height, len(array_)))
+        array_.heights[self.index] = value
+        array_.revision += 1
+
+    @property
+    def mask(self) -> Optional[float]:
+        masks = self.array.masks
+        if masks is None:
+            return self.array.template.mask
+        value = masks[self.index]
+        return None if value != value else value
+
+    @mask.setter
+    def mask(self, value: Optional[float]) -> None:
+        array_ = self.array
+        if array_.masks is None:
+            default = array_.template.mask
+            array_.masks = array('d', repeat(nan if default is None else default, len(array_)))
+        array_.masks[self.index] = nan if value is None else value
+
+    width = _template_field('width')
+    type = _template_field('type')
+    shape = _template_field('shape')
+    hole = _template_field('hole')
+    slotWidth = _template_field('slotWidth')
+    slotHeight = _template_field('slotHeight')
+    paste = _template_field('paste')
+    clearance = _template_field('clearance')
+    dieLength = _template_field('dieLength')
+    chamfer = _template_field('chamfer')
+    property = _template_field('property')
+    layer = _template_field('layer')
+
+    def __repr__(self):
+        return f'ArrayPad({self.pad_name!r}, x={self.x!r}, y={self.y!r})'
+
+
+SHAPE_TYPES = {cls.kind: cls for cls in (LineShape, RectangleShape, CircleShape, AttributeShape, PadShape, PadArray)}
+
+
+def shapes_memory(shapes: Iterable[PatternShape]) -> int:
+    """Bytes held by the shape records themselves (shared layer lists excluded)."""
+    return sum(sys.getsizeof(s) for s in shapes)
+
+
+# Most coordinates, sizes and layer lists of a footprint repeat, so their text
+# is cached. The caches are bounded and simply start over when full.
+_CACHE_MAX = 1 << 14
+_formatted: Dict[int, Dict[float, str]] = {}
 
 
 def _fmt(x: float, decimals: int) -> str:
-    return f"{x:.{decimals}f}"
+    if not x:
+        # 0.0 and -0.0 are equal keys but print differently
+        return f"{x:.{decimals}f}"
+    cache = _formatted.get(decimals)
+    if cache is None:
+        cache = _formatted[decimals] = {}
+    text = cache.get(x)
+    if text is None:
+        if len(cache) >= _CACHE_MAX:
+            cache.clear()
+        text = cache[x] = f"{x:.{decimals}f}"
+    return text
+
+
+# Integer nanometre coordinates (KiCad's internal unit), see QedaPattern.nm
+NM_PER_MM = 1_000_000
+
+
+def to_nm(mm: float) -> int:
+    return round(mm * NM_PER_MM)
+
+
+_formatted_nm: Dict[int, Dict[int, str]] = {}
+
+
+def _fmt_int(nm: int, decimals: int) -> str:
+    """Integer nanometres as millimetres with ``decimals`` places, ties away from zero."""
+    cache = _formatted_nm.get(decimals)
+    if cache is None:
+        cache = _formatted_nm[decimals] = {}
+    text = cache.get(nm)
+    if text is None:
+        if len(cache) >= _CACHE_MAX:
+            cache.clear()
+        text = cache[nm] = _format_nm(nm, decimals)
+    return text
+
+
+def _format_nm(nm: int, decimals: int) -> str:
+    if decimals >= 6:
+        units = abs(nm) * 10 ** (decimals - 6)
+    else:
+        step = 10 ** (6 - decimals)
+        units = (abs(nm) + step // 2) // step
+    digits = str(units).rjust(decimals + 1, '0')
+    sign = '-' if nm < 0 and units else ''
+    if not decimals:
+        return sign + digits
+    return f"{sign}{digits[:-decimals]}.{digits[-decimals:]}"
+
+
+def _fmt_nm(mm: float, decimals: int) -> str:
+    return _fmt_int(to_nm(mm), decimals)
+
+
+_LAYER_NAMES = {
+    'topCopper': 'F.Cu',
+    'topMask': 'F.Mask',
+    'topPaste': 'F.Paste',
+    'topSilkscreen': 'F.SilkS',
+    'topAssembly': 'F.Fab',
+    'topCourtyard': 'F.CrtYd',
+    'intCopper': '*.Cu',
+    'bottomCopper': 'B.Cu',
+    'bottomMask': 'B.Mask',
+    'bottomPaste': 'B.Paste',
+    'bottomSilkscreen': 'B.SilkS',
+    'bottomAssembly': 'B.Fab',
+    'bottomCourtyard': 'B.CrtYd',
+}
+_layer_strings: Dict[Tuple[str, ...], str] = {}
 
 
 def _map_layers(layers: List[str]) -> str:
-    table = {
-        'topCopper': 'F.Cu',
-        'topMask': 'F.Mask',
-        'topPaste': 'F.Paste',
-        'topSilkscreen': 'F.SilkS',
-        'topAssembly': 'F.Fab',
-        'topCourtyard': 'F.CrtYd',
-        'intCopper': '*.Cu',
-        'bottomCopper': 'B.Cu',
-        'bottomMask': 'B.Mask',
-        'bottomPaste': 'B.Paste',
-        'bottomSilkscreen': 'B.SilkS',
-        'bottomAssembly': 'B.Fab',
-        'bottomCourtyard': 'B.CrtYd',
-    }
-    return " ".join(table[l] for l in layers)
-
-
-def write_kicad_mod(module_name: str, shapes: List[PatternShape], pattern_type: str, decimals: int, model: Optional[dict] = None, descr: Optional[str] = None, tags: Optional[str] = None) -> str:
-    lines: List[str] = []
-    lines.append(f"(module {module_name} (layer F.Cu)")
+    key = tuple(layers)
+    text = _layer_strings.get(key)
+    if text is None:
+        text = _layer_strings[key] = sys.intern(" ".join(_LAYER_NAMES[l] for l in layers))
+    return text
+
+
+_pad_sizes: Dict[tuple, str] = {}
+_rratios: Dict[Tuple[float, float], str] = {}
+
+
+def _pad_size(width: float, height: float, decimals: int, fmt: Callable[[float, int], str]) -> str:
+    if not (width and height):
+        return f"{fmt(width, decimals)} {fmt(height, decimals)}"
+    key = (width, height, decimals, fmt)
+    text = _pad_sizes.get(key)
+    if text is None:
+        if len(_pad_sizes) >= _CACHE_MAX:
+            _pad_sizes.clear()
+        text = _pad_sizes[key] = f"{fmt(width, decimals)} {fmt(height, decimals)}"
+    return text
+
+
+def _rratio(width: float, height: float) -> str:
+    """``roundrect_rratio`` sub-record of a pad, 0.1 mm corners capped at 25%."""
+    key = (width, height)
+    text = _rratios.get(key)
+    if text is None:
+        if len(_rratios) >= _CACHE_MAX:
+            _rratios.clear()
+        min_dimension = min(width, height)
+        rratio = min(0.25, 0.1 / min_dimension)
+        text = _rratios[key] = f"\n    (roundrect_rratio {_fmt(rratio, 10)})"
+    return text
+
+
+def _pad(s, decimals: int, fmt: Callable[[float, int], str]) -> str:
+    shape = s.shape or 'rect'
+    if shape == 'rectangle':
+        shape = 'rect'
+
+    # Convert rectangular pads to round rectangles
+    if shape == 'rect':
+        shape = 'roundrect'
+
+    pad_type = s.type
+    if pad_type == 'through-hole':
+        pad_type = 'thru_hole'
+    elif pad_type == 'mounting-hole':
+        pad_type = 'np_thru_hole'
+
+    # KiCad 7 smooth corners and extras
+    width = s.width
+    height = s.height
+    parts = [
+        f"  (pad {s.pad_name} {pad_type} {shape} (at {fmt(s.x, decimals)} {fmt(s.y, decimals)}) (size {_pad_size(width, height, decimals, fmt)}) (layers {_map_layers(s.layer)})"
+    ]
+
+    # Add roundrect_rratio for roundrect pads
+    if shape == 'roundrect':
+        parts.append(_rratio(width, height))
+
+    if s.slotWidth is not None and s.slotHeight is not None:
+        parts.append(f"\n    (drill oval {fmt(s.slotWidth, decimals)} {fmt(s.slotHeight, decimals)})")
+    elif s.hole is not None:
+        parts.append(f"\n    (drill {fmt(s.hole, decimals)})")
+    if s.mask is not None:
+        parts.append(f"\n    (solder_mask_margin {fmt(s.mask, decimals)})")
+    if s.paste is not None:
+        parts.append(f"\n    (solder_paste_margin {fmt(s.paste, decimals)})")
+    if s.clearance is not None:
+        parts.append(f"\n    (clearance {fmt(s.clearance, decimals)})")
+    if s.dieLength is not None:
+        parts.append(f"\n    (die_length {fmt(s.dieLength, decimals)})")
+    if s.property == 'testpoint':
+        parts.append("\n    (property pad_prop_testpoint)")
+    parts.append(")\n")
+    return ''.join(parts)
+
+
+def iter_kicad_mod(module_name: str, shapes: Iterable[PatternShape], pattern_type: str, decimals: int, model: Optional[dict] = None, descr: Optional[str] = None, tags: Optional[str] = None, nm: bool = False) -> Iterator[str]:
+    """Yield the ``.kicad_mod`` text one record at a time, each ending in a newline.
+
+    With ``nm`` the graphic shapes hold integer nanometres and pad geometry is
+    converted to them before formatting (see ``QedaPattern.nm``).
+    """
+    fmt, pad_fmt = (_fmt_int, _fmt_nm) if nm else (_fmt, _fmt)
+    # default text size and stroke, 1 mm and 0.12 mm
+    font, thickness = (NM_PER_MM, 120_000) if nm else (1.0, 0.12)
+    yield f"(module {module_name} (layer F.Cu)\n"
     if descr:
-        lines.append(f'  (descr "{descr}")')
+        yield f'  (descr "{descr}")\n'
     if tags:
-        lines.append(f'  (tags "{tags}")')
+        yield f'  (tags "{tags}")\n'
     attrs = []
     if pattern_type == 'smd':
         attrs.append('smd')
     if attrs:
-        lines.append(f"  (attr {' '.join(attrs)})")
+        yield f"  (attr {' '.join(attrs)})\n"
 
     for s in shapes:
         if s.kind == 'attribute':
@@ -91,89 +574,73 @@ def write_kicad_mod(module_name: str, shapes: List[PatternShape], pattern_type:
             angle = f" {int(s.angle)}" if s.angle is not None else ""
             # Hide value field by default, or if explicitly set to hidden
             hide = " hide" if (name_field == 'value' or s.visible is False) else ""
-            lines.append(
-                f"  (fp_text {name_field} {text} (at {_fmt(s.x, decimals)} {_fmt(s.y, decimals)}{angle}){hide} (layer {_map_layers(s.layer)})"
-            )
-            lines.append(
-                f"    (effects (font (size {_fmt(s.fontSize or 1.0, decimals)} {_fmt(s.fontSize or 1.0, decimals)}) (thickness {_fmt(s.lineWidth or 0.12, decimals)})))"
+            yield (
+                f"  (fp_text {name_field} {text} (at {fmt(s.x, decimals)} {fmt(s.y, decimals)}{angle}){hide} (layer {_map_layers(s.layer)})\n"
+                f"    (effects (font (size {fmt(s.fontSize or font, decimals)} {fmt(s.fontSize or font, decimals)}) (thickness {fmt(s.lineWidth or thickness, decimals)})))\n"
+                "  )\n"
             )
-            lines.append("  )")
         elif s.kind == 'circle':
-            lines.append(
-                f"  (fp_circle (center {_fmt(s.x, decimals)} {_fmt(s.y, decimals)}) (end {_fmt(s.x, decimals)} {_fmt(s.y + s.radius, decimals)}) (layer {_map_layers(s.layer)}) (width {_fmt(s.lineWidth, decimals)})"
+            fill = " (fill solid)" if s.fill else ""
+            yield (
+                f"  (fp_circle (center {fmt(s.x, decimals)} {fmt(s.y, decimals)}) (end {fmt(s.x, decimals)} {fmt(s.y + s.radius, decimals)}) (layer {_map_layers(s.layer)}) (width {fmt(s.lineWidth, decimals)}){fill})\n"
             )
-            if s.fill:
-                lines[-1] += " (fill solid)"
-            lines[-1] += ")"
         elif s.kind == 'line':
-            lines.append(
-                f"  (fp_line (start {_fmt(s.x1, decimals)} {_fmt(s.y1, decimals)}) (end {_fmt(s.x2, decimals)} {_fmt(s.y2, decimals)}) (layer {_map_layers(s.layer)}) (width {_fmt(s.lineWidth, decimals)}))"
+            yield (
+                f"  (fp_line (start {fmt(s.x1, decimals)} {fmt(s.y1, decimals)}) (end {fmt(s.x2, decimals)} {fmt(s.y2, decimals)}) (layer {_map_layers(s.layer)}) (width {fmt(s.lineWidth, decimals)}))\n"
             )
         elif s.kind == 'rectangle':
-            lines.append(
-                f"  (fp_rect (start {_fmt(s.x1, decimals)} {_fmt(s.y1, decimals)}) (end {_fmt(s.x2, decimals)} {_fmt(s.y2, decimals)}) (layer {_map_layers(s.layer)}) (width {_fmt(s.lineWidth, decimals)})"
+            fill = " (fill solid)" if s.fill else ""
+            yield (
+                f"  (fp_rect (start {fmt(s.x1, decimals)} {fmt(s.y1, decimals)}) (end {fmt(s.x2, decimals)} {fmt(s.y2, decimals)}) (layer {_map_layers(s.layer)}) (width {fmt(s.lineWidth, decimals)}){fill})\n"
             )
-            if s.fill:
-                lines[-1] += " (fill solid)"
-            lines[-1] += ")"
         elif s.kind == 'pad':
-            shape = s.shape or 'rect'
-            if shape == 'rectangle':
-                shape = 'rect'
-            
-            # Convert rectangular pads to round rectangles
-            if shape == 'rect':
-                shape = 'roundrect'
-            
-            pad_type = s.type
-            if pad_type == 'through-hole':
-                pad_type = 'thru_hole'
-            elif pad_type == 'mounting-hole':
-                pad_type = 'np_thru_hole'
-            
-            # KiCad 7 smooth corners and extras
-            line = (
-                f"  (pad {s.pad_name} {pad_type} {shape} (at {_fmt(s.x, decimals)} {_fmt(s.y, decimals)}) (size {_fmt(s.width, decimals)} {_fmt(s.height, decimals)}) (layers {_map_layers(s.layer)})"
-            )
-            
-            # Add roundrect_rratio for roundrect pads
-            if shape == 'roundrect':
-                pad_w = s.width
-                pad_h = s.height
-                min_dimension = min(pad_w, pad_h)
-                rratio = min(0.25, 0.1 / min_dimension)
-                line += f"\n    (roundrect_rratio {_fmt(rratio, 10)})"
-            
-            if s.slotWidth is not None and s.slotHeight is not None:
-                line += f"\n    (drill oval {_fmt(s.slotWidth, decimals)} {_fmt(s.slotHeight, decimals)})"
-            elif s.hole is not None:
-                line += f"\n    (drill {_fmt(s.hole, decimals)})"
-            if s.mask is not None:
-                line += f"\n    (solder_mask_margin {_fmt(s.mask, decimals)})"
-            if s.paste is not None:
-                line += f"\n    (solder_paste_margin {_fmt(s.paste, decimals)})"
-            if s.clearance is not None:
-                line += f"\n    (clearance {_fmt(s.clearance, decimals)})"
-            if s.dieLength is not None:
-                line += f"\n    (die_length {_fmt(s.dieLength, decimals)})"
-            if s.property == 'testpoint':
-                line += "\n    (property pad_prop_testpoint)"
-            line += ")"
-            lines.append(line)
+            yield _pad(s, decimals, pad_fmt)
+        elif s.kind == 'pad_array':
+            for pad in s:
+                yield _pad(pad, decimals, pad_fmt)
 
     # Optional model block (STEP/VRML path provided by caller)
     if model:
         path = model.get('path')
         if path:
-            lines.append(f"  (model {path}")
             at = model.get('at', (0, 0, 0))
             scale = model.get('scale', (1, 1, 1))
             rot = model.get('rotate', (0, 0, 0))
-            lines.append(f"    (at (xyz {at[0]} {at[1]} {at[2]}))")
-            lines.append(f"    (scale (xyz {scale[0]} {scale[1]} {scale[2]}))")
-            lines.append(f"    (rotate (xyz {rot[0]} {rot[1]} {rot[2]}))")
-            lines.append("  )")
+            yield (
+                f"  (model {path}\n"
+                f"    (at (xyz {at[0]} {at[1]} {at[2]}))\n"
+                f"    (scale (xyz {scale[0]} {scale[1]} {scale[2]}))\n"
+                f"    (rotate (xyz {rot[0]} {rot[1]} {rot[2]}))\n"
+                "  )\n"
+            )
+
+    yield ")\n"
+
+
+# Records are gathered into chunks of about this many characters before they
+# are encoded and handed to the sink
+_CHUNK = 1 << 16
+
+
+def stream_kicad_mod(sink: BinaryIO, module_name: str, shapes: Iterable[PatternShape], pattern_type: str, decimals: int, model: Optional[dict] = None, descr: Optional[str] = None, tags: Optional[str] = None, nm: bool = False) -> int:
+    """Write the ``.kicad_mod`` file as UTF-8 to the binary file-like ``sink``.
+
+    Returns the number of bytes written.
+    """
+    written = 0
+    chunk: List[str] = []
+    size = 0
+    for record in iter_kicad_mod(module_name, shapes, pattern_type, decimals, model, descr, tags, nm):
+        chunk.append(record)
+        size += len(record)
+        if size >= _CHUNK:
+            written += sink.write(''.join(chunk).encode('utf-8'))
+            chunk.clear()
+            size = 0
+    if chunk:
+        written += sink.write(''.join(chunk).encode('utf-8'))
+    return written
 
-    lines.append(")")
-    return "\n".join(lines) + "\n"
 
+def write_kicad_mod(module_name: str, shapes: Iterable[PatternShape], pattern_type: str, decimals: int, model: Optional[dict] = None, descr: Optional[str] = None, tags: Optional[str] = None, nm: bool = False) -> str:
+    return ''.join(iter_kicad_mod(module_name, shapes, pattern_type, decimals, model, descr, tags, nm))
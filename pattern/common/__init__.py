@@ -1,19 +1,24 @@
-from . import calculator
-from . import copper
-from . import courtyard
-from . import silkscreen
-from . import mask
+from importlib import import_module
+
+# The submodules are imported when first used, not with the package: the
+# calculator and its writer dependencies are most of the start-up time, and
+# a run that builds nothing (``--help``, a name listing) does not need them.
+# ``from ..common import copper`` imports the submodule on its own;
+# ``common.copper`` goes through ``__getattr__``.
+_LAZY = ('assembly', 'calculator', 'copper', 'courtyard', 'mask', 'silkscreen')
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 # helper facades mirroring Coffee structure
 
 class grid_array:
     @staticmethod
-    def build(pattern, element):
-        from . import calculator as calc
-        from . import copper as cu
-        from . import courtyard as cy
-        from . import assembly as asm
-        from . import silkscreen as ss
+    def describe(pattern, element):
+        """Name ``pattern``; returns the calculator option."""
         housing = element['housing']
         settings = pattern.settings
         lead_count = housing.get('leadCount') or len(element['pins'])
@@ -54,6 +59,17 @@ class grid_array:
                 ld = ld_src.get('nom', ld_src.get('max', ld_src.get('min', 0))) if isinstance(ld_src, dict) else float(ld_src or 0)
                 ld_h = int(round(ld * 100))
                 pattern.name = f"{abbr}{lead_count}P{pitch}_{cols}X{rows}_{bl:03d}X{bw:03d}X{bh:03d}{ld_h:03d}{settings['densityLevel']}"
+        return option
+
+    @staticmethod
+    def build(pattern, element):
+        from . import calculator as calc
+        from . import copper as cu
+        from . import courtyard as cy
+        from . import assembly as asm
+        from . import silkscreen as ss
+        option = grid_array.describe(pattern, element)
+        housing = element['housing']
         housing.setdefault('verticalPitch', housing['pitch'])
         housing.setdefault('horizontalPitch', housing['pitch'])
         pad_params = calc.grid_array(pattern.__dict__, housing, option)
@@ -72,12 +88,8 @@ class grid_array:
 
 class dual:
     @staticmethod
-    def build(pattern, element):
-        from . import calculator as calc
-        from . import copper as cu
-        from . import courtyard as cy
-        from . import silkscreen as ss
-        from . import mask as mk
+    def describe(pattern, element):
+        """Name ``pattern``; returns the calculator option."""
         housing = element['housing']
         settings = pattern.settings
         lead_count = 0
@@ -119,6 +131,17 @@ class dual:
                 pattern.name = f"{name_base}{lead_count}P{pitch_h}_{ls}X{bw}X{bh}L{ll_h}X{lw_h}{settings['densityLevel']}"
             else:
                 pattern.name = f"{name_base}{lead_count}P{pitch_h}_{ls}X{bw}X{bh}{ll_h}X{lw_h}{settings['densityLevel']}"
+        return option
+
+    @staticmethod
+    def build(pattern, element):
+        from . import calculator as calc
+        from . import copper as cu
+        from . import courtyard as cy
+        from . import silkscreen as ss
+        from . import mask as mk
+        option = dual.describe(pattern, element)
+        housing = element['housing']
         pad_params = calc.dual(pattern.__dict__, housing, option)
         pad_params['order'] = 'round'
         pad_params['pad'] = {
@@ -148,13 +171,8 @@ class dual:
 
 class quad:
     @staticmethod
-    def build(pattern, element):
-        from . import calculator as calc
-        from . import copper as cu
-        from . import courtyard as cy
-        from . import silkscreen as ss
-        from . import mask as mk
-        from . import assembly as asm
+    def describe(pattern, element):
+        """Name, describe and tag ``pattern``; returns the calculator option."""
         housing = element['housing']
         settings = pattern.settings
         lead_count = housing.get('leadCount')
@@ -250,7 +268,18 @@ class quad:
                                  f"({pitch:.2f}mm pitch), Body {length:.2f}mm x {width:.2f}mm x {h:.2f}mm, "
                                  f"Lead {ll:.2f}mm x {lw:.2f}mm{thermal_desc}, {density_desc} Density")
             pattern.tags = tags
+        return option
 
+    @staticmethod
+    def build(pattern, element):
+        from . import calculator as calc
+        from . import copper as cu
+        from . import courtyard as cy
+        from . import silkscreen as ss
+        from . import mask as mk
+        from . import assembly as asm
+        option = quad.describe(pattern, element)
+        housing = element['housing']
         pad_params = calc.quad(pattern.__dict__, housing, option)
         row_pad = {
             'type': 'smd',
@@ -284,12 +313,8 @@ class quad:
 
 class two_pin:
     @staticmethod
-    def build(pattern, element):
-        from . import calculator as calc
-        from . import courtyard as cy
-        from . import silkscreen as ss
-        from . import assembly as asm
-        from . import mask as mk
+    def describe(pattern, element):
+        """Name ``pattern``; returns the calculator option."""
         housing = element['housing']
         settings = pattern.settings
         height = housing.get('height', {}).get('max', housing.get('bodyDiameter', {}).get('max'))
@@ -345,7 +370,17 @@ class two_pin:
 
         if not getattr(pattern, 'name', None):
             pattern.name = f"{abbr}{size}{settings['densityLevel']}"
+        return option
 
+    @staticmethod
+    def build(pattern, element):
+        from . import calculator as calc
+        from . import courtyard as cy
+        from . import silkscreen as ss
+        from . import assembly as asm
+        from . import mask as mk
+        option = two_pin.describe(pattern, element)
+        housing = element['housing']
         pad_params = calc.two_pin(pattern.__dict__, housing, option)
         # CAE: pins must be left (1) and right (2)
         if housing.get('cae'):
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from math import ceil, sqrt
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from . import trace
+from ...kicad_writer import NM_PER_MM
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 @dataclass
@@ -16,12 +25,24 @@ def _density_value(map_: Dict[str, float], density: str) -> float:
     return map_[density]
 
 
-def _round(x: float, step: float) -> float:
-    return round(x / step) * step if step else x
+def _round(x: float, step: float, nm: bool = False) -> float:
+    """``x`` rounded to a multiple of ``step``; with ``nm`` computed in whole
+    nanometres, so the result is the same float whatever the round-off in ``x``."""
+    if not step:
+        return x
+    if nm:
+        n, unit = round(x * NM_PER_MM), round(step * NM_PER_MM)
+        return round(n / unit) * unit / NM_PER_MM
+    return round(x / step) * step
 
 
-def _ceil_to(x: float, step: float) -> float:
-    return ceil(x / step) * step if step else x
+def _ceil_to(x: float, step: float, nm: bool = False) -> float:
+    if not step:
+        return x
+    if nm:
+        n, unit = round(x * NM_PER_MM), round(step * NM_PER_MM)
+        return -(-n // unit) * unit / NM_PER_MM
+    return ceil(x / step) * step
 
 
 def _ipc7351(params: dict) -> dict:
@@ -51,34 +72,37 @@ def _ipc7351(params: dict) -> dict:
     Cs = StolRms
     Cw = Wtol
 
-    print(f"Lmin: {Lmin}, Lmax: {Lmax}, Ltol: {Ltol}, Tmin: {Tmin}, Tmax: {Tmax}, Ttol: {Ttol}, Wmin: {Wmin}, Wmax: {Wmax}, Wtol: {Wtol}, F: {F}, P: {P}, Jt: {Jt}, Jh: {Jh}, Js: {Js}, Smin: {Smin}, Smax: {Smax}, Stol: {Stol}, StolRms: {StolRms}, SmaxRms: {SmaxRms}, Cl: {Cl}, Cs: {Cs}, Cw: {Cw}")
-
-    return {
+    ipc = {
         'Zmax': Lmin + 2 * Jt + sqrt(Cl * Cl + F * F + P * P),
         'Gmin': SmaxRms - 2 * Jh - sqrt(Cs * Cs + F * F + P * P),
         'Xmax': Wmin + 2 * Js + sqrt(Cw * Cw + F * F + P * P),
     }
+    if trace.active():
+        trace.emit('ipc7351', Lmin=Lmin, Lmax=Lmax, Ltol=Ltol, Tmin=Tmin, Tmax=Tmax, Ttol=Ttol,
+                   Wmin=Wmin, Wmax=Wmax, Wtol=Wtol, F=F, P=P, Jt=Jt, Jh=Jh, Js=Js,
+                   Smin=Smin, Smax=Smax, Stol=Stol, StolRms=StolRms, SmaxRms=SmaxRms,
+                   Cl=Cl, Cs=Cs, Cw=Cw, **ipc)
+    return ipc
 
 
 def _pad(ipc: dict, pattern: dict) -> dict:
     pad_width = (ipc['Zmax'] - ipc['Gmin']) / 2
     pad_height = ipc['Xmax']
     pad_distance = (ipc['Zmax'] + ipc['Gmin']) / 2
-    
-    print(f"DEBUG _pad: Zmax={ipc['Zmax']:.3f}, Gmin={ipc['Gmin']:.3f}, Xmax={ipc['Xmax']:.3f}")
-    print(f"DEBUG _pad: pad_width={pad_width:.3f}, pad_height={pad_height:.3f}, pad_distance={pad_distance:.3f}")
 
     size_roundoff = pattern.get('sizeRoundoff', 0.05)
     place_roundoff = pattern.get('placeRoundoff', 0.1)
-    pad_width_rounded = _round(pad_width, size_roundoff)
-    pad_height_rounded = _round(pad_height, size_roundoff)
-    pad_distance_rounded = _round(pad_distance, place_roundoff)
-    
-    print(f"DEBUG _pad: After rounding (size:{size_roundoff}, place:{place_roundoff})")
-    print(f"DEBUG _pad: pad_width {pad_width:.3f} -> {pad_width_rounded:.3f}")
-    print(f"DEBUG _pad: pad_height {pad_height:.3f} -> {pad_height_rounded:.3f}")
-    print(f"DEBUG _pad: pad_distance {pad_distance:.3f} -> {pad_distance_rounded:.3f}")
-    
+    nm = pattern.get('nm', False)
+    pad_width_rounded = _round(pad_width, size_roundoff, nm)
+    pad_height_rounded = _round(pad_height, size_roundoff, nm)
+    pad_distance_rounded = _round(pad_distance, place_roundoff, nm)
+    if trace.active():
+        trace.emit('pad', Zmax=ipc['Zmax'], Gmin=ipc['Gmin'], Xmax=ipc['Xmax'],
+                   sizeRoundoff=size_roundoff, placeRoundoff=place_roundoff,
+                   width=pad_width, height=pad_height, distance=pad_distance,
+                   widthRounded=pad_width_rounded, heightRounded=pad_height_rounded,
+                   distanceRounded=pad_distance_rounded)
+
     pad_width = pad_width_rounded
     pad_height = pad_height_rounded
     pad_distance = pad_distance_rounded
@@ -98,7 +122,7 @@ def _pad(ipc: dict, pattern: dict) -> dict:
     if trimmed:
         pad_width = (span - gap) / 2
         pad_distance = (span + gap) / 2
-        pad_distance = _ceil_to(pad_distance, place_roundoff)
+        pad_distance = _ceil_to(pad_distance, place_roundoff, nm)
 
     if 'pitch' in ipc and pad_height > (ipc['pitch'] - ipc['clearance']):
         pad_height = ipc['pitch'] - ipc['clearance']
@@ -112,6 +136,145 @@ def _pad(ipc: dict, pattern: dict) -> dict:
     }
 
 
+_BATCH_INPUTS = ('Lmin', 'Lmax', 'Tmin', 'Tmax', 'Wmin', 'Wmax', 'F', 'P', 'Jt', 'Jh', 'Js')
+_BATCH_OPTIONAL = ('clearance', 'body', 'pitch')
+_BATCH_OUTPUTS = ('Zmax', 'Gmin', 'Xmax', 'width', 'height', 'distance', 'trimmed')
+
+
+def ipc7351_batch(params: Dict[str, Any], nm: bool = False) -> Dict[str, Any]:
+    """``_ipc7351`` then ``_pad`` for many parts at once, one row per part.
+
+    ``params`` maps Lmin, Lmax, Tmin, Tmax, Wmin, Wmax, F, P, Jt, Jh and Js,
+    and optionally clearance, body, pitch, sizeRoundoff and placeRoundoff, to
+    equal-length sequences or to scalars shared by every row. A NaN (or None)
+    clearance, body or pitch skips that trim for the row like a missing key
+    does in ``_pad``, and the pitch trim needs a clearance; the round-offs
+    default to 0.05 and 0.1 as there.
+
+    Returns the columns Zmax, Gmin, Xmax, width, height, distance and trimmed,
+    bit-identical to the scalar code: NumPy arrays when NumPy is installed,
+    otherwise ``array('d')`` columns with ``trimmed`` as ``array('b')``.
+
+    Only the NumPy path is faster than calling ``_ipc7351`` and ``_pad`` part
+    by part. Without NumPy the rows go through those same two functions and
+    turning the columns into rows comes on top, so a caller that already holds
+    one dict per part should call them directly.
+    """
+    missing = [name for name in _BATCH_INPUTS if name not in params]
+    if missing:
+        raise KeyError(f"missing batch inputs: {', '.join(missing)}")
+    names = _BATCH_INPUTS + tuple(name for name in _BATCH_OPTIONAL + ('sizeRoundoff', 'placeRoundoff') if name in params)
+    if np is not None:
+        return _ipc7351_numpy({name: params[name] for name in names}, nm)
+
+    columns = {name: params[name] for name in names}
+    rows = {len(v) for v in columns.values() if not _is_scalar(v)}
+    if len(rows) > 1:
+        raise ValueError(f'batch columns differ in length: {sorted(rows)}')
+    count = rows.pop() if rows else 1
+    # scalars are set once in a shared row; only the per-part columns change
+    row = {name: value for name, value in columns.items() if _is_scalar(value)}
+    varying = [name for name in names if name not in row]
+    out = {name: array('b' if name == 'trimmed' else 'd') for name in _BATCH_OUTPUTS}
+    optional = [name for name in _BATCH_OPTIONAL if name in columns]
+    pattern = {'nm': nm, 'sizeRoundoff': row.get('sizeRoundoff', 0.05), 'placeRoundoff': row.get('placeRoundoff', 0.1)}
+    roundoffs = [name for name in ('sizeRoundoff', 'placeRoundoff') if name in varying]
+    for values in zip(*(columns[name] for name in varying)) if varying else [()] * count:
+        row.update(zip(varying, values))
+        ipc = _ipc7351(row)
+        for name in optional:
+            value = row[name]
+            if value is not None and value == value and (name != 'pitch' or 'clearance' in ipc):
+                ipc[name] = value
+        for name in roundoffs:
+            pattern[name] = row[name]
+        pad = _pad(ipc, pattern)
+        for name in ('Zmax', 'Gmin', 'Xmax'):
+            out[name].append(ipc[name])
+        for name in ('width', 'height', 'distance', 'trimmed'):
+            out[name].append(pad[name])
+    return out
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (int, float))
+
+
+# round() and ceil() return ints, so where NumPy yields -0.0 the scalar code
+# has a plain 0; adding 0.0 turns the one into the other.
+
+def _round_batch(x, step, nm: bool):
+    """``_round`` over arrays; ``step`` may be an array too."""
+    if nm:
+        n, unit = np.round(x * NM_PER_MM) + 0.0, np.round(step * NM_PER_MM)
+        rounded = (np.round(n / unit) + 0.0) * unit / NM_PER_MM
+    else:
+        rounded = (np.round(x / step) + 0.0) * step
+    return np.where(step == 0, x, rounded)
+
+
+def _ceil_to_batch(x, step, nm: bool):
+    """``_ceil_to`` over arrays; ``step`` may be an array too."""
+    if nm:
+        n = np.round(x * NM_PER_MM).astype(np.int64)
+        unit = np.round(step * NM_PER_MM).astype(np.int64)
+        rounded = -(-n // unit) * unit / NM_PER_MM
+    else:
+        rounded = (np.ceil(x / step) + 0.0) * step
+    return np.where(step == 0, x, rounded)
+
+
+def _ipc7351_numpy(params: Dict[str, Any], nm: bool) -> Dict[str, Any]:
+    # The expressions below repeat _ipc7351 and _pad term by term, in the same
+    # order, so every row rounds exactly as the scalar code does.
+    names = list(params)
+    columns = np.broadcast_arrays(*(np.asarray(np.nan if params[name] is None else params[name], dtype=float)
+                                    for name in names))
+    c = dict(zip(names, (np.atleast_1d(column) for column in columns)))
+    Lmin, Lmax, Tmin, Tmax, Wmin, Wmax = c['Lmin'], c['Lmax'], c['Tmin'], c['Tmax'], c['Wmin'], c['Wmax']
+    F, P, Jt, Jh, Js = c['F'], c['P'], c['Jt'], c['Jh'], c['Js']
+    nan = np.full_like(Lmin, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Ltol = Lmax - Lmin
+        Ttol = Tmax - Tmin
+        Wtol = Wmax - Wmin
+        Smax = Lmax - 2 * Tmin
+        Stol = Ltol + 2 * Ttol
+        StolRms = np.sqrt(Ltol * Ltol + 2 * Ttol * Ttol)
+        SmaxRms = Smax - (Stol - StolRms) / 2
+        Zmax = Lmin + 2 * Jt + np.sqrt(Ltol * Ltol + F * F + P * P)
+        Gmin = SmaxRms - 2 * Jh - np.sqrt(StolRms * StolRms + F * F + P * P)
+        Xmax = Wmin + 2 * Js + np.sqrt(Wtol * Wtol + F * F + P * P)
+
+        size_roundoff = c.get('sizeRoundoff', np.full_like(Lmin, 0.05))
+        place_roundoff = c.get('placeRoundoff', np.full_like(Lmin, 0.1))
+        width = _round_batch((Zmax - Gmin) / 2, size_roundoff, nm)
+        height = _round_batch(Xmax, size_roundoff, nm)
+        distance = _round_batch((Zmax + Gmin) / 2, place_roundoff, nm)
+
+        # NaN compares false, which leaves the row alone like a missing key
+        clearance = c.get('clearance', nan)
+        body = c.get('body', nan) - 0.1
+        gap = distance - width
+        span = distance + width
+        by_clearance = gap < clearance
+        gap = np.where(by_clearance, clearance, gap)
+        by_body = gap < body
+        gap = np.where(by_body, body, gap)
+        trimmed = by_clearance | by_body
+        width = np.where(trimmed, (span - gap) / 2, width)
+        distance = np.where(trimmed, _ceil_to_batch((span + gap) / 2, place_roundoff, nm), distance)
+
+        limit = c.get('pitch', nan) - clearance
+        by_pitch = height > limit
+        height = np.where(by_pitch, limit, height)
+        trimmed = trimmed | by_pitch
+
+    return {'Zmax': Zmax, 'Gmin': Gmin, 'Xmax': Xmax,
+            'width': width, 'height': height, 'distance': distance, 'trimmed': trimmed}
+
+
 def _params(pattern: dict, housing: dict) -> dict:
     settings = pattern['settings']
     return {
@@ -418,7 +581,7 @@ def grid_array(pattern: dict, housing: dict, option: str) -> dict:
                 pad_diameter = pitch - clearance
         # Round to 0.05 mm per table note
         pattern['sizeRoundoff'] = 0.05
-        pad_diameter = _round(pad_diameter, pattern['sizeRoundoff'])
+        pad_diameter = _round(pad_diameter, pattern['sizeRoundoff'], pattern.get('nm', False))
         courtyard = {'M': 2.00, 'N': 1.00, 'L': 0.50}[dl]
     elif option == 'cga':
         # IPC-7351 Table 3-21: Periphery 0.00, round-off 0.05, courtyard 1.00
@@ -428,7 +591,7 @@ def grid_array(pattern: dict, housing: dict, option: str) -> dict:
         if pad_diameter > pitch - clearance:
             pad_diameter = pitch - clearance
         pattern['sizeRoundoff'] = 0.05
-        pad_diameter = _round(pad_diameter, pattern['sizeRoundoff'])
+        pad_diameter = _round(pad_diameter, pattern['sizeRoundoff'], pattern.get('nm', False))
         courtyard = 1.00
     elif option == 'lga':
         # IPC-7351 Table 3-21: Periphery 0.00, round-off 0.05, courtyard 1.00
@@ -447,8 +610,8 @@ def grid_array(pattern: dict, housing: dict, option: str) -> dict:
         if pad_height > vertical_pitch - clearance:
             pad_height = vertical_pitch - clearance
         pattern['sizeRoundoff'] = 0.05
-        pad_width = _round(pad_width, pattern['sizeRoundoff'])
-        pad_height = _round(pad_height, pattern['sizeRoundoff'])
+        pad_width = _round(pad_width, pattern['sizeRoundoff'], pattern.get('nm', False))
+        pad_height = _round(pad_height, pattern['sizeRoundoff'], pattern.get('nm', False))
         courtyard = 1.00
     else:
         raise ValueError('Unsupported grid array option')
@@ -513,15 +676,13 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
     body_width = _extract_values(housing.get('bodyWidth', 0))
     
     # Handle pad separation parameters with proper tolerance propagation
-    print(f"DEBUG corner_concave: input housing keys: {housing.keys()}")
-    print(f"DEBUG corner_concave: body_length = {body_length}")
-    print(f"DEBUG corner_concave: body_width = {body_width}")
-    
+    if trace.active():
+        trace.emit('corner_concave.body', housingKeys=list(housing), bodyLength=body_length, bodyWidth=body_width)
+
     # Fixed mapping: padSeparationLength -> rowSpan, padSeparationWidth -> columnSpan
     if 'padSeparationLength' in housing:
         pad_sep_length = _extract_values(housing['padSeparationLength'])
-        print(f"DEBUG corner_concave: padSeparationLength = {pad_sep_length}")
-        
+
         # Lead length = (body_length - pad_separation) / 2
         # Proper tolerance propagation for lead dimension
         lead_length_min = max(0.05, (body_length['min'] - pad_sep_length['max']) / 2)
@@ -533,10 +694,11 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
         row_span_min = (body_length['min'] + pad_sep_length['min']) / 2
         row_span_nom = (body_length['nom'] + pad_sep_length['nom']) / 2
         row_span_max = (body_length['max'] + pad_sep_length['max']) / 2
-        
-        print(f"DEBUG corner_concave: calculated rowSpan = min:{row_span_min}, nom:{row_span_nom}, max:{row_span_max}")
-        print(f"DEBUG corner_concave: calculated leadLength = min:{lead_length_min}, nom:{lead_length_nom}, max:{lead_length_max}")
-        
+        if trace.active():
+            trace.emit('corner_concave.length', padSeparationLength=pad_sep_length,
+                       rowSpan={'min': row_span_min, 'nom': row_span_nom, 'max': row_span_max},
+                       leadLength={'min': lead_length_min, 'nom': lead_length_nom, 'max': lead_length_max})
+
         housing.setdefault('rowSpan', {
             'min': row_span_min,
             'nom': row_span_nom,
@@ -550,8 +712,7 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
     
     if 'padSeparationWidth' in housing:
         pad_sep_width = _extract_values(housing['padSeparationWidth'])
-        print(f"DEBUG corner_concave: padSeparationWidth = {pad_sep_width}")
-        
+
         # Lead width = (body_width - pad_separation) / 2  
         # Proper tolerance propagation for lead dimension
         lead_width_min = max(0.05, (body_width['min'] - pad_sep_width['max']) / 2)
@@ -563,10 +724,11 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
         col_span_min = (body_width['min'] + pad_sep_width['min']) / 2
         col_span_nom = (body_width['nom'] + pad_sep_width['nom']) / 2
         col_span_max = (body_width['max'] + pad_sep_width['max']) / 2
-        
-        print(f"DEBUG corner_concave: calculated columnSpan = min:{col_span_min}, nom:{col_span_nom}, max:{col_span_max}")
-        print(f"DEBUG corner_concave: calculated leadWidth = min:{lead_width_min}, nom:{lead_width_nom}, max:{lead_width_max}")
-        
+        if trace.active():
+            trace.emit('corner_concave.width', padSeparationWidth=pad_sep_width,
+                       columnSpan={'min': col_span_min, 'nom': col_span_nom, 'max': col_span_max},
+                       leadWidth={'min': lead_width_min, 'nom': lead_width_nom, 'max': lead_width_max})
+
         housing.setdefault('columnSpan', {
             'min': col_span_min,
             'nom': col_span_nom,
@@ -599,10 +761,10 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
     in_periph = {'M': 0.00, 'N': 0.00, 'L': 0.00}[settings['densityLevel']]
     
     params = _params(pattern, housing)
-    print(f"DEBUG corner_concave: _params returned = {params}")
-    print(f"DEBUG corner_concave: housing rowSpan = {housing.get('rowSpan')}")
-    print(f"DEBUG corner_concave: housing columnSpan = {housing.get('columnSpan')}")
-    
+    if trace.active():
+        trace.emit('corner_concave.params', params=dict(params),
+                   rowSpan=housing.get('rowSpan'), columnSpan=housing.get('columnSpan'))
+
     # Round-off factor: round off to the nearest two place decimal
     pattern['sizeRoundoff'] = 0.01
     pad = {
@@ -612,7 +774,8 @@ def corner_concave(pattern: dict, housing: dict) -> dict:
         'distance1': housing['columnSpan']['nom'] + out_periph / 2 - in_periph / 2,
         'courtyard': {'M': 0.40, 'N': 0.20, 'L': 0.10}[settings['densityLevel']],
     }
-    print(f"DEBUG corner_concave: calculated pad = {pad}")
+    if trace.active():
+        trace.emit('corner_concave.pad', pad=dict(pad))
     pad = _choose_preferred(pad, pattern, housing)
     lead_to_pad1 = (pad['distance1'] + pad['width'] - housing['rowSpan']['nom']) / 2
     lead_to_pad2 = (pad['distance2'] + pad['height'] - housing['columnSpan']['nom']) / 2
@@ -637,18 +800,13 @@ def son(pattern: dict, housing: dict) -> dict:
     if 'pullBack' in housing:
         params['Lmin'] -= 2 * housing['pullBack']['nom']
         params['Lmax'] -= 2 * housing['pullBack']['nom']
-    
-    print(f"DEBUG SON: Body Lmin={params['Lmin']:.3f}, Lmax={params['Lmax']:.3f}")
-    print(f"DEBUG SON: Lead Tmin={params['Tmin']:.3f}, Tmax={params['Tmax']:.3f}")
-    print(f"DEBUG SON: IPC params Jt={params['Jt']:.3f}, Jh={params['Jh']:.3f}, Js={params['Js']:.3f}")
-    
+
     ipc = _ipc7351(params)
-    print(f"DEBUG SON: IPC results Zmax={ipc['Zmax']:.3f}, Gmin={ipc['Gmin']:.3f}, Xmax={ipc['Xmax']:.3f}")
-    
-    # Calculate pad protrusion for verification
-    pad_protrusion = (ipc['Zmax'] - params['Lmax']) / 2
-    print(f"DEBUG SON: Pad protrusion from body edge = {pad_protrusion:.3f}mm (should be ~{params['Jt']:.3f}mm + tolerances)")
-    
+    if trace.active():
+        # pad protrusion from the body edge, expected around Jt plus tolerances
+        trace.emit('son', Lmin=params['Lmin'], Lmax=params['Lmax'], Jt=params['Jt'],
+                   protrusion=(ipc['Zmax'] - params['Lmax']) / 2)
+
     ipc['clearance'] = settings['clearance']['padToPad']
     ipc['pitch'] = housing['pitch']
     pad = _pad(ipc, pattern)
@@ -983,28 +1141,19 @@ def two_pin(pattern: dict, housing: dict, option: str = 'chip') -> dict:
     params['Lmin'] = housing['leadSpan']['min']
     params['Lmax'] = housing['leadSpan']['max']
     
-    # Debug output for CAE components
-    if option == 'crystal':
-        print(f"=== CAE DEBUG ===")
-        print(f"leadSpan: {housing.get('leadSpan')}")
-        print(f"leadLength: {housing.get('leadLength')}")
-        print(f"leadWidth: {housing.get('leadWidth')}")
-        print(f"height: {housing.get('height')}")
-        print(f"densityLevel: {settings['densityLevel']}")
-        print(f"toe/heel/side: {toe}/{heel}/{side}")
-        print(f"params: {params}")
-    
+    if trace.active():
+        trace.emit('two_pin', option=option, leadSpan=housing.get('leadSpan'),
+                   leadLength=housing.get('leadLength'), leadWidth=housing.get('leadWidth'),
+                   height=housing.get('height'), densityLevel=settings['densityLevel'],
+                   toe=toe, heel=heel, side=side, params=dict(params))
+
     ipc = _ipc7351(params)
-    
-    if option == 'crystal':
-        print(f"ipc: {ipc}")
     ipc['clearance'] = settings['clearance']['padToPad']
     pad = _pad(ipc, pattern)
     pad['courtyard'] = courtyard if 'courtyard' in locals() and courtyard is not None else params['courtyard']
     pad = _choose_preferred(pad, pattern, housing)
-    
-    if option == 'crystal':
-        print(f"final pad: {pad}")
+    if trace.active():
+        trace.emit('two_pin.pad', option=option, pad=dict(pad))
     lead_to_pad = (pad['distance'] + pad['width'] - housing['leadSpan']['nom']) / 2
     if lead_to_pad < settings['minimum']['spaceForIron']:
         d = settings['minimum']['spaceForIron'] - lead_to_pad
@@ -1024,7 +1173,7 @@ def pad_diameter(pattern: dict, housing: dict, hole_diameter: float) -> float:
         if pad_d > pitch - clearance:
             pad_d = pitch - clearance
     size_roundoff = pattern.get('sizeRoundoff', 0.05)
-    return round(pad_d / size_roundoff) * size_roundoff
+    return _round(pad_d, size_roundoff, pattern.get('nm', False))
 
 
 def through_hole(pattern: dict, housing: dict) -> dict:
@@ -1042,7 +1191,7 @@ def through_hole(pattern: dict, housing: dict) -> dict:
     if hole < settings['minimum']['holeDiameter']:
         hole = settings['minimum']['holeDiameter']
     size_roundoff = pattern.get('sizeRoundoff', 0.05)
-    hole = _ceil_to(hole, size_roundoff)
+    hole = _ceil_to(hole, size_roundoff, pattern.get('nm', False))
     pad_d = pad_diameter(pattern, housing, hole)
     return {'hole': hole, 'width': pad_d, 'height': pad_d}
 
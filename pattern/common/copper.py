@@ -1,3 +1,8 @@
+from ...kicad_writer import GridNames, SequenceNames
+from .placement import grid, numbered, populated, steps
+from .spatial import Box, PadGrid
+
+
 def preamble(pattern, element):
     housing = element['housing']
     body_position = housing.get('bodyPosition', '0, 0')
@@ -10,34 +15,87 @@ def postscriptum(pattern):
     mask(pattern)
 
 
+def _settle_mask(pad, mask_val):
+    if getattr(pad, 'mask', None) is None or mask_val < pad.mask:
+        pad.mask = mask_val
+
+
 def mask(pattern):
+    """Shrink solder_mask_margin of pads that sit closer than the mask web.
+
+    Every pad gets at most ``padToMask``; a pair whose edge-to-edge space is
+    below ``maskWidth + 2 * padToMask`` shrinks both margins so that a web of
+    ``maskWidth`` remains. Only such close pairs are evaluated, found through a
+    spatial grid, and the number of evaluated pairs is returned.
+
+    Margins only ever shrink, so pads settled by an earlier call keep their
+    value and only pairs involving pending pads (see
+    ``QedaPattern.mask_pending``) are evaluated again.
+    """
     settings = pattern.settings
     mask_width = settings['minimum'].get('maskWidth')
     if mask_width is None:
-        return
-    pads = list(pattern.pads.values())
-    last = len(pads) - 1
-    if last <= 0:
-        if pads:
-            pads[0].mask = settings['minimum']['maskWidth']
-        return
-    for i in range(0, last + 1):
-        for j in range(i + 1, last + 1):
-            p1 = pads[i]
-            p2 = pads[j]
-            mask_val = settings['clearance']['padToMask']
-            if p1.type != 'mounting-hole' and p2.type != 'mounting-hole':
-                hspace = abs(p2.x - p1.x) - (p1.width + p2.width) / 2
-                vspace = abs(p2.y - p1.y) - (p1.height + p2.height) / 2
-                space = max(hspace, vspace)
-                if (space - 2 * mask_val) < settings['minimum']['maskWidth']:
-                    mask_val = (space - settings['minimum']['maskWidth']) / 2
-                    if mask_val < 0:
-                        mask_val = 0
-            if getattr(p1, 'mask', None) is None or mask_val < p1.mask:
-                p1.mask = mask_val
-            if getattr(p2, 'mask', None) is None or mask_val < p2.mask:
-                p2.mask = mask_val
+        return 0
+    if len(pattern.pads) <= 1:
+        for p in pattern.pads.values():
+            p.mask = settings['minimum']['maskWidth']
+        # a lone pad is re-examined once it gets neighbours
+        return 0
+    pending = pattern.mask_pending()
+    if not pending:
+        return 0
+    pad_to_mask = settings['clearance']['padToMask']
+    copper_pads = []
+    fresh = set()
+    for group in pattern.pads.groups():
+        if group.__class__ is tuple:
+            is_pending = group[0] in pending
+            members = group[1:]
+        else:
+            is_pending = group in pending
+            members = pattern.pads.members(group)
+        for p in members:
+            if p.type == 'mounting-hole':
+                if is_pending:
+                    _settle_mask(p, pad_to_mask)
+                continue
+            if is_pending:
+                fresh.add(len(copper_pads))
+            copper_pads.append(p)
+    # Work on a copy of the geometry and margins; pads kept in a PadArray are
+    # views that are slower to read, and only changed margins are written back
+    boxes = [Box(p.x, p.y, p.width, p.height) for p in copper_pads]
+    margins = [p.mask for p in copper_pads]
+    for i in fresh:
+        # Any pair further apart than this keeps the default margin
+        if margins[i] is None or pad_to_mask < margins[i]:
+            margins[i] = pad_to_mask
+    grid = PadGrid(boxes, mask_width + 2 * pad_to_mask)
+    checks = 0
+    for i in sorted(fresh):
+        p1 = boxes[i]
+        for j in grid.neighbours(p1):
+            if j == i or (j in fresh and j < i):
+                continue
+            p2 = boxes[j]
+            checks += 1
+            mask_val = pad_to_mask
+            hspace = abs(p2.x - p1.x) - (p1.width + p2.width) / 2
+            vspace = abs(p2.y - p1.y) - (p1.height + p2.height) / 2
+            space = max(hspace, vspace)
+            if (space - 2 * mask_val) < mask_width:
+                mask_val = (space - mask_width) / 2
+                if mask_val < 0:
+                    mask_val = 0
+            if margins[i] is None or mask_val < margins[i]:
+                margins[i] = mask_val
+            if margins[j] is None or mask_val < margins[j]:
+                margins[j] = mask_val
+    for p, margin in zip(copper_pads, margins):
+        if p.mask is not margin:
+            p.mask = margin
+    pattern.settle_mask()
+    return checks
 
 
 def dual(pattern, element, pad_params):
@@ -61,29 +119,17 @@ def dual(pattern, element, pad_params):
 
     preamble(pattern, element)
 
+    half = count // 2
+    height = pad_params['height']
+    height1 = pad_params.get('height1', height)
     pad_x_left = (distance / 2) if mirror else (-distance / 2)
-    y = -pitch * (count / 4 - 0.5)
-    for i in range(0, count // 2):
-        pad_copy = dict(pad)
-        pad_copy['x'] = pad_x_left
-        pad_copy['y'] = y
-        pad_copy['height'] = pad_params.get('height1', pad_params['height']) if numbers[i] == 1 else pad_params['height']
-        n = numbers[i]
-        if str(n) in pins:
-            pattern.pad(n, pad_copy)
-        y += pitch
-
     pad_x_right = (-distance / 2) if mirror else (distance / 2)
-    y = -pitch * (count / 4 - 0.5)
-    for i in range(count // 2, count):
-        pad_copy = dict(pad)
-        pad_copy['x'] = pad_x_right
-        pad_copy['y'] = y
-        pad_copy['height'] = pad_params.get('height1', pad_params['height']) if numbers[i] == 1 else pad_params['height']
-        n = numbers[i]
-        if str(n) in pins:
-            pattern.pad(n, pad_copy)
-        y += pitch
+    numbers = numbers[:count]
+    for x, side in ((pad_x_left, numbers[:half]), (pad_x_right, numbers[half:])):
+        ys = steps(-pitch * (count / 4 - 0.5), pitch, len(side))
+        heights = [height1 if n == 1 else height for n in side]
+        names, xs, ys, heights = populated(numbered(side), pins, [x] * len(side), ys, heights)
+        pattern.add_pads(pad, names, xs, ys, heights)
 
     postscriptum(pattern)
 
@@ -98,18 +144,10 @@ def grid_array(pattern, element, pad):
     pins = element['pins']
 
     preamble(pattern, element)
-    y = -v_pitch * (row_count / 2 - 0.5)
-    for row in range(1, row_count + 1):
-        x = -h_pitch * (col_count / 2 - 0.5)
-        for col in range(1, col_count + 1):
-            pad_copy = dict(pad)
-            pad_copy['x'] = x
-            pad_copy['y'] = y
-            name = f"{grid_letters[row]}{col}"
-            if name in pins:
-                pattern.pad(name, pad_copy)
-            x += h_pitch
-        y += v_pitch
+    xs, ys = grid(steps(-h_pitch * (col_count / 2 - 0.5), h_pitch, col_count),
+                  steps(-v_pitch * (row_count / 2 - 0.5), v_pitch, row_count))
+    names = GridNames(grid_letters, row_count, col_count)
+    pattern.add_pads(pad, *populated(names, pins, xs, ys))
     postscriptum(pattern)
 
 
@@ -118,54 +156,33 @@ def quad(pattern, element, pad_params):
     pitch = housing['pitch']
     row_count = housing['rowCount']
     column_count = housing['columnCount']
-    row_pad = dict(pad_params['rowPad'])
-    column_pad = dict(pad_params['columnPad'])
+    row_pad = pad_params['rowPad']
+    column_pad = pad_params['columnPad']
     distance1 = pad_params['distance1']
     distance2 = pad_params['distance2']
     pins = element['pins']
 
     preamble(pattern, element)
 
-    # left side
-    row_pad['x'] = -distance1 / 2
-    y = -pitch * (row_count / 2 - 0.5)
+    # Pins run counter-clockwise from the top of the left side; each side
+    # continues from where the previous one stopped
+    left = steps(-pitch * (row_count / 2 - 0.5), pitch, row_count)
+    y = left[-1] + pitch if left else -pitch * (row_count / 2 - 0.5)
+    bottom = steps(-pitch * (column_count / 2 - 0.5), pitch, column_count)
+    x = bottom[-1] + pitch if bottom else -pitch * (column_count / 2 - 0.5)
+    right = steps(y - pitch, -pitch, row_count)
+    top = steps(x - pitch, -pitch, column_count)
+
     num = 1
-    for _ in range(1, row_count + 1):
-        row_pad['y'] = y
-        if str(num) in pins:
-            pattern.pad(num, row_pad)
-        num += 1
-        y += pitch
-
-    # bottom side
-    x = -pitch * (column_count / 2 - 0.5)
-    column_pad['y'] = distance2 / 2
-    for _ in range(1, column_count + 1):
-        column_pad['x'] = x
-        if str(num) in pins:
-            pattern.pad(num, column_pad)
-        num += 1
-        x += pitch
-
-    # right side
-    row_pad['x'] = distance1 / 2
-    y -= pitch
-    for _ in range(1, row_count + 1):
-        row_pad['y'] = y
-        if str(num) in pins:
-            pattern.pad(num, row_pad)
-        num += 1
-        y -= pitch
-
-    # top side
-    x -= pitch
-    column_pad['y'] = -distance2 / 2
-    for _ in range(1, column_count + 1):
-        column_pad['x'] = x
-        if str(num) in pins:
-            pattern.pad(num, column_pad)
-        num += 1
-        x -= pitch
+    for pad, xs, ys in (
+        (row_pad, [-distance1 / 2] * row_count, left),
+        (column_pad, bottom, [distance2 / 2] * column_count),
+        (row_pad, [distance1 / 2] * row_count, right),
+        (column_pad, top, [-distance2 / 2] * column_count),
+    ):
+        names = SequenceNames(num, 1, len(xs))
+        num += len(xs)
+        pattern.add_pads(pad, *populated(names, pins, xs, ys))
 
     postscriptum(pattern)
 
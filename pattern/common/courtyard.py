@@ -1,3 +1,6 @@
+from bisect import bisect_left, bisect_right
+
+
 def preamble(pattern, housing):
     line_width = pattern.settings['lineWidth']['courtyard']
     pattern.layer('topCourtyard').lineWidth(line_width)
@@ -27,120 +30,121 @@ def boundary(pattern, housing, courtyard=None):
     settings = pattern.settings
     if courtyard is None:
         courtyard = housing.get('courtyard', {'M': 0.5, 'N': 0.25, 'L': 0.12}[settings['densityLevel']])
-    pads = list(pattern.pads.values())
     xmin = -housing['bodyWidth']['nom'] / 2
     ymin = -housing['bodyLength']['nom'] / 2
     xmax = housing['bodyWidth']['nom'] / 2
     ymax = housing['bodyLength']['nom'] / 2
-    for v in pads:
-        xmin = min(xmin, v.x - v.width / 2)
-        xmax = max(xmax, v.x + v.width / 2)
-        ymin = min(ymin, v.y - v.height / 2)
-        ymax = max(ymax, v.y + v.height / 2)
+    for x1, y1, x2, y2 in pattern.pads.extents():
+        xmin = min(xmin, x1)
+        xmax = max(xmax, x2)
+        ymin = min(ymin, y1)
+        ymax = max(ymax, y2)
     preamble(pattern, housing).rectangle(xmin - courtyard, ymin - courtyard, xmax + courtyard, ymax + courtyard)
 
 
+def _union_edges(rectangles):
+    """Boundary of the union of axis-aligned rectangles ``(x1, y1, x2, y2)``.
+
+    The plane is cut into cells by every rectangle edge and a sweep over x
+    keeps a per-cell coverage count, so each rectangle is touched once when it
+    opens and once when it closes. Returns the horizontal edges ``(x1, x2, y)``
+    and vertical edges ``(x, y1, y2)`` between covered and uncovered area,
+    each collinear run merged into a single maximal segment.
+    """
+    x_coords = sorted({x for r in rectangles for x in (r[0], r[2])})
+    y_coords = sorted({y for r in rectangles for y in (r[1], r[3])})
+    # A rectangle covers the cells whose centre it contains (edges included)
+    x_centers = [(a + b) / 2 for a, b in zip(x_coords, x_coords[1:])]
+    y_centers = [(a + b) / 2 for a, b in zip(y_coords, y_coords[1:])]
+
+    # (slab index, +1/-1, first cell, last cell + 1)
+    events = []
+    for x1, y1, x2, y2 in rectangles:
+        i1, i2 = bisect_left(x_centers, x1), bisect_right(x_centers, x2)
+        j1, j2 = bisect_left(y_centers, y1), bisect_right(y_centers, y2)
+        if i1 < i2 and j1 < j2:
+            events.append((i1, 1, j1, j2))
+            events.append((i2, -1, j1, j2))
+    events.sort()
+
+    count = [0] * len(y_coords)
+    # start x of the horizontal edge currently running along y_coords[k], for
+    # every k where cell k is covered and cell k - 1 is not, or the other way
+    # round
+    runs = {}
+    horizontal = []
+    vertical = []
+    e = 0
+    for i, x in enumerate(x_coords):
+        changed = set()
+        while e < len(events) and events[e][0] == i:
+            _, delta, j1, j2 = events[e]
+            for j in range(j1, j2):
+                before = count[j] > 0
+                count[j] += delta
+                if (count[j] > 0) != before:
+                    changed.symmetric_difference_update((j,))
+            e += 1
+        if not changed:
+            continue
+        for k in sorted({k for j in changed for k in (j, j + 1)}):
+            above = count[k] > 0 if k < len(y_coords) - 1 else False
+            below = count[k - 1] > 0 if k > 0 else False
+            if above != below:
+                runs.setdefault(k, x)
+            elif k in runs:
+                horizontal.append((runs.pop(k), x, y_coords[k]))
+        # Contiguous flipped cells make one vertical edge
+        cells = sorted(changed)
+        first = cells[0]
+        for prev, j in zip(cells, cells[1:] + [None]):
+            if j != prev + 1:
+                vertical.append((x, y_coords[first], y_coords[prev + 1]))
+                first = j
+    horizontal.sort(key=lambda edge: (edge[2], edge[0]))
+    return horizontal, vertical
+
+
 def boundary_flex(pattern, housing, courtyard=None):
     """
     Creates flexible courtyard that closely follows body and pad shapes.
-    Step 2: Trace the contour of the union of body and pad rectangles.
+    Traces the contour of the union of body and pad rectangles. The number of
+    segments drawn is returned and kept as ``pattern.courtyard_segments``.
     """
     settings = pattern.settings
     if courtyard is None:
         courtyard = housing.get('courtyard', {'M': 0.5, 'N': 0.25, 'L': 0.12}[settings['densityLevel']])
-    
+
     preamble(pattern, housing)
-    
+
     # Collect all rectangles (body + pads)
-    rectangles = []
-    
-    # Add body rectangle
     body_width = housing['bodyWidth']['nom']
     body_length = housing['bodyLength']['nom']
-    body_rect = {
-        'x1': -body_width / 2 - courtyard,
-        'y1': -body_length / 2 - courtyard,
-        'x2': body_width / 2 + courtyard,
-        'y2': body_length / 2 + courtyard
-    }
-    rectangles.append(body_rect)
-    
-    # Add pad rectangles
-    pads = list(pattern.pads.values())
-    for pad in pads:
-        pad_rect = {
-            'x1': pad.x - pad.width / 2 - courtyard,
-            'y1': pad.y - pad.height / 2 - courtyard,
-            'x2': pad.x + pad.width / 2 + courtyard,
-            'y2': pad.y + pad.height / 2 + courtyard
-        }
-        rectangles.append(pad_rect)
-    
-    # Find all unique x and y coordinates
-    x_coords = set()
-    y_coords = set()
-    for rect in rectangles:
-        x_coords.update([rect['x1'], rect['x2']])
-        y_coords.update([rect['y1'], rect['y2']])
-    
-    x_coords = sorted(x_coords)
-    y_coords = sorted(y_coords)
-    
-    # Create a grid and mark cells that are covered by any rectangle
-    grid = {}
-    for i in range(len(x_coords) - 1):
-        for j in range(len(y_coords) - 1):
-            x_center = (x_coords[i] + x_coords[i + 1]) / 2
-            y_center = (y_coords[j] + y_coords[j + 1]) / 2
-            
-            # Check if this cell center is inside any rectangle
-            covered = False
-            for rect in rectangles:
-                if (rect['x1'] <= x_center <= rect['x2'] and 
-                    rect['y1'] <= y_center <= rect['y2']):
-                    covered = True
-                    break
-            
-            grid[(i, j)] = covered
-    
-    # Trace the contour by finding boundary edges
-    def is_covered(i, j):
-        return grid.get((i, j), False)
-    
-    # Find horizontal edges (top and bottom of covered cells)
-    horizontal_edges = []
-    for i in range(len(x_coords) - 1):
-        for j in range(len(y_coords)):
-            # Check if there's a horizontal edge at y_coords[j]
-            above_covered = is_covered(i, j) if j < len(y_coords) - 1 else False
-            below_covered = is_covered(i, j - 1) if j > 0 else False
-            
-            if above_covered != below_covered:
-                horizontal_edges.append({
-                    'x1': x_coords[i], 'x2': x_coords[i + 1], 
-                    'y': y_coords[j], 'direction': 'up' if above_covered else 'down'
-                })
-    
-    # Find vertical edges (left and right of covered cells)
-    vertical_edges = []
-    for i in range(len(x_coords)):
-        for j in range(len(y_coords) - 1):
-            # Check if there's a vertical edge at x_coords[i]
-            left_covered = is_covered(i - 1, j) if i > 0 else False
-            right_covered = is_covered(i, j) if i < len(x_coords) - 1 else False
-            
-            if left_covered != right_covered:
-                vertical_edges.append({
-                    'y1': y_coords[j], 'y2': y_coords[j + 1], 
-                    'x': x_coords[i], 'direction': 'right' if right_covered else 'left'
-                })
-    
+    rectangles = [(
+        -body_width / 2 - courtyard,
+        -body_length / 2 - courtyard,
+        body_width / 2 + courtyard,
+        body_length / 2 + courtyard,
+    )]
+    for pad in pattern.pads.values():
+        rectangles.append((
+            pad.x - pad.width / 2 - courtyard,
+            pad.y - pad.height / 2 - courtyard,
+            pad.x + pad.width / 2 + courtyard,
+            pad.y + pad.height / 2 + courtyard,
+        ))
+
+    horizontal, vertical = _union_edges(rectangles)
+
     # Draw the contour lines
-    for edge in horizontal_edges:
-        pattern.line(edge['x1'], edge['y'], edge['x2'], edge['y'])
-    
-    for edge in vertical_edges:
-        pattern.line(edge['x'], edge['y1'], edge['x'], edge['y2'])
+    for x1, x2, y in horizontal:
+        pattern.line(x1, y, x2, y)
+
+    for x, y1, y2 in vertical:
+        pattern.line(x, y1, x, y2)
+
+    pattern.courtyard_segments = len(horizontal) + len(vertical)
+    return pattern.courtyard_segments
 
 
 def dual(pattern, housing, courtyard):
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate, compress, repeat
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from ...kicad_writer import PadNames, SequenceNames
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Pad centres are accumulated pitch by pitch, exactly like the original
+# `x += pitch` loops, so coordinates stay bit-identical with and without NumPy
+# (np.add.accumulate is a sequential sum as well).
+
+
+def steps(start: float, pitch: float, count: int) -> List[float]:
+    """``count`` positions from ``start``, each one ``pitch`` after the previous."""
+    if count <= 0:
+        return []
+    if np is not None:
+        values = np.full(count, pitch, dtype=float)
+        values[0] = start
+        return np.add.accumulate(values).tolist()
+    values = array('d', repeat(pitch, count))
+    values[0] = start
+    return list(accumulate(values))
+
+
+def grid(xs: Sequence[float], ys: Sequence[float]) -> Tuple[List[float], List[float]]:
+    """Row-major centres of the grid spanned by ``xs`` (columns) and ``ys`` (rows)."""
+    if np is not None:
+        return np.tile(np.asarray(xs, dtype=float), len(ys)).tolist(), np.repeat(np.asarray(ys, dtype=float), len(xs)).tolist()
+    return list(xs) * len(ys), [y for y in ys for _ in xs]
+
+
+def numbered(numbers: Sequence) -> Union[PadNames, List[str]]:
+    """Pad names for ``numbers``: a SequenceNames rule when they are evenly spaced integers."""
+    numbers = list(numbers)
+    if numbers and all(type(n) is int for n in numbers):
+        step = numbers[1] - numbers[0] if len(numbers) > 1 else 1
+        if step and all(b - a == step for a, b in zip(numbers, numbers[1:])):
+            return SequenceNames(numbers[0], step, len(numbers))
+    return [str(n) for n in numbers]
+
+
+def populated(names: Union[PadNames, Sequence[str]], pins, *columns: Iterable) -> List:
+    """Keep the entries whose name is in ``pins``; returns names and columns filtered alike.
+
+    A PadNames rule comes back as the same rule over the kept slots.
+    """
+    keep = [name in pins for name in names]
+    if isinstance(names, PadNames):
+        kept = names if all(keep) else names.subset(keep)
+    else:
+        kept = list(compress(names, keep))
+    return [kept] + [list(compress(column, keep)) for column in columns]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from importlib import import_module
+from threading import Lock
+from time import perf_counter
+from types import FunctionType
+from typing import Dict, Iterator, List, Optional
+
+# Build stages and the modules implementing them. copper.mask resolves the
+# solder mask margins and is reported with the mask layer.
+STAGES = ['calculator', 'copper', 'silkscreen', 'assembly', 'courtyard', 'mask', 'writer']
+_OVERRIDES = {('copper', 'mask'): 'mask'}
+
+# The session of the build being profiled in the current context; builds on
+# other threads, profiled or not, do not see it.
+_session: ContextVar[Optional['_Session']] = ContextVar('profile_session', default=None)
+_installed = False
+_install_lock = Lock()
+
+
+class _Session:
+    """Exclusive time, calls, and shapes/pads added per stage for one pattern."""
+
+    def __init__(self, pattern) -> None:
+        self.pattern = pattern
+        self.stats: Dict[str, Dict[str, float]] = {}
+        # per open stage: [stage, nested time, nested shapes, nested pads]
+        self.stack: List[list] = []
+        # shapes already counted, and their count with arrays counted per pad
+        self.seen = 0
+        self.count = 0
+
+    def shapes(self) -> int:
+        """Shapes of the pattern so far, a PadArray counting as its pads."""
+        shapes = self.pattern.shapes
+        # shapes are only ever appended, so only the new ones are looked at
+        for shape in shapes[self.seen:]:
+            self.count += len(shape) if shape.kind == 'pad_array' else 1
+        self.seen = len(shapes)
+        return self.count
+
+    def run(self, stage, fn, args, kwargs):
+        pattern = self.pattern
+        shapes, pads = self.shapes(), len(pattern.pads)
+        outer = self.stack[-1][0] if self.stack else None
+        self.stack.append([stage, 0.0, 0, 0])
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            added_shapes = self.shapes() - shapes
+            added_pads = len(pattern.pads) - pads
+            _, nested, nested_shapes, nested_pads = self.stack.pop()
+            record(self.stats, stage, elapsed - nested, added_shapes - nested_shapes,
+                   added_pads - nested_pads, calls=0 if outer == stage else 1)
+            if self.stack:
+                parent = self.stack[-1]
+                parent[1] += elapsed
+                parent[2] += added_shapes
+                parent[3] += added_pads
+
+
+def record(stats: Dict[str, Dict[str, float]], stage: str, time: float, shapes: int = 0, pads: int = 0, calls: int = 1) -> None:
+    entry = stats.setdefault(stage, {'time': 0.0, 'calls': 0, 'shapes': 0, 'pads': 0})
+    entry['time'] += time
+    entry['calls'] += calls
+    entry['shapes'] += shapes
+    entry['pads'] += pads
+
+
+def merge(total: Dict[str, Dict[str, float]], stats: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    for stage, entry in stats.items():
+        record(total, stage, entry['time'], entry['shapes'], entry['pads'], entry['calls'])
+    return total
+
+
+def _timed(fn, stage):
+    @wraps(fn)
+    def timed(*args, **kwargs):
+        session = _session.get()
+        if session is None:
+            return fn(*args, **kwargs)
+        return session.run(stage, fn, args, kwargs)
+    return timed
+
+
+def _instrument() -> None:
+    """Wrap the public functions of the stage modules, once per process.
+
+    The wrappers stay in place: outside a profiled build they cost a context
+    variable lookup per call.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for stage in STAGES:
+            try:
+                module = import_module(f'{__package__}.{stage}')
+            except ImportError:
+                continue
+            for name, fn in list(vars(module).items()):
+                if name.startswith('_') or not isinstance(fn, FunctionType) or fn.__module__ != module.__name__:
+                    continue
+                setattr(module, name, _timed(fn, _OVERRIDES.get((stage, name), stage)))
+        _installed = True
+
+
+@contextmanager
+def profiling(pattern) -> Iterator[Dict[str, Dict[str, float]]]:
+    """Time the stages run while building ``pattern`` inside the block.
+
+    Yields ``{stage: {'time', 'calls', 'shapes', 'pads'}}``, filled in when the
+    block exits. Time not spent in any stage is reported as ``other``. Builds
+    on other threads may be profiled at the same time; within one thread the
+    blocks do not nest.
+    """
+    if _session.get() is not None:
+        raise RuntimeError('profiling is already active')
+    _instrument()
+    session = _Session(pattern)
+    token = _session.set(session)
+    start = perf_counter()
+    try:
+        yield session.stats
+    finally:
+        elapsed = perf_counter() - start
+        _session.reset(token)
+        staged = sum(entry['time'] for entry in session.stats.values())
+        record(session.stats, 'other', elapsed - staged,
+               session.shapes() - sum(e['shapes'] for e in session.stats.values()),
+               len(pattern.pads) - sum(e['pads'] for e in session.stats.values()))
+
+
+def format_table(stats: Dict[str, Dict[str, float]], title: str = 'stage') -> str:
+    total = sum(entry['time'] for entry in stats.values()) or 1.0
+    order = [s for s in STAGES + ['other'] if s in stats] + sorted(s for s in stats if s not in STAGES and s != 'other')
+    lines = [f"{title:<16} {'ms':>10} {'%':>6} {'calls':>7} {'shapes':>8} {'pads':>7}"]
+    for stage in order:
+        e = stats[stage]
+        lines.append(f"{stage:<16} {e['time'] * 1000:>10.2f} {100 * e['time'] / total:>6.1f} "
+                     f"{e['calls']:>7} {e['shapes']:>8} {e['pads']:>7}")
+    return '\n'.join(lines)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+# Read-only pattern settings.
+#
+# ``Settings`` is a dict, so builders read it exactly as before
+# (``settings['clearance']['padToPad']`` costs a plain dict lookup), but it
+# refuses writes, nested mappings are ``Settings`` too and lists become
+# tuples. The hash is computed once, which makes a settings object a cheap
+# part of a cache key; JSON sees it as an ordinary dict.
+#
+# Changed settings are made with ``override``, which layers a partial mapping
+# over a copy and leaves the original alone.
+
+DENSITY_LEVELS = ('L', 'N', 'M')
+
+
+def _frozen(value: Any) -> Any:
+    if isinstance(value, Settings):
+        return value
+    if isinstance(value, Mapping):
+        return Settings(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+def _thawed(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thawed(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thawed(v) for v in value]
+    return value
+
+
+def _merged(base: Mapping, overrides: Mapping) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            value = _merged(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+class Settings(dict):
+    """Frozen, hashable settings mapping; see the module comment."""
+    __slots__ = ('_hash',)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, _frozen(value))
+        level = self.get('densityLevel')
+        if level is not None and level not in DENSITY_LEVELS:
+            raise ValueError(f"densityLevel must be one of {', '.join(DENSITY_LEVELS)}, not {level!r}")
+        self._hash = hash(frozenset(self.items()))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('settings are read-only; use Settings.override() to change them')
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> 'Settings':
+        return self
+
+    def __deepcopy__(self, memo) -> 'Settings':
+        return self
+
+    def __reduce__(self):
+        return (Settings, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"Settings({dict.__repr__(self)})"
+
+    def override(self, overrides: Mapping) -> 'Settings':
+        """These settings with ``overrides`` layered on top; nested mappings merge."""
+        return Settings(_merged(self, overrides)) if overrides else self
+
+    def thaw(self) -> Dict[str, Any]:
+        """A plain, mutable deep copy."""
+        return _thawed(self)
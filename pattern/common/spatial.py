@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from math import floor
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Slack added to every query extent so that float noise never drops a pair that
+# the exact clearance test would have accepted (1 nm, far below any round-off).
+_EPS = 1e-6
+
+
+class Box:
+    """Centre and size of a pad, as read by PadGrid."""
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x: float, y: float, width: float, height: float) -> None:
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+
+class PadGrid:
+    """Uniform grid over pad extents grown by ``reach / 2`` on every side.
+
+    Two pads are reported as candidates when their grown extents overlap, i.e.
+    when both the horizontal and the vertical edge-to-edge space between them
+    is below ``reach``. Pads larger than a cell are registered in every cell
+    they cover, so a big thermal pad does not inflate the cell size for the
+    whole footprint.
+
+    Extents are taken from the absolute pad size: a pad given a negative width
+    or height still takes part in the clearance test, so it is indexed as if
+    the size were positive (a superset of the pairs that test can accept).
+    """
+
+    def __init__(self, pads: Sequence, reach: float) -> None:
+        self.pads = pads
+        self.grow = reach / 2 + _EPS
+        sizes = sorted(max(abs(p.width), abs(p.height)) for p in pads)
+        typical = sizes[len(sizes) // 2] if sizes else 0.0
+        self.cell = max(typical + reach, _EPS * 1000)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, pad in enumerate(pads):
+            for key in self._cover(pad):
+                self.cells.setdefault(key, []).append(i)
+
+    def _cover(self, pad) -> Iterator[Tuple[int, int]]:
+        cell = self.cell
+        hw = abs(pad.width) / 2 + self.grow
+        hh = abs(pad.height) / 2 + self.grow
+        c1 = floor((pad.x - hw) / cell)
+        c2 = floor((pad.x + hw) / cell)
+        r1 = floor((pad.y - hh) / cell)
+        r2 = floor((pad.y + hh) / cell)
+        for c in range(c1, c2 + 1):
+            for r in range(r1, r2 + 1):
+                yield (c, r)
+
+    def neighbours(self, pad) -> List[int]:
+        """Indices of indexed pads whose grown extent overlaps that of ``pad``."""
+        seen = set()
+        out = []
+        hw = abs(pad.width) / 2 + self.grow
+        hh = abs(pad.height) / 2 + self.grow
+        for key in self._cover(pad):
+            for j in self.cells.get(key, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                q = self.pads[j]
+                if (abs(q.x - pad.x) < hw + abs(q.width) / 2 + self.grow
+                        and abs(q.y - pad.y) < hh + abs(q.height) / 2 + self.grow):
+                    out.append(j)
+        return out
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Intermediate values of the calculators and builders are reported here as
+# structured records instead of being printed. Call sites are written as
+#
+#     if trace.active():
+#         trace.emit('pad', Zmax=..., ...)
+#
+# so that nothing is formatted or allocated while no sink is installed.
+#
+# The sink lives in a context variable, so builds running concurrently on
+# other threads (the server builds in-process) neither see it nor write into
+# it; a new thread starts without a sink.
+
+_sink: ContextVar[Optional[Callable[[Dict], None]]] = ContextVar('trace_sink', default=None)
+
+
+def active() -> bool:
+    """Whether a sink is installed in the current context."""
+    return _sink.get() is not None
+
+
+def set_sink(sink: Optional[Callable[[Dict], None]]) -> Optional[Callable[[Dict], None]]:
+    """Install ``sink`` (called with one dict per record, or None); returns the previous one."""
+    previous = _sink.get()
+    _sink.set(sink)
+    return previous
+
+
+def emit(event: str, **fields) -> None:
+    sink = _sink.get()
+    if sink is not None:
+        sink({'event': event, **fields})
+
+
+@contextmanager
+def collect() -> Iterator[List[Dict]]:
+    """Collect the records emitted inside the block into a list."""
+    records: List[Dict] = []
+    token = _sink.set(records.append)
+    try:
+        yield records
+    finally:
+        _sink.reset(token)
@@ -1,2 +1,32 @@
-# Namespace marker for default patterns
+# Default patterns: one builder module per footprint kind.
+#
+# ``KINDS`` is the registry of kinds; a builder is imported the first time its
+# kind is asked for and kept, so looking it up again is a dict lookup. A new
+# builder module is added here as well.
+from importlib import import_module
+from types import ModuleType
+from typing import Dict
 
+KINDS = (
+    'bga', 'bridge', 'cae', 'cga', 'chip', 'chip_array', 'cqfp', 'crystal', 'custom', 'dfn', 'dip',
+    'lga', 'melf', 'molded', 'mounting_hole', 'oscillator', 'pak', 'pqfn', 'pson', 'qfn', 'qfp',
+    'radial', 'sod', 'sodfl', 'soic', 'soj', 'sol', 'son', 'sop', 'sopfl', 'sot', 'sot143', 'sot223',
+    'sot23', 'sot89_5', 'sotfl',
+)
+
+_builders: Dict[str, ModuleType] = {}
+
+
+def builder(kind: str) -> ModuleType:
+    """The builder module of ``kind``, which has ``build`` and usually ``describe``.
+
+    Raises ValueError for a kind not in ``KINDS``; an error raised while
+    importing the builder itself propagates as it is.
+    """
+    name = kind.lower()
+    mod = _builders.get(name)
+    if mod is None:
+        if name not in KINDS:
+            raise ValueError(f'Unsupported kind: {kind}')
+        mod = _builders[name] = import_module(f'{__name__}.{name}')
+    return mod
@@ -1,7 +1,7 @@
 from ..common import grid_array as grid_array_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['bga'] = True
     
@@ -25,5 +25,9 @@ def build(pattern, element):
                              f"Ball Diameter {ball_dia:.2f}mm, IPC-7351 {density_desc} Density")
         pattern.tags = "bga ic"
     
-    grid_array_mod.build(pattern, element)
+    grid_array_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    grid_array_mod.build(pattern, element)
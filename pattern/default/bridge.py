@@ -1,7 +1,11 @@
-def build(pattern, element):
-    housing = element['housing']
+def describe(pattern, element):
     if not getattr(pattern, 'name', None):
         pattern.name = element['name'].upper()
+
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad = {
         'type': 'smd',
         'x': -housing['padWidth'] / 2,
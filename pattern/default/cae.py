@@ -1,3 +1,4 @@
+from ..common import trace
 from ..common import two_pin as tp
 import math
 
@@ -24,7 +25,7 @@ def _generate_description_and_tags(housing, density_level):
     return descr, tags
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     # Compute leadSpan from leadLength and leadSpace; if only span is provided, back-compute length
     ll = housing.get('leadLength', {})
@@ -44,10 +45,8 @@ def build(pattern, element):
             tol = math.sqrt((ll_max - ll_min) ** 2 + (ls_max - ls_min) ** 2)
             nom = 2 * ll_nom + ls_nom
             housing['leadSpan'] = {'min': 2 * ll_min + ls_min, 'nom': nom, 'max': 2 * ll_max + ls_max, 'tol': tol}
-            print(f"=== CAE LEAD SPAN CALCULATION ===")
-            print(f"leadLength: {ll}")
-            print(f"leadSpace: {ls}")
-            print(f"calculated leadSpan: {housing['leadSpan']}")
+            if trace.active():
+                trace.emit('cae.lead_span', leadLength=ll, leadSpace=ls, leadSpan=housing['leadSpan'])
     elif span and ls and ('min' in span and 'nom' in span and 'max' in span):
         # Derive leadLength from span and space
         ll_min = (span['min'] - ls.get('max', ls.get('nom', 0))) / 2
@@ -68,5 +67,9 @@ def build(pattern, element):
         pattern.description = descr
         pattern.tags = tags
         
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
@@ -71,7 +71,7 @@ def _generate_description_and_tags(comp_type, housing, density_level):
     return descr, tag
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['chip'] = True
     # Naming per convention: use component type selector
@@ -91,5 +91,9 @@ def build(pattern, element):
         pattern.description = descr
         pattern.tags = tags
         
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
@@ -1,7 +1,7 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     settings = pattern.settings
     housing = element['housing']
     housing.setdefault('leadSpan', housing['bodyWidth'])
@@ -18,6 +18,10 @@ def build(pattern, element):
         lw = housing.get('leadWidth', {}).get('nom', housing.get('leadWidth', {}).get('max', housing.get('leadWidth', {}).get('min', 0)))
         pattern.name = f"{comp_type}{pins}P{pitch_h}_{bl:03d}X{bw:03d}X{bh:03d}{int(round(ll*100)):03d}X{int(round(lw*100)):03d}{settings['densityLevel']}"
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad_params = calculator.chip_array(pattern.__dict__, housing)
     pad_params['order'] = 'round'
     pad_params['pad'] = {
@@ -1,8 +1,12 @@
 from ..common import quad as quad_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['cqfp'] = True
-    quad_mod.build(pattern, element)
+    quad_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    quad_mod.build(pattern, element)
@@ -1,8 +1,12 @@
 from ..common import two_pin as tp
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['crystal'] = True
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
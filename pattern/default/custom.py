@@ -1,9 +1,14 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-_pin_number = 0
-_mounting_hole = 1
-_nc_pad = 1
+class _Numbering:
+    """Pad numbering state of one build, shared by its pad groups."""
+    __slots__ = ('pin_number', 'mounting_hole', 'nc_pad')
+
+    def __init__(self):
+        self.pin_number = 0
+        self.mounting_hole = 1
+        self.nc_pad = 1
 
 
 def _parse_numbers(element, housing, suffix):
@@ -24,8 +29,7 @@ def _parse_numbers(element, housing, suffix):
     return list(element['pins'].keys())
 
 
-def _copper_pads(pattern, element, suffix=''):
-    global _pin_number, _mounting_hole, _nc_pad
+def _copper_pads(pattern, element, numbering, suffix=''):
     housing = element['housing']
     pins = element['pins']
     pin_number_group = 0
@@ -56,7 +60,7 @@ def _copper_pads(pattern, element, suffix=''):
             'slotHeight': slot_h,
             'width': pad_width,
             'height': pad_height,
-            'shape': housing.get(f'padShape{suffix}') or ('rectangle' if (_pin_number == 0 and housing.get('polarized')) else 'circle'),
+            'shape': housing.get(f'padShape{suffix}') or ('rectangle' if (numbering.pin_number == 0 and housing.get('polarized')) else 'circle'),
             'layer': ['topCopper', 'topMask', 'intCopper', 'bottomCopper', 'bottomMask'],
         }
         if housing.get(f'pinInPaste{suffix}'):
@@ -79,7 +83,7 @@ def _copper_pads(pattern, element, suffix=''):
             'hole': hole_d,
             'width': pad_width,
             'height': pad_height,
-            'shape': housing.get(f'padShape{suffix}') or ('rectangle' if (_pin_number == 0 and housing.get('polarized')) else 'circle'),
+            'shape': housing.get(f'padShape{suffix}') or ('rectangle' if (numbering.pin_number == 0 and housing.get('polarized')) else 'circle'),
             'layer': ['topCopper', 'topMask', 'intCopper', 'bottomCopper', 'bottomMask'],
         }
         if housing.get(f'pinInPaste{suffix}'):
@@ -118,16 +122,16 @@ def _copper_pads(pattern, element, suffix=''):
             pad['x'] = p['x']
             pad['y'] = p['y']
             if pad['type'] == 'mounting-hole':
-                number = f"MH{_mounting_hole}"
-                _mounting_hole += 1
+                number = f"MH{numbering.mounting_hole}"
+                numbering.mounting_hole += 1
             else:
                 if f'numbers{suffix}' in housing:
                     number = numbers[pin_number_group]
                     pin_number_group += 1
                 else:
-                    number = numbers[_pin_number + pin_number_group] if (_pin_number + pin_number_group) < len(numbers) else f"NC{_nc_pad}"
+                    number = numbers[numbering.pin_number + pin_number_group] if (numbering.pin_number + pin_number_group) < len(numbers) else f"NC{numbering.nc_pad}"
                     if number.startswith('NC'):
-                        _nc_pad += 1
+                        numbering.nc_pad += 1
                     pin_number_group += 1
             pattern.pad(number, pad)
             if hole_d is not None:
@@ -154,17 +158,17 @@ def _copper_pads(pattern, element, suffix=''):
                 pad['x'] = x + row_dx + column_dx
                 pad['y'] = y + row_dy + column_dy
                 if pad['type'] == 'mounting-hole':
-                    number = f"MH{_mounting_hole}"
-                    _mounting_hole += 1
+                    number = f"MH{numbering.mounting_hole}"
+                    numbering.mounting_hole += 1
                 else:
                     if f'numbers{suffix}' in housing:
                         number = numbers[pin_number_group]
                         pin_number_group += 1
                     else:
-                        idx = _pin_number + pin_number_group
-                        number = numbers[idx] if idx < len(numbers) else f"NC{_nc_pad}"
+                        idx = numbering.pin_number + pin_number_group
+                        number = numbers[idx] if idx < len(numbers) else f"NC{numbering.nc_pad}"
                         if number.startswith('NC'):
-                            _nc_pad += 1
+                            numbering.nc_pad += 1
                         pin_number_group += 1
                 pattern.pad(number, pad)
                 if hole_d is not None:
@@ -172,27 +176,27 @@ def _copper_pads(pattern, element, suffix=''):
                 x += h_pitch
             y += v_pitch
 
-    _pin_number += pin_number_group
+    numbering.pin_number += pin_number_group
     return has_pads
 
 
+def describe(pattern, element):
+    pattern.name = getattr(pattern, 'name', None) or f"{element.get('group','custom')}_{element['name'].upper()}"
+
+
 def build(pattern, element):
-    global _pin_number, _mounting_hole, _nc_pad
+    describe(pattern, element)
     housing = element['housing']
-    pattern.name = getattr(pattern, 'name', None) or f"{element.get('group','custom')}_{element['name'].upper()}"
     housing.setdefault('bodyPosition', '0, 0')
     body_pos = pattern.parse_position(housing['bodyPosition'])[0]
     housing.setdefault('basePoint', '0, 0')
     base = pattern.parse_position(housing['basePoint'])[0]
     pattern.center(-body_pos['x'] + base['x'], -body_pos['y'] + base['y'])
-    _pin_number = 0
-    _mounting_hole = 1
-    _nc_pad = 1
-    _copper_pads(pattern, element)
+    numbering = _Numbering()
+    _copper_pads(pattern, element, numbering)
     i = 1
-    while True:
-        if not _copper_pads(pattern, element, i):
-            break
+    while _copper_pads(pattern, element, numbering, i):
+        i += 1
     pattern.center(0, 0)
     copper.mask(pattern)
     silkscreen.body(pattern, housing)
@@ -33,12 +33,17 @@ def _get_dfn_component_prefix_and_details(comp_type, lead_count):
     return prefix, description_name, tag
 
 
-def build(pattern, element):
-    housing = element['housing']
-    settings = pattern.settings
+def _lead_count(housing):
     lead_count = int(housing.get('leadCount', 2))
     if lead_count not in (2, 3, 4):
         lead_count = 2
+    return lead_count
+
+
+def describe(pattern, element):
+    housing = element['housing']
+    settings = pattern.settings
+    lead_count = _lead_count(housing)
 
     # Name
     if not getattr(pattern, 'name', None):
@@ -73,6 +78,12 @@ def build(pattern, element):
         )
         pattern.tags = tag
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
+    lead_count = _lead_count(housing)
+
     # Compute small pad size via SON calculator for consistency with IPC
     son_housing = dict(housing)
     # Use e1 (pitch along length) for SON pitch context if provided
@@ -1,9 +1,8 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
-    settings = pattern.settings
     housing['polarized'] = True
     housing.setdefault('leadWidth', housing.get('leadDiameter'))
     housing.setdefault('leadHeight', housing.get('leadDiameter'))
@@ -20,6 +19,11 @@ def build(pattern, element):
             f"{c}DIP{s}{int(round(housing['leadSpan']['nom']*100))}W{int(round(housing['leadWidth']['nom']*100))}P{int(round(housing['pitch']*100))}L{int(round(housing['bodyLength']['nom']*100))}H{int(round(housing['height']['nom']*100))}Q{lead_count}"
         )
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
+    settings = pattern.settings
     # Round-off per IPC table
     pattern.sizeRoundoff = 0.05
     pad_params = calculator.through_hole(pattern.__dict__, housing)
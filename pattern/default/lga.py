@@ -1,8 +1,12 @@
 from ..common import grid_array as grid_array_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['lga'] = True
-    grid_array_mod.build(pattern, element)
+    grid_array_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    grid_array_mod.build(pattern, element)
@@ -17,7 +17,7 @@ def _get_component_prefix_and_details(comp_type):
     return component_map.get(comp_type, ('DIOM', 'Diode, Molded', 'diode'))  # Default to diode
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['molded'] = True
     # Make molded components behave like chip components (90° CCW rotation, pin 1 on left)
@@ -55,5 +55,9 @@ def build(pattern, element):
         )
         pattern.tags = tag
     
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
@@ -1,12 +1,15 @@
 from ..common import copper, courtyard
 
 
-def build(pattern, element):
-    housing = element['housing']
-    settings = pattern.settings
+def describe(pattern, element):
     if not getattr(pattern, 'name', None):
         pattern.name = element['name'].upper()
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
+    settings = pattern.settings
     pad = {
         'x': 0,
         'y': 0,
@@ -1,8 +1,10 @@
-from ..common import assembly, calculator, copper, courtyard
+import copy
+
+from ..common import assembly, calculator, copper, courtyard, trace
 from .chip_array import build as chip_array_build
 
 
-def build(pattern, element):
+def _describe(pattern, element):
     settings = pattern.settings
     housing = element['housing']
     housing['polarized'] = True
@@ -35,47 +37,65 @@ def build(pattern, element):
                 # L-lead or C-bend could be added as OSCSL/OSCCL later if needed
                 pattern.name = f"OSC{int(round(housing['leadCount']))}P{pitch_h}_{bl}X{bw}X{bh}{int(round(ll*100))}X{int(round(lw*100))}{settings['densityLevel']}"
 
+
+def _name_corner_concave(pattern, housing):
+    settings = pattern.settings
+    # Generate name using calculated lead dimensions (now available in housing)
+    if not getattr(pattern, 'name', None):
+        bl = int(round(housing['bodyLength']['nom'] * 100))
+        bw = int(round(housing['bodyWidth']['nom'] * 100))
+        bh = int(round(housing['height']['max'] * 100))
+        # Use the calculated lead dimensions from the corner_concave calculation
+        ll = housing['leadLength']['nom']  # Lead length (along body length)
+        lw = housing['leadWidth']['nom']   # Lead width (along body width)
+        ll_h = int(round(ll * 100))
+        lw_h = int(round(lw * 100))
+        # Corner concave oscillator naming: OSCC + body dimensions + lead dimensions
+        pattern.name = f"OSCC{bl}X{bw}X{bh}L{ll_h}X{lw_h}{settings['densityLevel']}"
+        
+        # Generate description and tags
+        density_names = {'L': 'Least', 'N': 'Nominal', 'M': 'Most'}
+        density_name = density_names.get(settings['densityLevel'], 'Unknown')
+        
+        bl_mm = housing['bodyLength']['nom']
+        bw_mm = housing['bodyWidth']['nom']
+        bh_mm = housing['height']['max']
+        ll_mm = ll
+        lw_mm = lw
+        
+        pattern.description = (
+            f"Crystal Oscillator {bl_mm:.1f}mmx{bw_mm:.1f}mm "
+            f", Body {bl_mm:.2f}mmx{bw_mm:.2f}mm, "
+            f"Height {bh_mm:.2f}mm, Lead {ll_mm:.2f}mmx{lw_mm:.2f}mm, "
+            f"{density_name} Density"
+        )
+        pattern.tags = "oscillator"
+
+
+def describe(pattern, element):
+    _describe(pattern, element)
+    housing = element['housing']
+    if housing.get('corner-concave') and not getattr(pattern, 'name', None):
+        # The name uses the lead dimensions corner_concave() writes to the
+        # housing, so run it on copies and leave the geometry to build().
+        housing = copy.deepcopy(housing)
+        calculator.corner_concave(dict(pattern.__dict__), housing)
+        _name_corner_concave(pattern, housing)
+
+
+def build(pattern, element):
+    _describe(pattern, element)
+    housing = element['housing']
     if housing.get('corner-concave'):
-        print(f"DEBUG oscillator: input housing = {housing}")
         pad_params = calculator.corner_concave(pattern.__dict__, housing)
-        print(f"DEBUG oscillator: calculator.corner_concave returned = {pad_params}")
         pad_params['distance'] = pad_params['distance1']
         housing['pitch'] = pad_params['distance2']
         housing['leadCount'] = 4
-        print(f"DEBUG oscillator: final pad_params distance = {pad_params['distance']}")
-        print(f"DEBUG oscillator: final housing pitch = {housing['pitch']}")
+        if trace.active():
+            trace.emit('oscillator', padParams=dict(pad_params), pitch=housing['pitch'])
         
-        # Generate name using calculated lead dimensions (now available in housing)
-        if not getattr(pattern, 'name', None):
-            bl = int(round(housing['bodyLength']['nom'] * 100))
-            bw = int(round(housing['bodyWidth']['nom'] * 100))
-            bh = int(round(housing['height']['max'] * 100))
-            # Use the calculated lead dimensions from the corner_concave calculation
-            ll = housing['leadLength']['nom']  # Lead length (along body length)
-            lw = housing['leadWidth']['nom']   # Lead width (along body width)
-            ll_h = int(round(ll * 100))
-            lw_h = int(round(lw * 100))
-            # Corner concave oscillator naming: OSCC + body dimensions + lead dimensions
-            pattern.name = f"OSCC{bl}X{bw}X{bh}L{ll_h}X{lw_h}{settings['densityLevel']}"
-            
-            # Generate description and tags
-            density_names = {'L': 'Least', 'N': 'Nominal', 'M': 'Most'}
-            density_name = density_names.get(settings['densityLevel'], 'Unknown')
-            
-            bl_mm = housing['bodyLength']['nom']
-            bw_mm = housing['bodyWidth']['nom']
-            bh_mm = housing['height']['max']
-            ll_mm = ll
-            lw_mm = lw
-            
-            pattern.description = (
-                f"Crystal Oscillator {bl_mm:.1f}mmx{bw_mm:.1f}mm "
-                f", Body {bl_mm:.2f}mmx{bw_mm:.2f}mm, "
-                f"Height {bh_mm:.2f}mm, Lead {ll_mm:.2f}mmx{lw_mm:.2f}mm, "
-                f"{density_name} Density"
-            )
-            pattern.tags = "oscillator"
-            
+        _name_corner_concave(pattern, housing)
+
         pad_params['pad'] = {
             'type': 'smd',
             'shape': 'rectangle',
@@ -1,7 +1,7 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     settings = pattern.settings
     # Normalize fields that may be provided as scalars or missing 'nom'
@@ -28,6 +28,10 @@ def build(pattern, element):
             f"TO{int(round(housing['pitch']*100))}P{int(round(blv*100))}X{int(round(bwv*100))}X{int(round(housing['height']['max']*100))}-{int(round(housing['leadCount']))}{settings['densityLevel']}"
         )
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad_params = calculator.pak(pattern.__dict__, housing)
 
     pad = {
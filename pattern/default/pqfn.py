@@ -1,7 +1,7 @@
-from .qfn import build as _qfn_build
+from .qfn import build as _qfn_build, describe as _qfn_describe
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     # Ensure QFN path is used with pullback for PQFN
     housing['qfn'] = True
@@ -9,5 +9,9 @@ def build(pattern, element):
     pb = housing.get('pullBack')
     if pb is not None and not isinstance(pb, dict):
         housing['pullBack'] = {'nom': pb}
-    _qfn_build(pattern, element)
+    _qfn_describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    _qfn_build(pattern, element)
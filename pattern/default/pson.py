@@ -1,11 +1,15 @@
-from .son import build as _son_build
+from .son import build as _son_build, describe as _son_describe
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     # Ensure pullBack is a dict with 'nom' if provided as scalar
     pb = housing.get('pullBack')
     if pb is not None and not isinstance(pb, dict):
         housing['pullBack'] = {'nom': pb}
-    _son_build(pattern, element)
+    _son_describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    _son_build(pattern, element)
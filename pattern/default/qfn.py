@@ -1,9 +1,13 @@
 from ..common import quad as quad_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['qfn'] = True
-    # Naming for QFN/PQFN handled in common.quad.build
-    quad_mod.build(pattern, element)
+    # Naming for QFN/PQFN handled in common.quad.describe
+    quad_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    quad_mod.build(pattern, element)
@@ -1,7 +1,7 @@
 from ..common import quad as quad_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['qfp'] = True
     
@@ -26,6 +26,10 @@ def build(pattern, element):
                              f"Lead {ll:.2f}mm x {lw:.2f}mm, {density_desc} Density")
         pattern.tags = "qfp ic"
     
-    # Naming for QFP/CQFP handled in common.quad.build
-    quad_mod.build(pattern, element)
+    # Naming for QFP/CQFP handled in common.quad.describe
+    quad_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    quad_mod.build(pattern, element)
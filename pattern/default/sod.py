@@ -1,7 +1,7 @@
 from ..common import two_pin as tp
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['sod'] = True
     if not getattr(pattern, 'name', None):
@@ -11,5 +11,9 @@ def build(pattern, element):
         ll = housing.get('leadLength', {}).get('nom', housing.get('leadLength', {}).get('max', housing.get('leadLength', {}).get('min', 0)))
         lw = housing.get('leadWidth', {}).get('nom', housing.get('leadWidth', {}).get('max', housing.get('leadWidth', {}).get('min', 0)))
         pattern.name = f"SOD{ls:03d}X{bw:03d}X{bh:03d}{int(round(ll*100)):03d}X{int(round(lw*100)):03d}{pattern.settings['densityLevel']}"
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
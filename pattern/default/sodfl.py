@@ -1,7 +1,7 @@
 from ..common import two_pin as tp
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['sodfl'] = True
     # Make SODFL behave like chip components (90° CCW rotation, pin 1 on left)
@@ -39,5 +39,9 @@ def build(pattern, element):
         )
         pattern.tags = "diode"
     
-    tp.build(pattern, element)
+    tp.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    tp.build(pattern, element)
@@ -1,7 +1,7 @@
 from ..common import dual as dual_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing.setdefault('pitch', 1.27)
     housing['soic'] = True
@@ -28,6 +28,10 @@ def build(pattern, element):
                              f"Lead {ll:.2f}mm x {lw:.2f}mm, {density_desc} Density")
         pattern.tags = "soic ic"
     
-    # Naming handled in common.dual.build
-    dual_mod.build(pattern, element)
+    # Naming handled in common.dual.describe
+    dual_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    dual_mod.build(pattern, element)
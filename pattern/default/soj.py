@@ -1,7 +1,7 @@
 from ..common import mask, copper, silkscreen, assembly, courtyard, calculator
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['soj'] = True
     housing['polarized'] = True
@@ -39,7 +39,11 @@ def build(pattern, element):
                               f"({pitch:.2f}mm pitch), Body {body_l:.2f}mm x {body_w:.2f}mm x {h:.2f}mm, "
                               f"Lead Span {lead_span:.2f}mm, Lead Width {lw:.2f}mm, {density_desc} Density")
         pattern.tags = "soj"
-    
+
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     # Calculate pad parameters using custom SOJ calculator
     pad_params = calculator.soj(pattern.__dict__, housing)
     
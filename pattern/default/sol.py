@@ -1,9 +1,13 @@
 from ..common import dual as dual_mod
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['sol'] = True
     housing['polarized'] = True
-    dual_mod.build(pattern, element)
+    dual_mod.describe(pattern, element)
+
 
+def build(pattern, element):
+    describe(pattern, element)
+    dual_mod.build(pattern, element)
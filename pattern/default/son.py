@@ -1,7 +1,7 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['polarized'] = True
     housing['son'] = True  # Flag for SON-specific silkscreen
@@ -73,6 +73,10 @@ def build(pattern, element):
                              f"Lead {ll:.2f}mm x {lw:.2f}mm{thermal_desc}, {density_desc} Density")
         pattern.tags = "son ic"
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad_params = calculator.son(pattern.__dict__, housing)
     pad_params.update({'pitch': housing['pitch'], 'count': housing['leadCount'], 'order': 'round'})
     pad_params['pad'] = {
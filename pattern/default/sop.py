@@ -1,18 +1,66 @@
 from ..common import dual as dual_mod, mask, copper, silkscreen, assembly, courtyard, calculator
 
 
-def build(pattern, element):
+def _thermal_pad(housing):
+    # Normalize thermal pad dimensions: (width, length), zero without a tab
+    if 'tabWidth' in housing and housing['tabWidth']['nom'] > 0:
+        return housing['tabWidth']['nom'], housing['tabLength']['nom']
+    return 0, 0
+
+
+def describe(pattern, element):
     housing = element['housing']
     housing['sop'] = True
     housing['polarized'] = True
     settings = pattern.settings
+    thermal_pad_width, thermal_pad_length = _thermal_pad(housing)
     
-    # Normalize thermal pad dimensions
-    thermal_pad_width = 0
-    thermal_pad_length = 0
-    if 'tabWidth' in housing and housing['tabWidth']['nom'] > 0:
-        thermal_pad_width = housing['tabWidth']['nom']
-        thermal_pad_length = housing['tabLength']['nom']
+    # Thermal pad suffix for naming
+    thermal_suffix = ""
+    if thermal_pad_width > 0 and thermal_pad_length > 0:
+        tpw = int(round(thermal_pad_width * 100))
+        tpl = int(round(thermal_pad_length * 100))
+        thermal_suffix = f"T{tpl:03d}X{tpw:03d}"
+    
+    pin_count = int(housing['leadCount'])
+    pitch = housing['pitch']
+    
+    # Naming convention: SOP+PinQty+PPitch_BodyLength X LeadSpan X BodyHeight + L LeadLength X Width + T ThermalPadLength X Width
+    pitch_h = int(round(pitch * 100))
+    bl = int(round(housing['bodyLength']['nom'] * 100))
+    lead_span = housing['leadSpan']['nom']
+    ls = int(round(lead_span * 100))
+    bh = int(round(housing['height']['max'] * 100))
+    ll = int(round(housing['leadLength']['nom'] * 100))
+    lw = int(round(housing['leadWidth']['nom'] * 100))
+    
+    # Use actual pin count (not including thermal pad)
+    actual_pin_count = pin_count
+    pattern.name = f"SOP{actual_pin_count}P{pitch_h:03d}_{bl:03d}X{ls:03d}X{bh:03d}L{ll:03d}X{lw:03d}{thermal_suffix}{settings['densityLevel']}"
+    
+    # Generate description
+    density_desc = {"L": "Least", "N": "Nominal", "M": "Most"}[settings['densityLevel']]
+    body_l = housing['bodyLength']['nom']
+    body_w = housing['bodyWidth']['nom']
+    h = housing['height']['max']
+    ll_desc = housing['leadLength']['nom']
+    lw_desc = housing['leadWidth']['nom']
+    
+    pattern.description = (f"Small Outline Package (SOP), {actual_pin_count} Pin "
+                          f"({pitch:.2f}mm pitch), Body {body_l:.2f}mm x {body_w:.2f}mm x {h:.2f}mm, "
+                          f"Lead {ll_desc:.2f}mm x {lw_desc:.2f}mm")
+    
+    if thermal_pad_width > 0:
+        pattern.description += f", Thermal Pad {thermal_pad_length:.2f}mm x {thermal_pad_width:.2f}mm"
+    
+    pattern.description += f", {density_desc} Density"
+    pattern.tags = "sop"
+
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
+    thermal_pad_width, thermal_pad_length = _thermal_pad(housing)
     
     # Calculate pad parameters
     pad_params = calculator.dual(pattern.__dict__, housing, 'sop')
@@ -55,7 +103,6 @@ def build(pattern, element):
         y += pitch  # Move down for next pin
     
     # Add thermal pad if specified
-    thermal_suffix = ""
     if thermal_pad_width > 0 and thermal_pad_length > 0:
         pad_thermal = {
             'type': 'smd',
@@ -68,41 +115,6 @@ def build(pattern, element):
             'roundrect_rratio': min(0.25, 0.1 / min(thermal_pad_width, thermal_pad_length))
         }
         pattern.pad(pin_count + 1, pad_thermal)
-        # Thermal pad suffix for naming
-        tpw = int(round(thermal_pad_width * 100))
-        tpl = int(round(thermal_pad_length * 100))
-        thermal_suffix = f"T{tpl:03d}X{tpw:03d}"
-    
-    # Naming convention: SOP+PinQty+PPitch_BodyLength X LeadSpan X BodyHeight + L LeadLength X Width + T ThermalPadLength X Width
-    pitch_h = int(round(pitch * 100))
-    bl = int(round(housing['bodyLength']['nom'] * 100))
-    lead_span = housing['leadSpan']['nom']
-    ls = int(round(lead_span * 100))
-    bh = int(round(housing['height']['max'] * 100))
-    ll = int(round(housing['leadLength']['nom'] * 100))
-    lw = int(round(housing['leadWidth']['nom'] * 100))
-    
-    # Use actual pin count (not including thermal pad)
-    actual_pin_count = pin_count
-    pattern.name = f"SOP{actual_pin_count}P{pitch_h:03d}_{bl:03d}X{ls:03d}X{bh:03d}L{ll:03d}X{lw:03d}{thermal_suffix}{settings['densityLevel']}"
-    
-    # Generate description
-    density_desc = {"L": "Least", "N": "Nominal", "M": "Most"}[settings['densityLevel']]
-    body_l = housing['bodyLength']['nom']
-    body_w = housing['bodyWidth']['nom']
-    h = housing['height']['max']
-    ll_desc = housing['leadLength']['nom']
-    lw_desc = housing['leadWidth']['nom']
-    
-    pattern.description = (f"Small Outline Package (SOP), {actual_pin_count} Pin "
-                          f"({pitch:.2f}mm pitch), Body {body_l:.2f}mm x {body_w:.2f}mm x {h:.2f}mm, "
-                          f"Lead {ll_desc:.2f}mm x {lw_desc:.2f}mm")
-    
-    if thermal_pad_width > 0:
-        pattern.description += f", Thermal Pad {thermal_pad_length:.2f}mm x {thermal_pad_width:.2f}mm"
-    
-    pattern.description += f", {density_desc} Density"
-    pattern.tags = "sop"
     
     # Add layers
     copper.mask(pattern)
@@ -1,6 +1,9 @@
-from .sot23 import build as sot23_build
+from .sot23 import build as sot23_build, describe as sot23_describe
+
+
+def describe(pattern, element):
+    sot23_describe(pattern, element)
 
 
 def build(pattern, element):
     return sot23_build(pattern, element)
-
@@ -1,7 +1,7 @@
 from ..common import assembly, calculator, copper, courtyard, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['polarized'] = True
     settings = pattern.settings
@@ -14,6 +14,10 @@ def build(pattern, element):
         lw = housing.get('leadWidth', {}).get('nom', housing.get('leadWidth', {}).get('max', housing.get('leadWidth', {}).get('min', 0)))
         pattern.name = f"SOT223{int(round(housing['leadCount']))}P{pitch_h}_{ls:03d}X{bw:03d}X{bh:03d}{int(round(ll*100)):03d}X{int(round(lw*100)):03d}{settings['densityLevel']}"
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad_params = calculator.sot(pattern.__dict__, housing)
 
     pad = {
@@ -1,7 +1,7 @@
 from ..common import assembly, calculator, copper, courtyard, mask, silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['polarized'] = True
     housing['sot23'] = True  # Flag for SOT-23-specific silkscreen/assembly
@@ -45,6 +45,14 @@ def build(pattern, element):
                              f"Lead {ll:.2f}mm x {lw:.2f}mm, {density_desc} Density")
         pattern.tags = "sot23"
 
+    if housing['leadCount'] % 2 == 0 and housing['leadCount'] != 6:
+        from .sop import describe as sop_describe
+        sop_describe(pattern, element)
+
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     if housing['leadCount'] % 2 == 0 and housing['leadCount'] != 6:
         from .sop import build as sop_build
         return sop_build(pattern, element)
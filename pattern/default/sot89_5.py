@@ -2,7 +2,7 @@ from ..common import assembly, calculator, copper, courtyard
 from ..common import silkscreen
 
 
-def build(pattern, element):
+def describe(pattern, element):
     housing = element['housing']
     housing['polarized'] = True
     housing['flatlead'] = True
@@ -13,6 +13,10 @@ def build(pattern, element):
             f"SOTFL{int(round(housing['pitch']*100))}P{int(round(housing['leadSpan']['nom']*100))}X{int(round(housing['height']['max']*100))}-{int(round(housing['leadCount']))}{settings['densityLevel']}"
         )
 
+
+def build(pattern, element):
+    describe(pattern, element)
+    housing = element['housing']
     pad_params = calculator.sot(pattern.__dict__, housing)
     pad1 = {
         'type': 'smd',
@@ -1,9 +1,137 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from copy import copy
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from ..kicad_writer import PatternShape
+from ..kicad_writer import (NM_PER_MM, AttributeShape, CircleShape, LineShape, PadArray, PadNames, PadShape,
+                            PatternShape, RectangleShape, shapes_memory)
+
+
+class PadTable:
+    """Pads of a pattern by name, in the order the names were first added.
+
+    Reads and writes like the dict it replaces. A PadArray stays a single
+    entry and its pads are handed out as ArrayPad views on access, so the
+    table grows with the number of arrays and individual pads, not with the
+    pads inside the arrays. Assigning to a name held by an array keeps its
+    position, as a dict would.
+    """
+    __slots__ = ('_entries', '_single', '_arrays', '_replaced')
+
+    def __init__(self) -> None:
+        # name of an individual pad, or a PadArray
+        self._entries: List[Union[str, PadArray]] = []
+        self._single: Dict[str, PatternShape] = {}
+        self._arrays: List[PadArray] = []
+        # pads assigned to names that belong to an array
+        self._replaced: Dict[str, PatternShape] = {}
+
+    def _find(self, name: str):
+        for pads in self._arrays:
+            i = pads.index(name)
+            if i is not None:
+                return pads, i
+        return None
+
+    def __getitem__(self, name: str):
+        pad = self._single.get(name)
+        if pad is None:
+            pad = self._replaced.get(name)
+        if pad is not None:
+            return pad
+        found = self._find(name)
+        if found is None:
+            raise KeyError(name)
+        pads, i = found
+        return pads[i]
+
+    def __setitem__(self, name: str, pad: PatternShape) -> None:
+        if name in self._single:
+            self._single[name] = pad
+        elif name in self._replaced or self._find(name) is not None:
+            self._replaced[name] = pad
+        else:
+            self._single[name] = pad
+            self._entries.append(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self._single or name in self._replaced or self._find(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._single) + sum(len(pads) for pads in self._arrays)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def add_array(self, pads: PadArray) -> bool:
+        """Append ``pads`` as one entry; False if one of its names is taken."""
+        if self and any(name in self for name in pads.names):
+            return False
+        self._entries.append(pads)
+        self._arrays.append(pads)
+        return True
+
+    def keys(self) -> Iterator[str]:
+        for entry in self._entries:
+            if entry.__class__ is str:
+                yield entry
+            else:
+                yield from entry.names
+
+    def values(self) -> Iterator[PatternShape]:
+        replaced = self._replaced
+        for entry in self._entries:
+            if entry.__class__ is str:
+                yield self._single[entry]
+            elif replaced:
+                for name, pad in zip(entry.names, entry):
+                    yield replaced.get(name, pad)
+            else:
+                yield from entry
+
+    def items(self) -> Iterator[Tuple[str, PatternShape]]:
+        replaced = self._replaced
+        for entry in self._entries:
+            if entry.__class__ is str:
+                yield entry, self._single[entry]
+            else:
+                for name, pad in zip(entry.names, entry):
+                    yield name, replaced.get(name, pad)
+
+    def groups(self) -> Iterator[Union[Tuple[str, PatternShape], PadArray]]:
+        """Every array once, and ``(name, pad)`` for the pads held individually."""
+        for entry in self._entries:
+            yield entry if entry.__class__ is not str else (entry, self._single[entry])
+        yield from self._replaced.items()
+
+    def members(self, pads: PadArray) -> Iterator[PatternShape]:
+        """The pads of ``pads`` whose name has not been assigned another pad since."""
+        replaced = self._replaced
+        if not replaced:
+            return iter(pads)
+        return (pad for name, pad in zip(pads.names, pads) if name not in replaced)
+
+    def extents(self) -> Iterator[Tuple[float, float, float, float]]:
+        """``(xmin, ymin, xmax, ymax)`` of the pads, a few at a time."""
+        replaced = self._replaced
+        for group in self.groups():
+            if group.__class__ is not tuple and not any(group.index(name) is not None for name in replaced):
+                yield group.extent()
+                continue
+            for pad in ([group[1]] if group.__class__ is tuple else
+                        (p for name, p in zip(group.names, group) if name not in replaced)):
+                yield (pad.x - pad.width / 2, pad.y - pad.height / 2,
+                       pad.x + pad.width / 2, pad.y + pad.height / 2)
+
+    def __repr__(self) -> str:
+        return f'PadTable({len(self)} pads, {len(self._arrays)} arrays)'
 
 
 @dataclass
@@ -13,25 +141,42 @@ class QedaPattern:
     name: str
     type: str = 'smd'
     shapes: List[PatternShape] = field(default_factory=list)
-    pads: Dict[str, PatternShape] = field(default_factory=dict)
+    pads: PadTable = field(default_factory=PadTable)
     current_layer: List[str] = field(default_factory=lambda: ['topCopper'])
     current_line_width: float = 0.0
     current_fill: bool = False
     cx: float = 0.0
     cy: float = 0.0
+    # Integer nanometre mode: lines, rectangles, circles and texts are stored
+    # in integer nm and pad geometry is snapped to whole nm. Pads stay in mm
+    # because the builders read them back.
+    nm: bool = False
+    # pads whose solder mask margin copper.mask has resolved, by name, together
+    # with the geometry they were resolved at; pad arrays with their revision
+    mask_settled: Dict[Union[str, PadArray], object] = field(default_factory=dict)
+    # lines drawn by courtyard.boundary_flex, for footprints that use it
+    courtyard_segments: Optional[int] = None
+
+    def _length(self, mm):
+        """A length as stored in a graphic shape: integer nm in nm mode."""
+        return round(mm * NM_PER_MM) if self.nm and mm is not None else mm
+
+    def _snap(self, mm):
+        """A pad length in mm, snapped to whole nm in nm mode."""
+        return round(mm * NM_PER_MM) / NM_PER_MM if self.nm and mm is not None else mm
 
     def attribute(self, name: str, attr: dict) -> 'QedaPattern':
+        length = self._length
         self.shapes.append(
-            PatternShape(
-                kind='attribute',
+            AttributeShape(
                 name=name,
-                x=self.cx + attr.get('x', 0.0),
-                y=self.cy + attr.get('y', 0.0),
+                x=length(self.cx + attr.get('x', 0.0)),
+                y=length(self.cy + attr.get('y', 0.0)),
                 text=attr.get('text'),
-                fontSize=attr.get('fontSize', self.settings['fontSize']['default']),
+                fontSize=length(attr.get('fontSize', self.settings['fontSize']['default'])),
                 angle=attr.get('angle'),
                 visible=attr.get('visible', True),
-                lineWidth=self.current_line_width,
+                lineWidth=length(self.current_line_width),
                 layer=self.current_layer,
             )
         )
@@ -43,8 +188,9 @@ class QedaPattern:
         return self
 
     def circle(self, x: float, y: float, radius: float) -> 'QedaPattern':
+        length = self._length
         self.shapes.append(
-            PatternShape(kind='circle', x=self.cx + x, y=self.cy + y, radius=radius, lineWidth=self.current_line_width, layer=self.current_layer, fill=self.current_fill)
+            CircleShape(x=length(self.cx + x), y=length(self.cy + y), radius=length(radius), lineWidth=length(self.current_line_width), layer=self.current_layer, fill=self.current_fill)
         )
         return self
 
@@ -60,8 +206,9 @@ class QedaPattern:
 
     def line(self, x1: float, y1: float, x2: float, y2: float) -> 'QedaPattern':
         if (x1 != x2) or (y1 != y2):
+            length = self._length
             self.shapes.append(
-                PatternShape(kind='line', x1=self.cx + x1, y1=self.cy + y1, x2=self.cx + x2, y2=self.cy + y2, lineWidth=self.current_line_width, layer=self.current_layer)
+                LineShape(x1=length(self.cx + x1), y1=length(self.cy + y1), x2=length(self.cx + x2), y2=length(self.cy + y2), lineWidth=length(self.current_line_width), layer=self.current_layer)
             )
         return self
 
@@ -80,13 +227,13 @@ class QedaPattern:
 
     def pad(self, name: str | int, pad: dict) -> 'QedaPattern':
         n = str(name)
-        shape = PatternShape(
-            kind='pad',
+        snap = self._snap
+        shape = PadShape(
             pad_name=n,
-            x=self.cx + pad.get('x', 0.0),
-            y=self.cy + pad.get('y', 0.0),
-            width=pad['width'],
-            height=pad['height'],
+            x=snap(self.cx + pad.get('x', 0.0)),
+            y=snap(self.cy + pad.get('y', 0.0)),
+            width=snap(pad['width']),
+            height=snap(pad['height']),
             type=pad['type'],
             shape=pad.get('shape', 'rect'),
             hole=pad.get('hole'),
@@ -106,10 +253,102 @@ class QedaPattern:
             self.type = 'through-hole'
         return self
 
+    def add_pads(self, pad: dict, names, xs, ys, heights=None) -> 'QedaPattern':
+        """Same as ``pad(name, dict(pad, x=x, y=y))`` for every name, in order.
+
+        ``heights`` optionally overrides the height per pad. With ``names``
+        given as a PadNames rule the pads are kept as one PadArray.
+        """
+        cx, cy = self.cx, self.cy
+        snap = self._snap
+        pad_type = pad['type']
+        template = PadShape(
+            pad_name=None,
+            width=snap(pad['width']),
+            height=snap(pad['height']),
+            type=pad_type,
+            shape=pad.get('shape', 'rect'),
+            hole=pad.get('hole'),
+            slotWidth=pad.get('slotWidth'),
+            slotHeight=pad.get('slotHeight'),
+            mask=pad.get('mask'),
+            paste=pad.get('paste'),
+            clearance=pad.get('clearance'),
+            dieLength=pad.get('dieLength'),
+            chamfer=pad.get('chamfer'),
+            property=pad.get('property'),
+            layer=pad.get('layer', self.current_layer),
+        )
+        xs = [cx + x for x in xs]
+        ys = [cy + y for y in ys]
+        if not xs:
+            return self
+        if self.nm:
+            xs = [snap(x) for x in xs]
+            ys = [snap(y) for y in ys]
+            heights = heights and [snap(h) for h in heights]
+        if heights is not None and all(h == template.height for h in heights):
+            heights = None
+        pads = None
+        if isinstance(names, PadNames):
+            pads = PadArray(template, names, xs, ys, heights)
+            if self.pads.add_array(pads):
+                self.shapes.append(pads)
+            else:
+                pads = None
+        if pads is None:
+            # a name is repeated: keep the dict semantics pad by pad
+            for i, name in enumerate(names):
+                shape = copy(template)
+                shape.pad_name = str(name)
+                shape.x = xs[i]
+                shape.y = ys[i]
+                if heights is not None:
+                    shape.height = heights[i]
+                self.pads[shape.pad_name] = shape
+                self.shapes.append(shape)
+        if pad_type not in ('smd', 'mounting-hole'):
+            self.type = 'through-hole'
+        return self
+
+    @staticmethod
+    def _mask_geometry(pad: PatternShape) -> tuple:
+        return (pad.x, pad.y, pad.width, pad.height, pad.type)
+
+    def mask_pending(self) -> Set[Union[str, PadArray]]:
+        """Names of the pads added, replaced or moved since their mask margin was
+        settled, and the pad arrays holding any such pad."""
+        pending = set()
+        settled = self.mask_settled
+        for group in self.pads.groups():
+            if group.__class__ is tuple:
+                name, pad = group
+                state = settled.get(name)
+                if state is None or state[0] is not pad or state[1] != self._mask_geometry(pad):
+                    pending.add(name)
+            elif settled.get(group) != group.revision:
+                pending.add(group)
+        return pending
+
+    def settle_mask(self) -> None:
+        settled = {}
+        for group in self.pads.groups():
+            if group.__class__ is tuple:
+                name, pad = group
+                settled[name] = (pad, self._mask_geometry(pad))
+            else:
+                settled[group] = group.revision
+        self.mask_settled = settled
+
+    def memory(self) -> int:
+        """Bytes held by the shape records of this footprint."""
+        return shapes_memory(self.shapes)
+
     def rectangle(self, x1: float, y1: float, x2: float, y2: float) -> 'QedaPattern':
         if (x1 != x2) or (y1 != y2):
+            length = self._length
             self.shapes.append(
-                PatternShape(kind='rectangle', x1=self.cx + x1, y1=self.cy + y1, x2=self.cx + x2, y2=self.cy + y2, lineWidth=self.current_line_width, layer=self.current_layer, fill=self.current_fill)
+                RectangleShape(x1=length(self.cx + x1), y1=length(self.cy + y1), x2=length(self.cx + x2), y2=length(self.cy + y2), lineWidth=length(self.current_line_width), layer=self.current_layer, fill=self.current_fill)
             )
         return self
 
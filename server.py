@@ -0,0 +1,354 @@
+"""Long-lived local footprint server.
+
+  python -m package.server [--port N | --socket PATH] [--workers N] [--out DIR]
+
+Builders stay imported and their caches warm between requests, so a caller
+that generates one part at a time does not pay for interpreter start-up and
+imports on every part. Footprints are built in a pool of worker processes;
+name previews are answered from the server process.
+
+  POST /footprint           {"kind", "element"}  ->  the .kicad_mod bytes
+                            (name in the X-Footprint-Name header)
+  POST /footprint?write=1   writes <out>/<name>.kicad_mod  ->  {"path", "written"}
+  POST /describe            {"kind", "element"}  ->  {"name", "description", "tags"}
+  GET  /health              ->  {"status", "uptime", "workers", "pool", "restarts"}
+  GET  /metrics             ->  request, error and build counters
+
+As with a manifest entry, the kind may also be given inside the element.
+Errors come back as {"error"} with status 400 for a malformed request,
+422 for an element the builder rejects and 500 when the server fails to run
+the build, e.g. when a worker process dies. A broken pool is replaced with a
+new one; /health reports "degraded" while it is broken. The server only
+listens on localhost or on a Unix socket.
+"""
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .generate import build_pattern, describe_footprint, footprint_bytes, write_footprint
+from .pattern.default import KINDS, builder
+
+# largest request body accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+
+class RequestError(ValueError):
+    """A malformed request; answered with 400."""
+
+
+class ServiceError(RuntimeError):
+    """The server failed to run a build; answered with 500."""
+
+
+def _warm() -> None:
+    """Import every builder up front; the initializer of each worker."""
+    for kind in KINDS:
+        builder(kind)
+
+
+def _render(kind: str, element: Dict[str, Any]) -> Dict[str, Any]:
+    start = perf_counter()
+    pattern = build_pattern(kind, element)
+    data = footprint_bytes(pattern)
+    return {'name': pattern.name, 'data': data, 'seconds': perf_counter() - start}
+
+
+def _write(kind: str, element: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    start = perf_counter()
+    path, written = write_footprint(build_pattern(kind, element), out_dir)
+    return {'path': path, 'written': written, 'seconds': perf_counter() - start}
+
+
+def parse_request(body: bytes) -> Tuple[str, Dict[str, Any]]:
+    """``(kind, element)`` of a request body."""
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise RequestError(f'invalid JSON: {e}')
+    if not isinstance(data, dict):
+        raise RequestError('expected a JSON object')
+    if isinstance(data.get('element'), dict):
+        element = data['element']
+        kind = data.get('kind') or element.get('kind')
+    else:
+        element = data
+        kind = data.get('kind')
+    element = {k: v for k, v in element.items() if k != 'kind'}
+    if not kind:
+        raise RequestError('no kind; add a "kind" key')
+    if 'name' not in element or 'housing' not in element:
+        raise RequestError('the element needs "name" and "housing"')
+    return kind, element
+
+
+class FootprintService:
+    """Worker pool and counters behind the HTTP handler."""
+
+    def __init__(self, workers: int, out_dir: str) -> None:
+        self.workers = workers
+        self.out_dir = out_dir
+        self.started = monotonic()
+        self.lock = Lock()
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self.in_flight = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+        # pools started to replace a broken one
+        self.restarts = 0
+        self.pool_lock = Lock()
+        _warm()
+        self.pool: Optional[ProcessPoolExecutor] = self._start_pool() if workers > 0 else None
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+        # start the workers now rather than on the first request
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def _restart(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace ``broken`` with a new pool, unless another thread already has."""
+        with self.pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._start_pool()
+                self.restarts += 1
+            return self.pool
+
+    def _submit(self, fn: Callable[..., Dict[str, Any]], *args) -> Tuple[ProcessPoolExecutor, Future]:
+        pool = self.pool
+        try:
+            return pool, pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # nothing ran yet, so the job goes to a new pool
+            pool = self._restart(pool)
+            return pool, pool.submit(fn, *args)
+
+    def _run(self, fn: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+        if self.pool is None:
+            result = fn(*args)
+        else:
+            try:
+                pool, future = self._submit(fn, *args)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    # the worker died during this job; not retried, as the
+                    # element itself may be what kills it
+                    self._restart(pool)
+                    raise
+            except (BrokenProcessPool, OSError) as e:
+                raise ServiceError(f'worker pool failed: {type(e).__name__}: {e}') from e
+        with self.lock:
+            self.builds += 1
+            self.build_seconds += result.pop('seconds')
+        return result
+
+    def render(self, kind: str, element: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(_render, kind, element)
+
+    def write(self, kind: str, element: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(_write, kind, element, self.out_dir)
+
+    def count(self, path: str, error: bool = False) -> None:
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.errors += error
+
+    def pool_state(self) -> str:
+        """``'ok'``, ``'broken'``, or ``'in-process'`` when there is no pool."""
+        pool = self.pool
+        if pool is None:
+            return 'in-process'
+        try:
+            # raises at once on a broken pool; otherwise a no-op job
+            pool.submit(int)
+        except BrokenProcessPool:
+            return 'broken'
+        return 'ok'
+
+    def health(self) -> Dict[str, Any]:
+        pool = self.pool_state()
+        return {'status': 'degraded' if pool == 'broken' else 'ok', 'uptime': round(monotonic() - self.started, 3),
+                'workers': self.workers, 'pool': pool, 'restarts': self.restarts}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'uptime': round(monotonic() - self.started, 3),
+                'workers': self.workers,
+                'requests': dict(self.requests),
+                'errors': self.errors,
+                'inFlight': self.in_flight,
+                'builds': self.builds,
+                'buildSeconds': round(self.build_seconds, 6),
+                'restarts': self.restarts,
+            }
+
+    def close(self) -> None:
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'FootprintServer/1'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self) -> FootprintService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json',
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self.service.count(path)
+            self._json(HTTPStatus.OK, self.service.health())
+        elif path == '/metrics':
+            self.service.count(path)
+            self._json(HTTPStatus.OK, self.service.metrics())
+        else:
+            self.service.count(path, error=True)
+            self._json(HTTPStatus.NOT_FOUND, {'error': f'no such endpoint: {path}'})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path not in ('/footprint', '/describe'):
+            self.service.count(url.path, error=True)
+            self._json(HTTPStatus.NOT_FOUND, {'error': f'no such endpoint: {url.path}'})
+            return
+        service = self.service
+        with service.lock:
+            service.in_flight += 1
+        try:
+            status, body, content_type, headers = self._post(url.path, parse_qs(url.query))
+        finally:
+            with service.lock:
+                service.in_flight -= 1
+        service.count(url.path, error=status != HTTPStatus.OK)
+        self._send(status, body, content_type, headers)
+
+    def _post(self, path: str, query: Dict[str, Any]) -> Tuple[int, bytes, str, Dict[str, str]]:
+        try:
+            header = self.headers.get('Content-Length') or '0'
+            try:
+                length = int(header)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # the body cannot be framed; reading it would wait for EOF
+                self.close_connection = True
+                raise RequestError(f'invalid Content-Length: {header}')
+            if length > MAX_BODY:
+                self.close_connection = True
+                raise RequestError(f'request body over {MAX_BODY} bytes')
+            kind, element = parse_request(self.rfile.read(length))
+        except RequestError as e:
+            return HTTPStatus.BAD_REQUEST, _error(e), 'application/json', {}
+        try:
+            if path == '/describe':
+                name, description, tags = describe_footprint(kind, element)
+                reply = {'name': name, 'description': description, 'tags': tags}
+            elif query.get('write', ['0'])[0] not in ('', '0', 'false'):
+                reply = self.service.write(kind, element)
+            else:
+                result = self.service.render(kind, element)
+                return HTTPStatus.OK, result['data'], 'application/octet-stream', {'X-Footprint-Name': result['name']}
+        except ServiceError as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, _error(e), 'application/json', {}
+        except Exception as e:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, _error(f'{type(e).__name__}: {e}'), 'application/json', {}
+        return HTTPStatus.OK, json.dumps(reply).encode('utf-8'), 'application/json', {}
+
+
+def _error(message: Any) -> bytes:
+    return json.dumps({'error': str(message)}).encode('utf-8')
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # callers open many connections at once; the default backlog is 5
+    request_queue_size = 128
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(service: FootprintService, port: int = 8765, socket_path: Optional[str] = None,
+                verbose: bool = False):
+    """HTTP server for ``service`` on localhost ``port``, or on the Unix socket ``socket_path``."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixHTTPServer(socket_path, Handler)
+    else:
+        server = _HTTPServer(('127.0.0.1', port), Handler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Serve footprint generation over localhost HTTP')
+    listen = parser.add_mutually_exclusive_group()
+    listen.add_argument('--port', type=int, default=8765, help='TCP port on 127.0.0.1 (default: 8765)')
+    listen.add_argument('--socket', metavar='PATH', help='Listen on a Unix socket instead')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes; 0 builds in the server process (default: CPU count)')
+    parser.add_argument('--out', default='./kicad/footprints', help='Output directory for ?write=1')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args(argv)
+
+    service = FootprintService(args.workers, args.out)
+    server = make_server(service, args.port, args.socket, args.verbose)
+    where = args.socket or 'http://127.0.0.1:%d' % server.server_address[1]
+    print(f'serving on {where} with {args.workers} workers', file=sys.stderr)
+    # shutdown() waits for serve_forever() to return, so not from its own thread
+    signal.signal(signal.SIGTERM, lambda signum, frame: Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""A representative element of every footprint kind, for the tests."""
+import copy
+from typing import Any, Dict
+
+GRID_LETTERS = {i: letter for i, letter in enumerate('ABCDEFGHJKLMNPRTUVWY', start=1)}
+
+
+def _pins(count: int) -> Dict[str, dict]:
+    return {str(i): {} for i in range(1, count + 1)}
+
+
+def _grid_pins(rows: int, columns: int) -> Dict[str, dict]:
+    return {f'{GRID_LETTERS[row]}{col}': {} for row in range(1, rows + 1) for col in range(1, columns + 1)}
+
+
+def _range(nom: float, tol: float) -> Dict[str, float]:
+    return {'min': round(nom - tol, 4), 'nom': nom, 'max': round(nom + tol, 4)}
+
+
+_GULLWING = {
+    'leadLength': _range(0.6, 0.15),
+    'leadWidth': _range(0.4, 0.08),
+    'height': {'max': 1.75},
+}
+
+HOUSINGS: Dict[str, Dict[str, Any]] = {
+    'bga': {'rowCount': 10, 'columnCount': 10, 'pitch': 0.8, 'leadDiameter': {'nom': 0.4},
+            'bodyWidth': _range(10.0, 0.2), 'bodyLength': _range(10.0, 0.2), 'height': {'max': 1.0}},
+    'bridge': {'padWidth': 1.0, 'padHeight': 1.0},
+    'cae': {'leadCount': 2, 'cae': True, 'leadLength': _range(3.4, 0.1), 'leadWidth': _range(1.2, 0.2),
+            'leadSpace': {'nom': 4.6}, 'leadSpan': _range(10.3, 0.2), 'bodyWidth': _range(10.3, 0.2),
+            'bodyLength': _range(10.3, 0.2), 'bodyDiameter': {'nom': 10}, 'height': {'max': 10.8}},
+    'cga': {'rowCount': 10, 'columnCount': 10, 'pitch': 1.27, 'leadDiameter': {'nom': 0.5},
+            'bodyWidth': _range(15.0, 0.2), 'bodyLength': _range(15.0, 0.2), 'height': {'max': 3.0}},
+    'chip': {'componentType': 'RESC', 'polarized': False, 'bodyLength': _range(1.6, 0.1),
+             'bodyWidth': _range(0.8, 0.1), 'leadLength': _range(0.3, 0.1), 'leadWidth': {'min': 0.7, 'max': 0.9},
+             'leadSpan': _range(1.6, 0.1), 'height': {'max': 0.55}},
+    'chip_array': {'componentType': 'RESCAV', 'leadCount': 8, 'pitch': 0.5, 'leadSpan': _range(1.1, 0.1),
+                   'leadLength': {'min': 0.15, 'max': 0.25}, 'leadWidth': {'min': 0.15, 'max': 0.25},
+                   'bodyWidth': {'nom': 2.0}, 'bodyLength': {'nom': 1.6}, 'height': {'max': 0.6}},
+    'cqfp': {'pitch': 0.65, 'rowCount': 11, 'columnCount': 11, 'rowSpan': _range(13.2, 0.2),
+             'columnSpan': _range(13.2, 0.2), 'bodyWidth': {'nom': 10.0}, 'bodyLength': {'nom': 10.0},
+             'leadLength': _range(0.6, 0.1), 'leadWidth': _range(0.3, 0.05), 'height': {'max': 2.4}},
+    'crystal': {'bodyLength': _range(5.0, 0.15), 'bodyWidth': _range(3.2, 0.15), 'leadLength': _range(1.2, 0.2),
+                'leadWidth': {'min': 2.0, 'max': 2.4}, 'leadSpan': _range(5.0, 0.15), 'height': {'max': 1.1}},
+    'custom': {'rowCount': 2, 'columnCount': 4, 'pitch': 2.54, 'holeDiameter': 1.0, 'polarized': True,
+               'bodyWidth': {'nom': 10.0}, 'bodyLength': {'nom': 5.0}},
+    'dfn': {'componentType': 'diode', 'leadCount': 2, 'pitch': 0, 'bodyLength': _range(2.0, 0.2),
+            'bodyWidth': _range(1.6, 0.2), 'leadLength': {'min': 0.4, 'max': 0.8}, 'leadWidth': {'min': 1.4, 'max': 1.8},
+            'pullBack': {'nom': 0.0}, 'height': {'max': 1.0}, 'pitch1': 1.4, 'pitch2': 0.0,
+            'largePadWidth': _range(1.2, 0.2), 'largePadLength': _range(1.8, 0.2)},
+    'dip': {'leadCount': 8, 'pitch': 2.54, 'leadSpan': _range(7.62, 0.25), 'leadDiameter': {'nom': 0.5, 'max': 0.56},
+            'bodyWidth': {'nom': 6.35}, 'bodyLength': {'nom': 9.8}, 'height': {'nom': 4.0}},
+    'lga': {'rowCount': 6, 'columnCount': 8, 'horizontalPitch': 0.8, 'verticalPitch': 0.65,
+            'leadLength': {'nom': 0.3}, 'leadWidth': {'nom': 0.3}, 'bodyWidth': {'nom': 7.0},
+            'bodyLength': {'nom': 5.0}, 'height': {'max': 1.0}},
+    'melf': {'bodyLength': _range(3.5, 0.1), 'bodyDiameter': _range(1.5, 0.1), 'leadLength': {'min': 0.2, 'max': 0.5},
+             'leadSpan': _range(3.5, 0.1)},
+    'molded': {'componentType': 'capacitor', 'leadSpan': _range(5.075, 0.275), 'bodyLength': _range(4.275, 0.325),
+               'bodyWidth': _range(2.575, 0.325), 'leadLength': _range(1.125, 0.375),
+               'leadWidth': _range(1.25, 0.3), 'height': {'max': 1.05}},
+    'mounting_hole': {'holeDiameter': 3.2, 'padDiameter': 6.0, 'bodyWidth': {'max': 6.0}},
+    'oscillator': {'corner-concave': True, 'leadCount': 4, 'bodyWidth': _range(3.2, 0.1),
+                   'bodyLength': _range(2.5, 0.1), 'height': {'max': 1.2},
+                   'padSeparationWidth': _range(2.2, 0.1), 'padSeparationLength': _range(1.8, 0.1)},
+    'pak': {'leadCount': 3, 'pitch': 2.29, 'leadSpan': _range(9.9, 0.3), 'leadLength': {'min': 0.9, 'max': 1.5},
+            'leadWidth': {'min': 0.64, 'max': 0.89}, 'bodyWidth': {'max': 6.73}, 'bodyLength': {'max': 6.22},
+            'height': {'max': 2.39}, 'tabWidth': _range(5.3, 0.2), 'tabLength': _range(5.5, 0.5),
+            'tabLedge': {'min': 0.5}},
+    'pqfn': {'pitch': 0.5, 'rowCount': 8, 'columnCount': 8, 'bodyWidth': _range(5.0, 0.1),
+             'bodyLength': _range(5.0, 0.1), 'leadLength': _range(0.4, 0.1), 'leadWidth': _range(0.25, 0.05),
+             'pullBack': {'nom': 0.1}, 'height': {'max': 1.0}, 'tabWidth': _range(3.1, 0.1),
+             'tabLength': _range(3.1, 0.1)},
+    'pson': {'leadCount': 2, 'pitch': 0, 'bodyLength': _range(2.0, 0.2), 'bodyWidth': _range(1.6, 0.2),
+             'leadLength': {'min': 0.4, 'max': 0.8}, 'leadWidth': {'min': 1.4, 'max': 1.8},
+             'pullBack': {'nom': 0.0}, 'height': {'max': 1.0}},
+    'qfn': {'pitch': 0.5, 'rowCount': 12, 'columnCount': 12, 'bodyWidth': _range(7.0, 0.1),
+            'bodyLength': _range(7.0, 0.1), 'leadLength': _range(0.4, 0.1), 'leadWidth': _range(0.25, 0.05),
+            'height': {'max': 1.0}, 'tabWidth': _range(5.1, 0.1), 'tabLength': _range(5.1, 0.1)},
+    'qfp': {'pitch': 0.5, 'rowCount': 16, 'columnCount': 16, 'rowSpan': _range(12.0, 0.1),
+            'columnSpan': _range(12.0, 0.1), 'bodyWidth': {'nom': 10.0}, 'bodyLength': {'nom': 10.0},
+            'leadLength': _range(0.6, 0.1), 'leadWidth': _range(0.22, 0.05), 'height': {'max': 1.6}},
+    'radial': {'leadSpan': _range(2.5, 0.1), 'leadDiameter': _range(0.5, 0.05), 'bodyDiameter': _range(5.0, 0.2),
+               'height': {'max': 11.0}},
+    'sod': {'bodyLength': _range(2.7, 0.1), 'bodyWidth': _range(1.6, 0.1), 'leadLength': _range(0.35, 0.15),
+            'leadWidth': {'min': 0.25, 'max': 0.4}, 'leadSpan': _range(3.7, 0.15), 'height': {'max': 1.35}},
+    'sodfl': {'leadSpan': _range(5.2, 0.15), 'bodyLength': _range(4.25, 0.1), 'bodyWidth': _range(2.6, 0.1),
+              'leadLength': {'min': 0.975, 'nom': 1.5, 'max': 2.025}, 'leadWidth': _range(1.35, 0.1),
+              'height': {'max': 1.0}},
+    'soic': dict(_GULLWING, leadCount=8, pitch=1.27, leadSpan=_range(6.0, 0.2), bodyWidth=_range(3.9, 0.1),
+                 bodyLength=_range(4.9, 0.1)),
+    'soj': {'leadCount': 20, 'pitch': 1.27, 'leadSpan': _range(8.5, 0.2), 'leadLength': _range(0.7, 0.2),
+            'leadWidth': _range(0.45, 0.05), 'bodyWidth': _range(7.6, 0.1), 'bodyLength': _range(12.8, 0.1),
+            'height': {'max': 3.5}},
+    'sol': dict(_GULLWING, leadCount=8, pitch=1.27, leadSpan=_range(6.0, 0.2), bodyWidth=_range(3.9, 0.1),
+                bodyLength=_range(4.9, 0.1)),
+    'son': {'leadCount': 8, 'pitch': 0.65, 'bodyWidth': _range(3.0, 0.1), 'bodyLength': _range(3.0, 0.1),
+            'leadLength': {'min': 0.3, 'max': 0.5}, 'leadWidth': {'min': 0.25, 'max': 0.35},
+            'pullBack': {'nom': 0.0}, 'height': {'max': 0.8}, 'tabWidth': _range(1.6, 0.1),
+            'tabLength': _range(2.4, 0.1)},
+    'sop': {'leadCount': 16, 'pitch': 0.65, 'leadSpan': _range(6.4, 0.2), 'leadLength': _range(0.6, 0.15),
+            'leadWidth': _range(0.25, 0.06), 'bodyWidth': _range(4.4, 0.1), 'bodyLength': _range(5.0, 0.1),
+            'height': {'max': 1.2}, 'tabWidth': _range(2.2, 0.1), 'tabLength': _range(3.0, 0.1)},
+    'sopfl': dict(_GULLWING, leadCount=8, pitch=1.27, leadSpan=_range(6.0, 0.2), bodyWidth=_range(3.9, 0.1),
+                  bodyLength=_range(4.9, 0.1)),
+    'sot': {'leadCount': 3, 'pitch': 0.95, 'leadSpan': _range(2.4, 0.15), 'leadLength': _range(0.45, 0.15),
+            'leadWidth': _range(0.4, 0.1), 'bodyWidth': _range(1.3, 0.1), 'bodyLength': _range(2.9, 0.1),
+            'height': {'max': 1.1}},
+    'sot143': {'leadCount': 4, 'pitch': 1.9, 'leadSpan': _range(2.4, 0.2), 'leadLength': _range(0.45, 0.15),
+               'leadWidth1': {'min': 0.3, 'max': 0.5}, 'leadWidth2': {'min': 0.76, 'max': 0.89},
+               'bodyWidth': _range(1.3, 0.1), 'bodyLength': _range(2.9, 0.1), 'height': {'max': 1.2}},
+    'sot223': {'leadCount': 4, 'pitch': 2.3, 'leadSpan': _range(7.0, 0.3), 'leadLength': _range(0.9, 0.2),
+               'leadWidth1': {'min': 0.66, 'max': 0.84}, 'leadWidth2': {'min': 2.9, 'max': 3.1},
+               'bodyWidth': _range(3.5, 0.1), 'bodyLength': _range(6.5, 0.1), 'height': {'max': 1.8}},
+    'sot23': {'leadCount': 6, 'pitch': 0.95, 'leadSpan': _range(2.8, 0.25), 'leadLength': _range(0.45, 0.15),
+              'leadWidth': _range(0.4, 0.1), 'bodyWidth': _range(1.6, 0.15), 'bodyLength': _range(2.9, 0.15),
+              'height': {'max': 1.1}},
+    'sot89_5': {'leadCount': 5, 'pitch': 1.5, 'leadSpan': _range(4.25, 0.15), 'leadLength': _range(0.9, 0.1),
+                'leadWidth1': {'min': 0.36, 'max': 0.48}, 'leadWidth2': {'min': 0.44, 'max': 0.56},
+                'bodyWidth': _range(2.5, 0.1), 'bodyLength': _range(4.5, 0.1), 'height': {'max': 1.6}},
+    'sotfl': {'componentType': 'ICSOFL', 'leadCount': 3, 'pitch': 0.95, 'leadSpan': _range(2.4, 0.1),
+              'leadLength': _range(0.4, 0.1), 'leadWidth': {'min': 0.37, 'nom': 0.44, 'max': 0.5},
+              'bodyWidth': _range(1.8, 0.1), 'bodyLength': _range(2.9, 0.2), 'height': {'max': 0.88}},
+}
+
+
+def _pin_set(kind: str, housing: Dict[str, Any]) -> Dict[str, dict]:
+    if kind in ('bga', 'cga', 'lga'):
+        return _grid_pins(housing['rowCount'], housing['columnCount'])
+    if kind in ('qfp', 'qfn', 'pqfn', 'cqfp'):
+        return _pins(2 * (housing['rowCount'] + housing['columnCount']))
+    if kind == 'custom':
+        return _pins(housing['rowCount'] * housing['columnCount'])
+    return _pins(max(int(housing.get('leadCount', 2)), 2))
+
+
+def element(kind: str) -> Dict[str, Any]:
+    """A fresh element of ``kind``; the default name lets the builder derive one."""
+    housing = copy.deepcopy(HOUSINGS[kind])
+    return {
+        'name': 'part' if kind in ('custom', 'mounting_hole', 'bridge') else '',
+        'housing': housing,
+        'pins': _pin_set(kind, housing),
+        'gridLetters': dict(GRID_LETTERS),
+    }
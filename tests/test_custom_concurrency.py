@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ..generate import build_pattern, footprint_bytes
+from .elements import element
+
+COUNT = 400
+
+
+def _custom(i):
+    """A custom element whose numbering runs over several pad groups.
+
+    The first group is through-hole, the second SMD; every third element adds
+    holes too large for their pads (numbered MH...), and every fourth has
+    fewer pins than pads, so the rest are numbered NC...
+    """
+    part = element('custom')
+    housing = part['housing']
+    rows, columns = 1 + i % 3, 2 + i % 5
+    housing.update({
+        'rowCount': rows, 'columnCount': columns, 'pitch': 1.27 + 0.01 * (i % 7),
+        'holeDiameter': 0.6 + 0.05 * (i % 4),
+        'padPosition1': ', '.join(f'{1.5 * k}, {4 + i % 3}' for k in range(1 + i % 4)),
+        'padWidth1': 0.8, 'padHeight1': 1.2,
+        'polarized': i % 2 == 0,
+    })
+    pads = rows * columns + 1 + i % 4
+    if i % 3 == 0:
+        housing.update({'padPosition2': '-3, -3, 3, -3', 'holeDiameter2': 2.2, 'padDiameter2': 2.0})
+    part['pins'] = {str(n): {} for n in range(1, pads + 1 - (2 if i % 4 == 0 else 0))}
+    part['name'] = f'part{i}'
+    return part
+
+
+def test_parallel_custom_builds_match_serial():
+    parts = [_custom(i) for i in range(COUNT)]
+    serial = [footprint_bytes(build_pattern('custom', part)) for part in parts]
+    assert any(b'(pad MH1 ' in data for data in serial)
+    assert any(b'(pad NC1 ' in data for data in serial)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for _ in range(3):
+            parallel = list(pool.map(lambda part: footprint_bytes(build_pattern('custom', part)), parts))
+            assert parallel == serial
@@ -0,0 +1,30 @@
+import copy
+
+import pytest
+
+from ..generate import build_pattern, footprint_bytes
+from ..pattern.default import KINDS
+from .elements import element
+
+
+def test_every_kind_has_an_element():
+    from .elements import HOUSINGS
+    assert sorted(HOUSINGS) == sorted(KINDS)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_build_leaves_element_unchanged(kind):
+    part = element(kind)
+    before = copy.deepcopy(part)
+    build_pattern(kind, part)
+    assert part == before
+    assert part['housing'] == before['housing']
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_building_twice_gives_the_same_bytes(kind):
+    part = element(kind)
+    first = footprint_bytes(build_pattern(kind, part))
+    second = footprint_bytes(build_pattern(kind, part))
+    assert first
+    assert first == second
@@ -0,0 +1,173 @@
+import http.client
+import json
+import os
+import signal
+import socket
+import time
+from threading import Thread
+
+import pytest
+
+from ..generate import build_pattern, footprint_bytes
+from ..server import FootprintService, make_server
+from .elements import element
+
+
+@pytest.fixture(params=[0, 1], ids=['in-process', 'pool'])
+def served(request, tmp_path):
+    """``(service, port)`` of a server on a free localhost port."""
+    service = FootprintService(request.param, str(tmp_path))
+    server = make_server(service, port=0)
+    thread = Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield service, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        if isinstance(body, dict):
+            body = json.dumps(body).encode('utf-8')
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def _json(port, method, path, body=None, headers=None):
+    status, _, data = _request(port, method, path, body, headers)
+    return status, json.loads(data)
+
+
+def test_footprint_returns_the_file(served):
+    _, port = served
+    status, headers, data = _request(port, 'POST', '/footprint', {'kind': 'soic', 'element': element('soic')})
+    pattern = build_pattern('soic', element('soic'))
+    assert status == 200
+    assert headers['X-Footprint-Name'] == pattern.name
+    assert data == footprint_bytes(pattern)
+
+
+def test_kind_inside_the_element(served):
+    _, port = served
+    status, _, _ = _request(port, 'POST', '/footprint', dict(element('chip'), kind='chip'))
+    assert status == 200
+
+
+def test_write_stores_the_file(served, tmp_path):
+    _, port = served
+    status, reply = _json(port, 'POST', '/footprint?write=1', {'kind': 'qfp', 'element': element('qfp')})
+    assert status == 200
+    assert reply['written'] is True
+    assert os.path.dirname(reply['path']) == str(tmp_path)
+    with open(reply['path'], 'rb') as f:
+        assert f.read() == footprint_bytes(build_pattern('qfp', element('qfp')))
+    status, reply = _json(port, 'POST', '/footprint?write=1', {'kind': 'qfp', 'element': element('qfp')})
+    assert reply['written'] is False
+
+
+def test_describe(served):
+    _, port = served
+    status, reply = _json(port, 'POST', '/describe', {'kind': 'sop', 'element': element('sop')})
+    pattern = build_pattern('sop', element('sop'))
+    assert status == 200
+    assert reply == {'name': pattern.name, 'description': pattern.description, 'tags': pattern.tags}
+
+
+def test_health_and_metrics(served):
+    service, port = served
+    _request(port, 'POST', '/footprint', {'kind': 'soic', 'element': element('soic')})
+    _request(port, 'POST', '/footprint', {'kind': 'soic'})
+    status, health = _json(port, 'GET', '/health')
+    assert status == 200
+    assert health['status'] == 'ok'
+    assert health['pool'] == ('ok' if service.workers else 'in-process')
+    assert health['workers'] == service.workers
+    status, metrics = _json(port, 'GET', '/metrics')
+    assert status == 200
+    assert metrics['requests']['/footprint'] == 2
+    assert metrics['errors'] == 1
+    assert metrics['builds'] == 1
+    assert metrics['inFlight'] == 0
+
+
+@pytest.mark.parametrize('body', [b'{', b'[]', b'{"element": {"name": "x", "housing": {}}}', b'{"kind": "soic"}'],
+                         ids=['bad-json', 'not-an-object', 'no-kind', 'no-element'])
+def test_malformed_request_is_400(served, body):
+    _, port = served
+    status, reply = _json(port, 'POST', '/footprint', body)
+    assert status == 400
+    assert reply['error']
+
+
+@pytest.mark.parametrize('length', ['-1', 'abc'])
+def test_bad_content_length_is_400_and_closes(served, length):
+    _, port = served
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(b'POST /footprint HTTP/1.1\r\nHost: x\r\nContent-Length: %s\r\n\r\n{}' % length.encode())
+        response = b''
+        while True:
+            # the server hangs up after answering rather than wait for a body it cannot frame
+            data = sock.recv(65536)
+            if not data:
+                break
+            response += data
+    head, _, body = response.partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 400')
+    assert 'Content-Length' in json.loads(body)['error']
+
+
+def test_rejected_element_is_422(served):
+    _, port = served
+    part = element('soic')
+    del part['housing']['leadSpan']
+    status, reply = _json(port, 'POST', '/footprint', {'kind': 'soic', 'element': part})
+    assert status == 422
+    assert reply['error'].startswith('KeyError')
+    status, reply = _json(port, 'POST', '/footprint', {'kind': 'nope', 'element': element('soic')})
+    assert status == 422
+
+
+def test_unknown_endpoint_is_404(served):
+    _, port = served
+    assert _request(port, 'GET', '/nope')[0] == 404
+    assert _request(port, 'POST', '/nope', {})[0] == 404
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(0.02)
+
+
+@pytest.mark.parametrize('served', [1], indirect=True, ids=['pool'])
+def test_killed_worker_is_replaced(served):
+    service, port = served
+    pid = service.pool.submit(os.getpid).result()
+    os.kill(pid, signal.SIGKILL)
+    _wait_for(lambda: _json(port, 'GET', '/health')[1]['status'] == 'degraded')
+    status, _, _ = _request(port, 'POST', '/footprint', {'kind': 'soic', 'element': element('soic')})
+    assert status == 200
+    status, health = _json(port, 'GET', '/health')
+    assert health['status'] == 'ok'
+    assert health['restarts'] == 1
+
+
+@pytest.mark.parametrize('served', [1], indirect=True, ids=['pool'])
+def test_worker_dying_mid_build_is_500(served):
+    service, port = served
+    # a build that takes its worker down with it
+    service.render = lambda kind, element: service._run(os._exit, 1)
+    status, reply = _json(port, 'POST', '/footprint', {'kind': 'soic', 'element': element('soic')})
+    assert status == 500
+    assert 'BrokenProcessPool' in reply['error']
+    del service.render
+    status, _, _ = _request(port, 'POST', '/footprint', {'kind': 'soic', 'element': element('soic')})
+    assert status == 200
+    assert service.restarts == 1
@@ -0,0 +1,27 @@
+from ..generate import DEFAULT_SETTINGS, resolve_settings
+from ..pattern.common.settings import Settings
+
+
+def _element(pattern):
+    return {'name': 'X', 'housing': {}, 'library': {'pattern': pattern}}
+
+
+def test_elements_of_one_library_share_their_settings():
+    first = resolve_settings(_element({'densityLevel': 'L', 'clearance': {'padToPad': 0.15}}))
+    second = resolve_settings(_element({'clearance': {'padToPad': 0.15}, 'densityLevel': 'L'}))
+    assert first is second
+    assert first['densityLevel'] == 'L'
+    assert first['clearance']['padToPad'] == 0.15
+    # keys the library leaves out come from the defaults
+    assert first['clearance']['padToSilk'] == DEFAULT_SETTINGS['clearance']['padToSilk']
+
+
+def test_settings_without_a_json_form_still_resolve():
+    resolved = resolve_settings(_element({'densityLevel': 'M', 'marker': object()}))
+    assert resolved['densityLevel'] == 'M'
+    frozen = Settings({'densityLevel': 'L'})
+    assert resolve_settings(_element(frozen)) is resolve_settings(_element(frozen))
+
+
+def test_no_library_settings_gives_the_defaults():
+    assert resolve_settings({'name': 'X', 'housing': {}}) is DEFAULT_SETTINGS
@@ -0,0 +1,45 @@
+import os
+import stat
+
+from ..generate import build_pattern, footprint_bytes, write_footprint
+from .elements import element
+
+
+def test_unchanged_footprint_is_left_alone(tmp_path):
+    pattern = build_pattern('chip', element('chip'))
+    path, written = write_footprint(pattern, str(tmp_path))
+    assert written
+    before = os.stat(path)
+
+    path, written = write_footprint(pattern, str(tmp_path))
+    assert not written
+    after = os.stat(path)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_changed_footprint_is_replaced(tmp_path):
+    pattern = build_pattern('chip', element('chip'))
+    path = os.path.join(tmp_path, pattern.name + '.kicad_mod')
+    with open(path, 'wb') as f:
+        f.write(b'(module stale)\n')
+
+    path, written = write_footprint(pattern, str(tmp_path))
+    assert written
+    with open(path, 'rb') as f:
+        assert f.read() == footprint_bytes(pattern)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    mask = os.umask(0)
+    os.umask(mask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~mask
+
+
+def test_new_footprint_gets_the_current_umask(tmp_path):
+    pattern = build_pattern('chip', element('chip'))
+    mask = os.umask(0o027)
+    try:
+        path, written = write_footprint(pattern, str(tmp_path))
+    finally:
+        os.umask(mask)
+    assert written
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640